@@ -1,21 +1,27 @@
 # Method 1: Using a Temporary Variable
 # Author: HARDIK
 
-# Initialize two numbers
-a = 5
-b = 10
+def swap_with_temp(a, b):
+    # Swap using a temporary variable
+    temp = a  # Store value of 'a' in temporary variable
+    a = b     # Assign value of 'b' to 'a'
+    b = temp  # Assign original value of 'a' (from temp) to 'b'
+    return a, b
 
-# Display original values
-print("Before swapping:")
-print("a =", a)
-print("b =", b)
 
-# Swap using a temporary variable
-temp = a  # Store value of 'a' in temporary variable
-a = b     # Assign value of 'b' to 'a'
-b = temp  # Assign original value of 'a' (from temp) to 'b'
+if __name__ == "__main__":
+    # Initialize two numbers
+    a = 5
+    b = 10
 
-# Display swapped values
-print("\nAfter swapping (using temporary variable):")
-print("a =", a)
-print("b =", b)
\ No newline at end of file
+    # Display original values
+    print("Before swapping:")
+    print("a =", a)
+    print("b =", b)
+
+    a, b = swap_with_temp(a, b)
+
+    # Display swapped values
+    print("\nAfter swapping (using temporary variable):")
+    print("a =", a)
+    print("b =", b)
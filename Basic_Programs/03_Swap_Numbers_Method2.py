@@ -1,20 +1,27 @@
 #Method 2: Without Temporary Variable (Arithmetic Approach)
 #Author: HARDIK
-# Initialize two numbers
-a = 5
-b = 10
 
-# Display original values
-print("Before swapping:")
-print("a =", a)
-print("b =", b)
+def swap_with_arithmetic(a, b):
+    # Swap using arithmetic operations (without temporary variable)
+    a = a + b  # Sum of both numbers stored in 'a'
+    b = a - b  # Subtract 'b' from sum to get original 'a', store in 'b'
+    a = a - b  # Subtract new 'b' (original 'a') from sum to get original 'b'
+    return a, b
 
-# Swap using arithmetic operations (without temporary variable)
-a = a + b  # Sum of both numbers stored in 'a'
-b = a - b  # Subtract 'b' from sum to get original 'a', store in 'b'
-a = a - b  # Subtract new 'b' (original 'a') from sum to get original 'b'
 
-# Display swapped values
-print("\nAfter swapping (using arithmetic operations):")
-print("a =", a)
-print("b =", b)
\ No newline at end of file
+if __name__ == "__main__":
+    # Initialize two numbers
+    a = 5
+    b = 10
+
+    # Display original values
+    print("Before swapping:")
+    print("a =", a)
+    print("b =", b)
+
+    a, b = swap_with_arithmetic(a, b)
+
+    # Display swapped values
+    print("\nAfter swapping (using arithmetic operations):")
+    print("a =", a)
+    print("b =", b)
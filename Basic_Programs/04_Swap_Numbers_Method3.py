@@ -1,22 +1,29 @@
 # Method 3: Python Tuple Swap (Most Pythonic)
 #Author: HARDIK
-# Initialize two numbers
-a = 5
-b = 10
 
-# Display original values
-print("Before swapping:")
-print("a =", a)
-print("b =", b)
+def swap_with_tuple(a, b):
+    """
+    # Swap using Python's tuple unpacking feature
+    # Right side creates a tuple (b, a)
+    # Left side unpacks the tuple into variables a and b
+    """
+    a, b = b, a
+    return a, b
 
-"""
-# Swap using Python's tuple unpacking feature
-# Right side creates a tuple (b, a)
-# Left side unpacks the tuple into variables a and b
-"""
-a, b = b, a
 
-# Display swapped values
-print("\nAfter swapping (using tuple unpacking):")
-print("a =", a)
-print("b =", b)
\ No newline at end of file
+if __name__ == "__main__":
+    # Initialize two numbers
+    a = 5
+    b = 10
+
+    # Display original values
+    print("Before swapping:")
+    print("a =", a)
+    print("b =", b)
+
+    a, b = swap_with_tuple(a, b)
+
+    # Display swapped values
+    print("\nAfter swapping (using tuple unpacking):")
+    print("a =", a)
+    print("b =", b)
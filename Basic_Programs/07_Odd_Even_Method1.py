@@ -1,10 +1,15 @@
 # Method-1:Program to check even or odd using modulus operator
 #Author: HARDIK
-# Program to check even or odd using modulus operator
-number = int(input("Enter a number: "))  # Take user input and convert to integer
 
-# If number modulo 2 equals 0, it's even; otherwise, it's odd
-if number % 2 == 0:
-    print(f"{number} is even.")
-else:
-    print(f"{number} is odd.")
\ No newline at end of file
+def check_even_odd(number):
+    # If number modulo 2 equals 0, it's even; otherwise, it's odd
+    if number % 2 == 0:
+        return "even"
+    else:
+        return "odd"
+
+
+if __name__ == "__main__":
+    # Program to check even or odd using modulus operator
+    number = int(input("Enter a number: "))  # Take user input and convert to integer
+    print(f"{number} is {check_even_odd(number)}.")
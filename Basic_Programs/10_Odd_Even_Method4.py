@@ -1,14 +1,40 @@
 #Method:-4 Recursive function to check even or odd
 #Author: HARDIK
-def check_even_odd(n):
+
+# Plain recursion uses one stack frame per "subtract 2" step, so it crashes
+# with RecursionError for inputs above ~2000. Here the recursive step returns
+# the next call instead of making it (a "trampoline"), and check_even_odd
+# keeps bouncing until a base case is reached: same recursive definition,
+# constant stack depth.
+# It still takes n/2 steps, so it is kept as a bounded reference only; use
+# the constant-time methods in 16_Odd_Even_Engine.py for real workloads.
+MAX_STEPS = 10**6
+
+def even_odd_step(n):
     if n == 0:
         return "even"
     elif n == 1:
         return "odd"
     else:
-        return check_even_odd(n - 2)  # Subtract 2 recursively
+        return lambda: even_odd_step(n - 2)  # Subtract 2 "recursively"
+
+def check_even_odd(n, max_steps=MAX_STEPS):
+    if not isinstance(n, int):
+        raise TypeError("check_even_odd only works with integers")
+    n = abs(n)  # Negative numbers have the same parity as their absolute value
+    if n > 2 * max_steps + 1:
+        raise ValueError(f"{n} needs more than {max_steps} recursive steps; use a constant-time method")
+    result = even_odd_step(n)
+    while callable(result):  # Bounce until a base case returns a string
+        result = result()
+    return result
+
 
-number = int(input("Enter a number: "))  # Take user input
-# Handle negative numbers by taking absolute value
-result = check_even_odd(abs(number))
-print(f"{number} is {result}.")
\ No newline at end of file
+if __name__ == "__main__":
+    number = int(input("Enter a number: "))  # Take user input
+    # Handle negative numbers by taking absolute value
+    try:
+        result = check_even_odd(abs(number))
+        print(f"{number} is {result}.")
+    except ValueError as e:
+        print(f"❌ {e}")
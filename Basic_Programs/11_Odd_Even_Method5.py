@@ -1,9 +1,15 @@
 # Method:-5 Program to check even or odd using list indexing
 #Author: HARDIK
 
-number = int(input("Enter a number: "))  # Take user input
-
 # Define a list where even/odd correspond to indices 0 and 1
-result = ["even", "odd"]
-# Use number % 2 as index to select correct string
-print(f"{number} is {result[number % 2]}.")
\ No newline at end of file
+RESULT = ["even", "odd"]
+
+
+def check_even_odd(number):
+    # Use number % 2 as index to select correct string
+    return RESULT[number % 2]
+
+
+if __name__ == "__main__":
+    number = int(input("Enter a number: "))  # Take user input
+    print(f"{number} is {check_even_odd(number)}.")
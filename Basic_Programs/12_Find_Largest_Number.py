@@ -5,6 +5,28 @@ Author: HARDIK
 Date: 2024
 """
 
+def largest_of_three(num1, num2, num3):
+    """
+    This function compares three numbers and returns the largest one together
+    with its position ("first", "second" or "third"). On ties the earlier
+    number wins, because every check uses >=.
+    """
+    
+    # Check if first number is greater than or equal to both second and third
+    if num1 >= num2 and num1 >= num3:
+        # If condition is True, num1 is the largest
+        return num1, "first"
+    
+    # If first condition fails, check if second number is largest
+    elif num2 >= num1 and num2 >= num3:
+        # If condition is True, num2 is the largest
+        return num2, "second"
+    
+    # If both above conditions fail, third number must be largest
+    else:
+        # No need to check condition since it's the only possibility left
+        return num3, "third"
+
 def find_largest_of_three():
     """
     This function finds the largest of three numbers entered by the user.
@@ -25,25 +47,8 @@ def find_largest_of_three():
     
     # PROCESSING PHASE: Compare numbers to find largest
     # Logic: We compare each number with the other two to find which is largest
-    
-    # Check if first number is greater than or equal to both second and third
-    if num1 >= num2 and num1 >= num3:
-        # If condition is True, num1 is the largest
-        largest = num1
-        # Store which number was largest for display
-        position = "first"
-    
-    # If first condition fails, check if second number is largest
-    elif num2 >= num1 and num2 >= num3:
-        # If condition is True, num2 is the largest
-        largest = num2
-        position = "second"
-    
-    # If both above conditions fail, third number must be largest
-    else:
-        # No need to check condition since it's the only possibility left
-        largest = num3
-        position = "third"
+    # largest_of_three() also tells us which number was largest for display
+    largest, position = largest_of_three(num1, num2, num3)
     
     # OUTPUT PHASE: Display the result to user
     print()
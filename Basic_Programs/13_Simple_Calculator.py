@@ -2,10 +2,1668 @@
 Simple Calculator Program
 A command-line calculator that performs basic arithmetic operations:
 addition, subtraction, multiplication, and division.
+
+Besides the interactive menu, the calculator has a headless batch mode that
+streams operation records from a file or stdin, one per line:
+
+    python 13_Simple_Calculator.py --batch ops.txt
+    cat ops.txt | python 13_Simple_Calculator.py --batch -
+
+Each record is an operation followed by its operands, e.g. "add 3 4",
+"sqrt 9" or "pow ans 2" ('ans' is the previous result), or "expr" followed
+by an infix expression such as "expr (ans + 1) ^ 2 / sqrt(16)".
+
+A single expression argument is evaluated once, with no menu or banner:
+    
+    python 13_Simple_Calculator.py "2^10"
+    python 13_Simple_Calculator.py --output json -- "-3 * (ans + 4)"
+
+Wrapper scripts that call it repeatedly should prefer the module form, which
+loads cached bytecode instead of recompiling this file on every start (run it
+from this folder or with the folder on PYTHONPATH):
+
+    python -m 13_Simple_Calculator "2^10"
+
+By default numbers are floats. --exact switches to exact arithmetic: integral
+inputs stay Python ints and decimal inputs become fractions, powers with
+integer exponents are computed exactly, perfect squares get integer roots and
+division gives an exact fraction, so "2^100", "10/4 * 3" or "0.1 + 0.2" come
+out exact. Anything else falls back to floats:
+
+    python 13_Simple_Calculator.py --exact "2^100 / 3"
+    python 13_Simple_Calculator.py --exact --batch ledger.txt
+
+For large operand files, --array applies one operation to every row at once.
+The file is parsed in bulk by 21_Number_Reader.py and computed with
+calculate_array():
+
+    python 13_Simple_Calculator.py --array div pairs.txt
+
+Interactive output goes through a buffered ScreenRenderer that writes each
+screen at once. --output minimal|quiet|json trims it for pipes and slow
+terminals:
+
+    printf '1\n3\n4\nn\nn\n9\n' | python 13_Simple_Calculator.py --output quiet
+
+Operations are looked up in an operation registry (OPERATION_REGISTRY), which
+drives the menu, the history display and batch evaluation. New operations
+can be added without touching perform_calculation:
+
+    SimpleCalculator.register_operation(
+        Operation('Modulo', '%', 2, math.fmod, keywords=('mod', '%')))
 """
 
-import math
-import sys
+# Only cheap standard modules are imported up front: the calculator is often
+# started for a single expression, so anything that only some modes need
+# (argparse, json, mmap, importlib, NumPy, process pools) is imported where
+# it is used.
+import math
+import os
+import struct
+import sys
+import time
+from array import array
+from bisect import bisect_left, bisect_right, insort
+from collections import OrderedDict, deque
+from itertools import islice
+
+
+def load_numpy():
+    """
+    Import NumPy on first use.
+    
+    NumPy is optional: the array API falls back to a pure Python loop when it
+    is not installed, and the interactive calculator never needs it.
+    
+    Returns:
+        module or None: The numpy module, or None if unavailable
+    """
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+_number_reader = None
+
+
+def load_number_reader():
+    """
+    Import 21_Number_Reader.py on first use, for --array input files.
+    
+    Returns:
+        module: The bulk number reader
+    """
+    global _number_reader
+    if _number_reader is None:
+        import importlib.util
+        
+        path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "21_Number_Reader.py")
+        spec = importlib.util.spec_from_file_location("number_reader", path)
+        _number_reader = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(_number_reader)
+    return _number_reader
+
+
+def numpy_square_root_kernel(np, a):
+    """
+    Square root of a whole NumPy column; negative values are error rows.
+    
+    Returns:
+        tuple: (results, errors) where errors is a boolean mask
+    """
+    errors = a < 0
+    with np.errstate(invalid='ignore'):
+        results = np.where(errors, np.nan, np.sqrt(a))
+    return results, errors
+
+
+def numpy_binary_kernel(np, op, a, b):
+    """
+    Apply a two-operand arithmetic operation to whole NumPy columns.
+    
+    Args:
+        np (module): The numpy module
+        op (str): One of 'add', 'subtract', 'multiply', 'divide', 'power'
+        a (ndarray): First operand column (float64)
+        b (ndarray): Second operand column (float64)
+        
+    Returns:
+        tuple: (results, errors) where errors is a boolean mask
+    """
+    with np.errstate(all='ignore'):
+        if op == 'divide':
+            errors = b == 0
+            result = np.divide(a, np.where(errors, 1.0, b))
+        else:
+            result = getattr(np, op)(a, b)
+            # math.pow raises for overflow and for domain errors such as a
+            # negative base with a fractional exponent; NumPy yields inf/nan.
+            # Treat a non-finite result from finite inputs as an error row.
+            errors = ~np.isfinite(result) & np.isfinite(a) & np.isfinite(b)
+    return np.where(errors, np.nan, result), np.broadcast_to(errors, result.shape)
+
+
+# Single-character operator symbols in infix expressions ('**' is also accepted)
+EXPRESSION_SYMBOLS = frozenset('-+*/^()√')
+NAME_START = frozenset('ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz_')
+
+
+class CompiledExpression:
+    """
+    An infix expression that has been parsed once into a flat postfix
+    instruction list and compiled into a reusable callable.
+    
+    Instructions are tuples:
+        ('const', value)  push a number
+        ('load', name)    push a variable binding
+        ('call', method)  pop operands, push the calculator method's result
+    """
+    
+    def __init__(self, text, instructions, function):
+        """
+        Args:
+            text (str): The original expression text
+            instructions (tuple): Postfix instruction list
+            function (callable): Compiled evaluator taking a bindings dict
+        """
+        self.text = text
+        self.instructions = instructions
+        self.function = function
+        self.variables = frozenset(arg for op, arg in instructions if op == 'load')
+    
+    def __call__(self, bindings):
+        """
+        Evaluate the expression against a dict of variable bindings.
+        
+        Raises:
+            ValueError: If a variable has no binding
+        """
+        try:
+            return self.function(bindings)
+        except KeyError as e:
+            raise ValueError(f"No value given for variable {e}") from None
+    
+    def __repr__(self):
+        return f"CompiledExpression({self.text!r})"
+
+
+class ExpressionParser:
+    """
+    Recursive-descent parser for calculator expressions such as
+    "(a + b) ^ 2 / sqrt(c)".
+    
+    Grammar (lowest to highest precedence):
+        expr    := term (('+' | '-') term)*
+        term    := unary (('*' | '/') unary)*
+        unary   := ('-' | '+') unary | power
+        power   := primary (('^' | '**') unary)?     right-associative
+        primary := NUMBER | NAME | FUNCTION '(' expr ')' | '√' primary | '(' expr ')'
+    
+    So "-2^2" is -(2^2) and "2^3^2" is 2^(3^2), as in standard notation.
+    """
+    
+    BINARY_METHODS = {'+': 'add', '-': 'subtract', '*': 'multiply', '/': 'divide',
+                      '^': 'power', '**': 'power'}
+    FUNCTIONS = {'sqrt': 'square_root'}
+    
+    def __init__(self, text, number=float):
+        self.text = text
+        self.tokens = self.tokenize(text, number)
+        self.position = 0
+        self.instructions = []
+    
+    @staticmethod
+    def tokenize(text, number=float):
+        """
+        Split expression text into (kind, value) tokens.
+        
+        Tokens are numbers ("12", "1.5", ".5", "2e-3"), names (an ASCII letter
+        or '_' followed by letters, digits or '_'), '**' and the symbols in
+        EXPRESSION_SYMBOLS. This hand-written scanner avoids importing re,
+        which would dominate the start-up time of one-shot invocations.
+        
+        Number tokens are converted with `number`: float, or the exact
+        calculator's parse_number, which reads integers as ints and decimals
+        as Fractions.
+        
+        Raises:
+            ValueError: On characters that are not part of the grammar
+        """
+        tokens = []
+        position = 0
+        length = len(text)
+        while position < length:
+            char = text[position]
+            if char.isspace():
+                position += 1
+                continue
+            
+            start = position
+            if char.isdecimal() or (char == '.' and text[position + 1:position + 2].isdecimal()):
+                # Integer digits, then an optional fraction and exponent
+                while position < length and text[position].isdecimal():
+                    position += 1
+                if position < length and text[position] == '.':
+                    position += 1
+                    while position < length and text[position].isdecimal():
+                        position += 1
+                if position < length and text[position] in 'eE':
+                    exponent = position + 1
+                    if exponent < length and text[exponent] in '+-':
+                        exponent += 1
+                    if exponent < length and text[exponent].isdecimal():
+                        position = exponent
+                        while position < length and text[position].isdecimal():
+                            position += 1
+                tokens.append(('number', number(text[start:position])))
+            elif char in NAME_START:
+                position += 1
+                while position < length and (text[position].isalnum() or text[position] == '_'):
+                    position += 1
+                tokens.append(('name', text[start:position]))
+            elif char == '*' and text[position + 1:position + 2] == '*':
+                tokens.append(('symbol', '**'))
+                position += 2
+            elif char in EXPRESSION_SYMBOLS:
+                tokens.append(('symbol', char))
+                position += 1
+            else:
+                raise ValueError(f"Unexpected character {char!r} in expression")
+        return tokens
+    
+    def peek(self):
+        if self.position < len(self.tokens):
+            return self.tokens[self.position]
+        return (None, None)
+    
+    def expect(self, symbol):
+        if self.peek() != ('symbol', symbol):
+            raise ValueError(f"Expected '{symbol}' in expression")
+        self.position += 1
+    
+    def parse(self):
+        """
+        Parse the whole expression.
+        
+        Returns:
+            tuple: Postfix instruction list
+            
+        Raises:
+            ValueError: If the expression is empty or malformed
+        """
+        if not self.tokens:
+            raise ValueError("Empty expression")
+        self.parse_expr()
+        if self.position != len(self.tokens):
+            raise ValueError(f"Unexpected '{self.tokens[self.position][1]}' in expression")
+        return tuple(self.instructions)
+    
+    def parse_expr(self):
+        self.parse_term()
+        while self.peek() in (('symbol', '+'), ('symbol', '-')):
+            symbol = self.tokens[self.position][1]
+            self.position += 1
+            self.parse_term()
+            self.instructions.append(('call', self.BINARY_METHODS[symbol]))
+    
+    def parse_term(self):
+        self.parse_unary()
+        while self.peek() in (('symbol', '*'), ('symbol', '/')):
+            symbol = self.tokens[self.position][1]
+            self.position += 1
+            self.parse_unary()
+            self.instructions.append(('call', self.BINARY_METHODS[symbol]))
+    
+    def parse_unary(self):
+        token = self.peek()
+        if token in (('symbol', '-'), ('symbol', '+')):
+            self.position += 1
+            self.parse_unary()
+            if token[1] == '-':
+                self.instructions.append(('call', 'negate'))
+        else:
+            self.parse_power()
+    
+    def parse_power(self):
+        self.parse_primary()
+        if self.peek() in (('symbol', '^'), ('symbol', '**')):
+            self.position += 1
+            self.parse_unary()
+            self.instructions.append(('call', 'power'))
+    
+    def parse_primary(self):
+        kind, value = self.peek()
+        self.position += 1
+        if kind == 'number':
+            self.instructions.append(('const', value))
+        elif kind == 'name' and self.peek() == ('symbol', '('):
+            if value.lower() not in self.FUNCTIONS:
+                raise ValueError(f"Unknown function '{value}'")
+            self.position += 1
+            self.parse_expr()
+            self.expect(')')
+            self.instructions.append(('call', self.FUNCTIONS[value.lower()]))
+        elif kind == 'name':
+            self.instructions.append(('load', value))
+        elif value == '√':
+            self.parse_primary()
+            self.instructions.append(('call', 'square_root'))
+        elif value == '(':
+            self.parse_expr()
+            self.expect(')')
+        else:
+            raise ValueError("Incomplete expression" if kind is None else f"Unexpected '{value}' in expression")
+
+
+def compile_instructions(instructions, calculator):
+    """
+    Turn a postfix instruction list into a single nested closure.
+    
+    The operand stack is resolved once at compile time, so evaluation is a
+    chain of direct calls with no stack or dispatch per instruction.
+    
+    Args:
+        instructions (tuple): Postfix instructions from ExpressionParser
+        calculator (SimpleCalculator): Supplies the arithmetic methods
+        
+    Returns:
+        callable: function(bindings) -> float
+    """
+    stack = []
+    for op, arg in instructions:
+        if op == 'const':
+            stack.append(lambda bindings, value=arg: value)
+        elif op == 'load':
+            stack.append(lambda bindings, name=arg: bindings[name])
+        elif arg == 'negate':
+            operand = stack.pop()
+            stack.append(lambda bindings, x=operand: -x(bindings))
+        elif arg == 'square_root':
+            operand = stack.pop()
+            stack.append(lambda bindings, x=operand, f=calculator.square_root: f(x(bindings)))
+        else:
+            right = stack.pop()
+            left = stack.pop()
+            stack.append(lambda bindings, x=left, y=right, f=getattr(calculator, arg):
+                         f(x(bindings), y(bindings)))
+    return stack.pop()
+
+
+def checked_square_root(number):
+    """
+    Square root that rejects negative numbers like SimpleCalculator.square_root.
+    
+    Raises:
+        ValueError: If number is negative
+    """
+    if number < 0:
+        raise ValueError("Cannot calculate square root of a negative number!")
+    return math.sqrt(number)
+
+
+# Largest exact result or operand, in bits. About 4200 decimal digits, which
+# keeps results within CPython's default int-to-str limit of 4300 digits (and
+# Fraction's gcd fast); beyond it the exact methods fall back to floats.
+EXACT_MAX_BITS = 14000
+
+# Longest number literal read exactly (digits of EXACT_MAX_BITS, sign, point)
+EXACT_MAX_DIGITS = int(EXACT_MAX_BITS * math.log10(2)) + 2
+
+
+def exact_number(fraction):
+    """Return a Fraction as an int when it is a whole number."""
+    return fraction.numerator if fraction.denominator == 1 else fraction
+
+
+def exact_bits(number):
+    """Size of an int or Fraction in bits (of its larger term)."""
+    return max(number.numerator.bit_length(), number.denominator.bit_length())
+
+
+def parse_exact(token):
+    """
+    Parse a number literal without rounding: an int, or a Fraction for
+    decimals, exponents and ratios ("1.5", "2e-3", "1/3").
+    
+    Raises:
+        ValueError: If the text is not a number
+        OverflowError: If the value is larger than EXACT_MAX_BITS
+    """
+    if len(token) > EXACT_MAX_DIGITS:
+        raise OverflowError(f"More than {EXACT_MAX_DIGITS} characters")
+    try:
+        return int(token)
+    except ValueError:
+        pass
+    # Bound the exponent before Fraction computes 10 ** exponent
+    exponent = token.lower().partition('e')[2]
+    if exponent and abs(int(exponent)) > EXACT_MAX_DIGITS:
+        raise OverflowError(f"Exponent over {EXACT_MAX_DIGITS}")
+    from fractions import Fraction
+    
+    try:
+        value = exact_number(Fraction(token))
+    except ZeroDivisionError:
+        raise ValueError(f"Zero denominator: {token}") from None
+    if exact_bits(value) > EXACT_MAX_BITS:
+        raise OverflowError(f"More than {EXACT_MAX_BITS} bits")
+    return value
+
+
+def exact_pow(base, exponent):
+    """
+    Power that stays exact for integer exponents, math.pow otherwise.
+    
+    int and Fraction bases are raised with Python's ** operator, which is
+    exponentiation by squaring on arbitrary-precision integers; a negative
+    exponent gives a Fraction. Float operands, non-integer exponents and
+    results over EXACT_MAX_BITS fall back to math.pow.
+    
+    Raises:
+        ZeroDivisionError: If zero is raised to a negative power
+        ValueError: On a math.pow domain error
+        OverflowError: If the float fallback overflows
+    """
+    if type(exponent) is int and not isinstance(base, float):
+        if exact_bits(base) * abs(exponent) <= EXACT_MAX_BITS:
+            if exponent >= 0:
+                return base ** exponent
+            if base == 0:
+                raise ZeroDivisionError("Cannot raise zero to a negative power!")
+            from fractions import Fraction
+            
+            return exact_number(Fraction(base) ** exponent)
+    return math.pow(base, exponent)
+
+
+def exact_sqrt(number):
+    """
+    Square root that is exact for perfect squares, math.sqrt otherwise.
+    
+    Integers are checked with math.isqrt; a Fraction has an exact root when
+    its numerator and denominator are both perfect squares.
+    
+    Raises:
+        ValueError: If number is negative
+    """
+    if number < 0:
+        raise ValueError("Cannot calculate square root of a negative number!")
+    if isinstance(number, int):
+        root = math.isqrt(number)
+        if root * root == number:
+            return root
+    elif not isinstance(number, float):
+        numerator = math.isqrt(number.numerator)
+        denominator = math.isqrt(number.denominator)
+        if numerator * numerator == number.numerator and denominator * denominator == number.denominator:
+            from fractions import Fraction
+            
+            return Fraction(numerator, denominator)
+    return math.sqrt(number)
+
+
+def format_fraction(fraction):
+    """
+    Format a Fraction exactly: as a decimal when it terminates
+    (denominator 2^a * 5^b, e.g. "2.5"), otherwise as "1/3".
+    """
+    denominator = fraction.denominator
+    if denominator == 1:
+        return str(fraction.numerator)
+    rest = denominator
+    twos = fives = 0
+    while rest % 2 == 0:
+        rest //= 2
+        twos += 1
+    while rest % 5 == 0:
+        rest //= 5
+        fives += 1
+    if rest != 1:
+        return str(fraction)
+    digits = max(twos, fives)
+    whole, decimals = divmod(abs(fraction.numerator) * 10**digits // denominator, 10**digits)
+    sign = '-' if fraction < 0 else ''
+    return f"{sign}{whole}.{decimals:0{digits}d}"
+
+
+def to_float(value):
+    """Round an exact value to a float, saturating at +/-inf instead of raising."""
+    try:
+        return float(value)
+    except OverflowError:
+        return math.inf if value > 0 else -math.inf
+
+
+class Operation:
+    """
+    One calculator operation as stored in the operation registry.
+    
+    The scalar kernel is either the name of a SimpleCalculator method (so
+    the built-in operations keep using add(), power() etc. and their result
+    cache) or any callable taking the operands. The optional batch kernel
+    computes whole NumPy columns at once: batch_kernel(np, *columns) ->
+    (results, error mask); without it calculate_array() loops over the
+    scalar kernel.
+    """
+    
+    def __init__(self, name, symbol, arity, kernel, batch_kernel=None, keywords=(),
+                 prompts=None, template=None):
+        """
+        Args:
+            name (str): Display name, also stored in the history, e.g. 'Modulo'
+            symbol (str): Operator symbol shown in the menu, e.g. '%'
+            arity (int): Number of operands, 1 or 2
+            kernel (str or callable): SimpleCalculator method name or function
+            batch_kernel (callable): Optional vectorized kernel, see above
+            keywords (tuple): Names accepted in batch records, e.g. ('mod', '%')
+            prompts (tuple): Input prompts, one per operand
+            template (str): Display format with {0} and {1} for the operands
+        
+        Raises:
+            ValueError: If arity is not 1 or 2
+        """
+        if arity not in (1, 2):
+            raise ValueError("Operations take one or two operands")
+        self.name = name
+        self.symbol = symbol
+        self.arity = arity
+        self.kernel = kernel
+        self.batch_kernel = batch_kernel
+        self.keywords = tuple(keywords)
+        if prompts is None:
+            prompts = ("Enter number: ",) if arity == 1 else ("Enter first number: ", "Enter second number: ")
+        self.prompts = tuple(prompts)
+        if template is None:
+            template = f"{symbol}{{0}}" if arity == 1 else f"{{0}} {symbol} {{1}}"
+        self.template = template
+        self.choice = None  # Menu number, assigned by the registry
+    
+    def bind(self, calculator):
+        """Return the scalar kernel as a callable for one calculator."""
+        if isinstance(self.kernel, str):
+            return getattr(calculator, self.kernel)
+        return self.kernel
+    
+    def format(self, operands):
+        """Format the operands for display, e.g. '3.0 + 4.0' or '√9.0'."""
+        return self.template.format(*operands)
+    
+    def __repr__(self):
+        return f"Operation({self.name!r}, {self.symbol!r}, {self.arity})"
+
+
+class OperationRegistry:
+    """
+    All calculator operations, indexed for O(1) dispatch.
+    
+    - names / codes: history op code <-> operation name. Codes are assigned
+      in registration order and stored as one byte in the history (and in
+      history log files), so at most 256 names fit.
+    - aliases: lower-case batch keyword, symbol, method name or display name
+      -> Operation
+    - by_choice: menu number -> Operation. The built-in operations are 1-6;
+      7-12 are menu commands, so custom operations start at 13.
+    """
+    
+    FIRST_CUSTOM_CHOICE = 13
+    
+    def __init__(self):
+        self.names = []
+        self.codes = {}
+        self.operations = {}
+        self.aliases = {}
+        self.by_choice = {}
+    
+    def __iter__(self):
+        return iter(sorted(self.operations.values(), key=lambda operation: operation.choice))
+    
+    def __len__(self):
+        return len(self.operations)
+    
+    def add_name(self, name, aliases=()):
+        """
+        Give a history name its op code and reserve aliases for it.
+        
+        Raises:
+            ValueError: If the name exists or all 256 codes are taken
+        """
+        if name in self.codes:
+            raise ValueError(f"Operation '{name}' is already registered")
+        if len(self.names) == 256:
+            raise ValueError("No more than 256 operations can be registered")
+        for alias in aliases:
+            if alias.lower() in self.aliases:
+                raise ValueError(f"'{alias}' already names another operation")
+        self.codes[name] = len(self.names)
+        self.names.append(name)
+        for alias in aliases:
+            self.aliases[alias.lower()] = None
+    
+    def register(self, operation, choice=None):
+        """
+        Add an operation to the menu, the history and batch mode.
+        
+        Args:
+            operation (Operation): The operation
+            choice (int): Menu number (default: the next free one from 13)
+        
+        Returns:
+            Operation: The registered operation
+        
+        Raises:
+            ValueError: If the name, a keyword or the menu number is taken
+        """
+        aliases = {operation.name.lower(), *(keyword.lower() for keyword in operation.keywords)}
+        if isinstance(operation.kernel, str):
+            aliases.add(operation.kernel)
+        if choice is None:
+            choice = max([self.FIRST_CUSTOM_CHOICE - 1, *self.by_choice]) + 1
+        elif choice in self.by_choice:
+            raise ValueError(f"Menu number {choice} is already taken")
+        
+        self.add_name(operation.name, aliases)
+        for alias in aliases:
+            self.aliases[alias] = operation
+        operation.choice = choice
+        self.operations[operation.name] = operation
+        self.by_choice[choice] = operation
+        return operation
+    
+    def get(self, name):
+        """Look up an operation by display name (None if unknown)."""
+        return self.operations.get(name)
+    
+    def lookup(self, token):
+        """Look up an operation by batch keyword, symbol or name (None if unknown)."""
+        return self.aliases.get(token.lower())
+    
+    def arity(self, name):
+        """Number of operands stored for a history name (1 for expressions)."""
+        operation = self.operations.get(name)
+        return operation.arity if operation is not None else 1
+
+
+OPERATION_REGISTRY = OperationRegistry()
+for _choice, _operation in enumerate([
+    Operation('Addition', '+', 2, 'add', keywords=('add', '+'),
+              batch_kernel=lambda np, a, b: numpy_binary_kernel(np, 'add', a, b)),
+    Operation('Subtraction', '-', 2, 'subtract', keywords=('sub', '-'),
+              batch_kernel=lambda np, a, b: numpy_binary_kernel(np, 'subtract', a, b)),
+    Operation('Multiplication', '*', 2, 'multiply', keywords=('mul', '*'),
+              batch_kernel=lambda np, a, b: numpy_binary_kernel(np, 'multiply', a, b)),
+    Operation('Division', '/', 2, 'divide', keywords=('div', '/'),
+              batch_kernel=lambda np, a, b: numpy_binary_kernel(np, 'divide', a, b),
+              prompts=("Enter numerator: ", "Enter denominator: ")),
+    Operation('Power', '^', 2, 'power', keywords=('pow', '^'),
+              batch_kernel=lambda np, a, b: numpy_binary_kernel(np, 'power', a, b),
+              prompts=("Enter base: ", "Enter exponent: "), template="{0}^{1}"),
+    Operation('Square Root', '√', 1, 'square_root', keywords=('sqrt', '√'),
+              batch_kernel=numpy_square_root_kernel),
+], 1):
+    OPERATION_REGISTRY.register(_operation, _choice)
+# Expressions are stored in the history but dispatched separately
+OPERATION_REGISTRY.add_name('Expression', ('expr', 'expression'))
+del _choice, _operation
+# Codes of the built-in names; history logs written before logs kept their
+# own operation table used exactly these
+BUILTIN_OPERATION_NAMES = tuple(OPERATION_REGISTRY.names)
+
+
+class ResultCache:
+    """
+    Bounded memoization cache for expensive calculator operations.
+    
+    Keys are (function, arguments), with every argument tagged by its type:
+    2 == 2.0 == Fraction(2), but in exact mode power(2, 3) must return the
+    int 8 and power(2.0, 3) the float 8.0. A zero float also carries its
+    sign, since 0.0 == -0.0 but power(-0.0, 1) is -0.0. Errors (ValueError,
+    OverflowError, ZeroDivisionError) are deterministic for the same
+    arguments, so they are cached too and raised again, as a fresh exception
+    of the same type, on every hit.
+    
+    Two eviction policies are supported, both O(1) per operation:
+    - 'lru': evict the least recently used entry (an OrderedDict)
+    - 'lfu': evict the least frequently used entry, oldest first among
+      equals (frequency buckets of OrderedDicts)
+    """
+    
+    POLICIES = ('lru', 'lfu')
+    CACHED_ERRORS = (ValueError, OverflowError, ZeroDivisionError)
+    
+    def __init__(self, maxsize=1024, policy='lru'):
+        """
+        Args:
+            maxsize (int): Maximum number of cached results
+            policy (str): 'lru' or 'lfu'
+            
+        Raises:
+            ValueError: If maxsize is not positive or the policy is unknown
+        """
+        if policy not in self.POLICIES:
+            raise ValueError(f"Unknown cache policy '{policy}' (use 'lru' or 'lfu')")
+        if maxsize < 1:
+            raise ValueError("Cache size must be at least 1")
+        self.policy = policy
+        self.maxsize = maxsize
+        self.values = OrderedDict()  # key -> (result, error); in LRU order for 'lru'
+        self.frequency = {}  # 'lfu' only: key -> use count
+        self.buckets = {}  # 'lfu' only: use count -> OrderedDict of keys
+        self.min_frequency = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    def __len__(self):
+        return len(self.values)
+    
+    def get_or_compute(self, function, args):
+        """
+        Return function(*args), computing it only on a cache miss.
+        
+        Args:
+            function (callable): The operation to memoize
+            args (tuple): Its arguments
+            
+        Returns:
+            The (possibly cached) result
+            
+        Raises:
+            The cached or freshly raised ValueError/OverflowError/ZeroDivisionError
+        """
+        key = self.make_key(function, args)
+        outcome = self.values.get(key)
+        if outcome is not None:
+            self.hits += 1
+            if self.policy == 'lru':
+                self.values.move_to_end(key)
+            else:
+                self.touch(key)
+        else:
+            self.misses += 1
+            try:
+                outcome = (function(*args), None)
+            except self.CACHED_ERRORS as e:
+                outcome = (None, (type(e), e.args))
+            self.insert(key, outcome)
+        
+        result, error = outcome
+        if error is not None:
+            raise error[0](*error[1])
+        return result
+    
+    @staticmethod
+    def make_key(function, args):
+        """
+        Build the cache key: (type, value) per argument, (type, value, sign)
+        for zero floats and (type, 'nan') for NaN, which never equals itself
+        and would otherwise add a new entry on every call.
+        """
+        return (function, tuple((type(arg), arg, math.copysign(1.0, arg)) if arg == 0 and isinstance(arg, float)
+                                else (type(arg), 'nan') if arg != arg
+                                else (type(arg), arg) for arg in args))
+    
+    def touch(self, key):
+        """Move an LFU entry to the next frequency bucket."""
+        count = self.frequency[key]
+        bucket = self.buckets[count]
+        del bucket[key]
+        if not bucket:
+            del self.buckets[count]
+            if self.min_frequency == count:
+                self.min_frequency = count + 1
+        self.frequency[key] = count + 1
+        self.buckets.setdefault(count + 1, OrderedDict())[key] = None
+    
+    def insert(self, key, outcome):
+        """Store a new entry, evicting one first if the cache is full."""
+        if len(self.values) >= self.maxsize:
+            self.evict()
+        self.values[key] = outcome
+        if self.policy == 'lfu':
+            self.frequency[key] = 1
+            self.buckets.setdefault(1, OrderedDict())[key] = None
+            self.min_frequency = 1
+    
+    def evict(self):
+        """Remove one entry according to the eviction policy."""
+        if self.policy == 'lru':
+            self.values.popitem(last=False)
+        else:
+            bucket = self.buckets[self.min_frequency]
+            key, _ = bucket.popitem(last=False)
+            if not bucket:
+                del self.buckets[self.min_frequency]
+                self.min_frequency = min(self.buckets, default=0)
+            del self.frequency[key]
+            del self.values[key]
+        self.evictions += 1
+    
+    def resize(self, maxsize):
+        """
+        Change the maximum size, evicting entries if it shrinks.
+        
+        Raises:
+            ValueError: If maxsize is not positive
+        """
+        if maxsize < 1:
+            raise ValueError("Cache size must be at least 1")
+        self.maxsize = maxsize
+        while len(self.values) > maxsize:
+            self.evict()
+    
+    def clear(self):
+        """Remove all entries and reset the statistics."""
+        self.values.clear()
+        self.frequency.clear()
+        self.buckets.clear()
+        self.min_frequency = 0
+        self.hits = self.misses = self.evictions = 0
+    
+    def info(self):
+        """
+        Report cache statistics.
+        
+        Returns:
+            dict: policy, hits, misses, hit_rate, size, maxsize and evictions
+        """
+        lookups = self.hits + self.misses
+        return {
+            'policy': self.policy,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'size': len(self.values),
+            'maxsize': self.maxsize,
+            'evictions': self.evictions,
+        }
+
+
+class CallStats:
+    """
+    Call count, errors by type and a fixed-bucket latency histogram for one
+    instrumented method.
+    
+    The bucket bounds never change, so recording a call is one bisect and a
+    few integer additions, and histograms from different sessions can be
+    added bucket by bucket.
+    """
+    
+    # Upper bounds of the latency buckets in nanoseconds (1 us ... 1 s); a
+    # final overflow bucket counts slower calls
+    BUCKET_BOUNDS_NS = (
+        1_000, 2_500, 5_000, 10_000, 25_000, 50_000, 100_000, 250_000, 500_000,
+        1_000_000, 2_500_000, 5_000_000, 10_000_000, 25_000_000, 50_000_000,
+        100_000_000, 250_000_000, 500_000_000, 1_000_000_000,
+    )
+    
+    def __init__(self):
+        self.count = 0
+        self.errors = {}  # Exception type name -> count
+        self.total_ns = 0
+        self.max_ns = 0
+        self.buckets = [0] * (len(self.BUCKET_BOUNDS_NS) + 1)
+    
+    def record(self, elapsed_ns):
+        """Add one call that took elapsed_ns nanoseconds."""
+        self.count += 1
+        self.total_ns += elapsed_ns
+        if elapsed_ns > self.max_ns:
+            self.max_ns = elapsed_ns
+        self.buckets[bisect_left(self.BUCKET_BOUNDS_NS, elapsed_ns)] += 1
+    
+    def record_error(self, error):
+        """Count an exception raised by the method."""
+        name = type(error).__name__
+        self.errors[name] = self.errors.get(name, 0) + 1
+    
+    def quantile_bound(self, q):
+        """
+        Upper bound of the bucket holding the q-quantile (0 < q <= 1).
+        
+        Returns:
+            float or None: Bound in microseconds, inf for the overflow bucket,
+            None without calls
+        """
+        if not self.count:
+            return None
+        rank = math.ceil(q * self.count)
+        seen = 0
+        for bound, count in zip(self.BUCKET_BOUNDS_NS, self.buckets):
+            seen += count
+            if seen >= rank:
+                return bound / 1000
+        return math.inf
+    
+    @classmethod
+    def bucket_label(cls, index):
+        """Name of a bucket, e.g. '<=250us', '<=1ms' or '>1s'."""
+        bounds = cls.BUCKET_BOUNDS_NS
+        if index == len(bounds):
+            return f">{cls.format_ns(bounds[-1])}"
+        return f"<={cls.format_ns(bounds[index])}"
+    
+    @staticmethod
+    def format_ns(ns):
+        """Format a duration in the largest unit that keeps it readable."""
+        for unit, size in (('s', 1_000_000_000), ('ms', 1_000_000), ('us', 1_000)):
+            if ns >= size:
+                return f"{ns / size:g}{unit}"
+        return f"{ns}ns"
+    
+    def as_dict(self):
+        """
+        Export the statistics as plain JSON-serializable values.
+        
+        Returns:
+            dict: calls, errors, total_ms, mean_us, max_us, p50_us and p99_us
+            (bucket upper bounds; None beyond the last bucket) and the
+            histogram as {bucket label: calls}
+        """
+        def bound(value):
+            return None if value is None or math.isinf(value) else value
+        
+        return {
+            'calls': self.count,
+            'errors': dict(self.errors),
+            'total_ms': self.total_ns / 1e6,
+            'mean_us': self.total_ns / self.count / 1000 if self.count else 0.0,
+            'max_us': self.max_ns / 1000,
+            'p50_us': bound(self.quantile_bound(0.5)),
+            'p99_us': bound(self.quantile_bound(0.99)),
+            'histogram': {self.bucket_label(index): count
+                          for index, count in enumerate(self.buckets)},
+        }
+
+
+class CalculatorStats:
+    """
+    Opt-in instrumentation for one SimpleCalculator.
+    
+    Enabling it shadows the instrumented methods with timing wrappers stored
+    on the instance; disabling it deletes them again, so a calculator without
+    statistics runs the plain class methods at no extra cost.
+    """
+    
+    def __init__(self):
+        self.started = time.time()
+        self.methods = {}  # Method name -> CallStats
+    
+    def wrap(self, name, method):
+        """
+        Return a wrapper of a bound method that records every call.
+        
+        Args:
+            name (str): Name the statistics are reported under
+            method (callable): The bound method to time
+        
+        Returns:
+            callable: The instrumented method
+        """
+        stats = self.methods.setdefault(name, CallStats())
+        clock = time.perf_counter_ns
+        
+        def instrumented(*args, **kwargs):
+            start = clock()
+            try:
+                return method(*args, **kwargs)
+            except Exception as error:
+                stats.record_error(error)
+                raise
+            finally:
+                stats.record(clock() - start)
+        
+        instrumented.__name__ = name
+        instrumented.__doc__ = method.__doc__
+        instrumented.__wrapped__ = method
+        return instrumented
+    
+    def snapshot(self):
+        """
+        Export all statistics as a JSON-serializable dict.
+        
+        Returns:
+            dict: started and uptime (seconds) plus per-method statistics
+            for every method that has been called
+        """
+        return {
+            'started': self.started,
+            'uptime_s': time.time() - self.started,
+            'methods': {name: stats.as_dict()
+                        for name, stats in sorted(self.methods.items()) if stats.count},
+        }
+
+
+class CalculationHistory:
+    """
+    Bounded, columnar store for calculation history.
+    
+    Each entry is spread over parallel typed arrays (an op-code byte, two
+    float64 operands, a float64 result and an integer epoch timestamp), so an
+    entry costs 33 bytes instead of a dict, a list and a time string. Once
+    `capacity` entries are stored the oldest entry is overwritten (ring
+    buffer), which keeps memory flat in long-running sessions.
+    
+    Every entry gets an increasing sequence number; entry `seq` lives in slot
+    `seq % capacity`. Three indexes are maintained incrementally on append
+    and eviction so query() never has to scan the whole history:
+    - by_operation: op code -> deque of sequence numbers (posting lists)
+    - by_result: sorted list of (result, sequence) pairs, searched with bisect
+    - the timestamps column itself, which is in time order and searched
+      with a binary search
+    """
+    
+    # Shared with the operation registry, so custom operations get codes too
+    OPERATIONS = OPERATION_REGISTRY.names
+    OPCODES = OPERATION_REGISTRY.codes
+    
+    def __init__(self, capacity=10000):
+        """
+        Args:
+            capacity (int): Maximum number of entries kept
+            
+        Raises:
+            ValueError: If capacity is not positive
+        """
+        if capacity < 1:
+            raise ValueError("History capacity must be at least 1")
+        self.capacity = capacity
+        self.opcodes = array('B')
+        self.operands1 = array('d')
+        self.operands2 = array('d')
+        self.results = array('d')
+        self.timestamps = array('q')
+        self.expressions = {}  # slot -> text, only for 'Expression' entries
+        self.start = 0  # slot of the oldest entry once the buffer is full
+        self.next_seq = 0  # sequence number of the next appended entry
+        self.by_operation = {}
+        self.by_result = []
+    
+    def __len__(self):
+        return len(self.opcodes)
+    
+    def append(self, operation, operands, result, timestamp=None):
+        """
+        Store one calculation, overwriting the oldest entry when full.
+        
+        Args:
+            operation (str): Operation name, e.g. 'Addition'
+            operands (list): One or two numbers, or [text] for expressions
+            result (float): The calculation result
+            timestamp (int): Epoch seconds; defaults to now
+        """
+        code = self.OPCODES[operation]
+        if timestamp is None:
+            timestamp = int(time.time())
+        
+        text = None
+        if operation == 'Expression':
+            text = operands[0]
+            first = second = math.nan
+        else:
+            first = operands[0]
+            second = operands[1] if len(operands) > 1 else math.nan
+        
+        seq = self.next_seq
+        self.next_seq += 1
+        
+        size = len(self.opcodes)
+        if size < self.capacity:
+            slot = size
+            self.opcodes.append(code)
+            self.operands1.append(first)
+            self.operands2.append(second)
+            self.results.append(result)
+            self.timestamps.append(timestamp)
+        else:
+            slot = self.start
+            self.unindex(seq - self.capacity, slot)
+            self.opcodes[slot] = code
+            self.operands1[slot] = first
+            self.operands2[slot] = second
+            self.results[slot] = result
+            self.timestamps[slot] = timestamp
+            self.start = (slot + 1) % self.capacity
+        
+        if text is not None:
+            self.expressions[slot] = text
+        elif self.expressions:
+            self.expressions.pop(slot, None)
+        
+        postings = self.by_operation.get(code)
+        if postings is None:
+            postings = self.by_operation[code] = deque()
+        postings.append(seq)
+        if result == result:  # NaN cannot be ordered, keep it out of the index
+            insort(self.by_result, (result, seq))
+    
+    def unindex(self, seq, slot):
+        """
+        Drop the entry about to be overwritten from the indexes.
+        
+        Args:
+            seq (int): Sequence number of the evicted (oldest) entry
+            slot (int): Its slot in the column arrays
+        """
+        # The evicted entry is always the oldest one, so it heads its posting list
+        self.by_operation[self.opcodes[slot]].popleft()
+        result = self.results[slot]
+        if result == result:
+            del self.by_result[bisect_left(self.by_result, (result, seq))]
+    
+    def find_time(self, timestamp):
+        """
+        Binary-search the time-ordered entries.
+        
+        Args:
+            timestamp (int): Epoch seconds
+            
+        Returns:
+            int: Index of the first entry at or after timestamp
+        """
+        low, high = 0, len(self.opcodes)
+        timestamps, start, size = self.timestamps, self.start, len(self.opcodes)
+        while low < high:
+            middle = (low + high) // 2
+            if timestamps[(start + middle) % size] < timestamp:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+    
+    def query(self, operation=None, min_result=None, max_result=None, since=None, until=None):
+        """
+        Find entries matching all of the given filters using the indexes.
+        
+        The most selective index provides the candidates (the operation's
+        posting list, the bisected result range or the time window) and the
+        remaining filters are checked directly on the columns.
+        
+        Args:
+            operation (str): Operation name, e.g. 'Division'
+            min_result (float): Smallest result to include
+            max_result (float): Largest result to include
+            since (int): Earliest timestamp (epoch seconds) to include
+            until (int): Latest timestamp (epoch seconds) to include
+            
+        Returns:
+            list: Matching indexes (0 = oldest entry), in history order
+        """
+        size = len(self.opcodes)
+        first_seq = self.next_seq - size
+        
+        low = self.find_time(since) if since is not None else 0
+        high = self.find_time(until + 1) if until is not None else size
+        candidates = [range(first_seq + low, first_seq + high)]
+        
+        code = None
+        if operation is not None:
+            code = self.OPCODES.get(operation)
+            if code is None:
+                return []
+            candidates.append(self.by_operation.get(code, ()))
+        
+        check_result = min_result is not None or max_result is not None
+        if check_result:
+            left = bisect_left(self.by_result, (min_result,)) if min_result is not None else 0
+            right = (bisect_right(self.by_result, (max_result, math.inf))
+                     if max_result is not None else len(self.by_result))
+            candidates.append([seq for _, seq in self.by_result[left:right]])
+        
+        smallest = min(candidates, key=len)
+        if min_result is None:
+            min_result = -math.inf
+        if max_result is None:
+            max_result = math.inf
+        
+        opcodes, results, capacity = self.opcodes, self.results, self.capacity
+        matches = []
+        for seq in smallest:
+            index = seq - first_seq
+            if not low <= index < high:
+                continue
+            slot = seq % capacity
+            if code is not None and opcodes[slot] != code:
+                continue
+            if check_result and not min_result <= results[slot] <= max_result:
+                continue
+            matches.append(index)
+        
+        if check_result and smallest is candidates[-1]:
+            matches.sort()  # The result index is ordered by value, not by time
+        return matches
+    
+    def entry(self, index):
+        """
+        Rebuild one entry as a dict.
+        
+        Args:
+            index (int): Position from the oldest entry (negative from newest)
+            
+        Returns:
+            dict: operation, operands, result and timestamp (epoch seconds)
+            
+        Raises:
+            IndexError: If the index is out of range
+        """
+        size = len(self.opcodes)
+        if not -size <= index < size:
+            raise IndexError("history index out of range")
+        slot = (self.start + index) % size
+        operation = self.OPERATIONS[self.opcodes[slot]]
+        
+        if operation == 'Expression':
+            operands = [self.expressions[slot]]
+        elif OPERATION_REGISTRY.arity(operation) == 1:
+            operands = [self.operands1[slot]]
+        else:
+            operands = [self.operands1[slot], self.operands2[slot]]
+        
+        return {
+            'operation': operation,
+            'operands': operands,
+            'result': self.results[slot],
+            'timestamp': self.timestamps[slot],
+        }
+    
+    def __iter__(self):
+        for index in range(len(self.opcodes)):
+            yield self.entry(index)
+    
+    def clear(self):
+        """Remove all entries."""
+        for column in (self.opcodes, self.operands1, self.operands2, self.results, self.timestamps):
+            del column[:]
+        self.expressions.clear()
+        self.start = 0
+        self.next_seq = 0
+        self.by_operation.clear()
+        self.by_result.clear()
+
+
+class HistoryLog:
+    """
+    Persistent, append-only binary log of calculation history.
+    
+    The log file starts with an 8-byte magic header followed by fixed-size
+    40-byte records (op code, two float64 operands, float64 result, int64
+    epoch timestamp), so appending an entry is a single small write and the
+    N-th record lives at a known offset. Reads memory-map the file instead of
+    parsing it, which makes opening a log with millions of entries and
+    reading its tail effectively instant.
+    
+    Expression text does not fit a fixed-size record; it is appended to a
+    sidecar file (<path>.expr) and the record's operands hold its byte
+    offset and length.
+    
+    Op codes in the log are the log's own: a second sidecar (<path>.ops)
+    lists the operation names, one per line, in code order, and a name is
+    added the first time it is written. Records are decoded by name, so a
+    later session that registers custom operations in a different order (or
+    not at all) never reads them back as the wrong operation.
+    """
+    
+    MAGIC = b'CALCLOG1'
+    RECORD = struct.Struct('<B7xdddq')
+    
+    def __init__(self, path):
+        """
+        Open (or create) a history log.
+        
+        Args:
+            path (str): Path of the log file
+            
+        Raises:
+            ValueError: If the file exists but is not a calculator history log
+        """
+        self.path, self.text_path, self.ops_path = self.file_paths(path)
+        self.fd = None
+        self.text_fd = None
+        self.ops_fd = None
+        self.names = []  # Log op code -> operation name
+        self.codes = {}  # Operation name -> log op code
+        self.open()
+    
+    @staticmethod
+    def file_paths(path):
+        """Return the paths of a log file and its .expr and .ops sidecars."""
+        return path, path + '.expr', path + '.ops'
+    
+    def open(self):
+        """Open the log for appending, creating it and dropping any torn record."""
+        flags = os.O_RDWR | os.O_APPEND | os.O_CREAT | getattr(os, 'O_BINARY', 0)
+        self.fd = os.open(self.path, flags, 0o644)
+        size = os.fstat(self.fd).st_size
+        if size == 0:
+            os.write(self.fd, self.MAGIC)
+        else:
+            with open(self.path, 'rb') as log_file:
+                if log_file.read(len(self.MAGIC)) != self.MAGIC:
+                    os.close(self.fd)
+                    raise ValueError(f"{self.path} is not a calculator history log")
+            # A crash in the middle of a write can leave a partial record at
+            # the end; cut it off so later appends stay aligned.
+            torn = (size - len(self.MAGIC)) % self.RECORD.size
+            if torn:
+                os.ftruncate(self.fd, size - torn)
+        self.text_fd = os.open(self.text_path, flags, 0o644)
+        self.open_operation_table(flags)
+    
+    def open_operation_table(self, flags):
+        """
+        Load the log's operation names, creating the table if it is missing.
+        
+        A log without a table predates it and used the built-in codes, so the
+        new table starts with the built-in names.
+        """
+        self.ops_fd = os.open(self.ops_path, flags, 0o644)
+        with open(self.ops_path, 'rb') as ops_file:
+            data = ops_file.read()
+        if not data:
+            data = ''.join(name + '\n' for name in BUILTIN_OPERATION_NAMES).encode('utf-8')
+            os.write(self.ops_fd, data)
+        elif not data.endswith(b'\n'):
+            # Torn write of a new name: no record uses it yet
+            data = data[:data.rfind(b'\n') + 1]
+            os.ftruncate(self.ops_fd, len(data))
+        self.names = data.decode('utf-8').split('\n')[:-1]
+        self.codes = {name: code for code, name in enumerate(self.names)}
+    
+    def log_code(self, operation):
+        """
+        Return the log's op code for an operation name, adding it to the
+        operation table on first use.
+        
+        Raises:
+            ValueError: If the log already holds 256 operation names
+        """
+        code = self.codes.get(operation)
+        if code is None:
+            if len(self.names) == 256:
+                raise ValueError("A history log holds no more than 256 operations")
+            code = len(self.names)
+            os.write(self.ops_fd, (operation + '\n').encode('utf-8'))
+            self.names.append(operation)
+            self.codes[operation] = code
+        return code
+    
+    def close(self):
+        """Close the underlying file descriptors."""
+        for fd in (self.fd, self.text_fd, self.ops_fd):
+            if fd is not None:
+                os.close(fd)
+        self.fd = self.text_fd = self.ops_fd = None
+    
+    def __len__(self):
+        return (os.fstat(self.fd).st_size - len(self.MAGIC)) // self.RECORD.size
+    
+    def append(self, operation, operands, result, timestamp=None):
+        """
+        Append one calculation with a single write() call.
+        
+        Args:
+            operation (str): Operation name, e.g. 'Addition'
+            operands (list): One or two numbers, or [text] for expressions
+            result (float): The calculation result
+            timestamp (int): Epoch seconds; defaults to now
+        """
+        if timestamp is None:
+            timestamp = int(time.time())
+        
+        if operation == 'Expression':
+            text = operands[0].encode('utf-8')
+            offset = os.fstat(self.text_fd).st_size
+            os.write(self.text_fd, text)
+            first, second = offset, len(text)
+        else:
+            first = operands[0]
+            second = operands[1] if len(operands) > 1 else math.nan
+        
+        code = self.log_code(operation)
+        os.write(self.fd, self.RECORD.pack(code, first, second, result, timestamp))
+    
+    def read_tail(self, count):
+        """
+        Read the last `count` entries through a memory map.
+        
+        Args:
+            count (int): Maximum number of entries to return
+            
+        Returns:
+            list: (operation, operands, result, timestamp) tuples, oldest first;
+            records of operations that are not registered in this session
+            (custom operations of other sessions) are skipped
+        """
+        total = len(self)
+        count = min(count, total)
+        if count <= 0:
+            return []
+        
+        names = self.names
+        registered = CalculationHistory.OPCODES
+        unpack_from = self.RECORD.unpack_from
+        record_size = self.RECORD.size
+        start = len(self.MAGIC) + (total - count) * record_size
+        entries = []
+        
+        import mmap
+        
+        with open(self.path, 'rb') as log_file, \
+                mmap.mmap(log_file.fileno(), 0, access=mmap.ACCESS_READ) as view:
+            texts = None
+            for offset in range(start, start + count * record_size, record_size):
+                code, first, second, result, timestamp = unpack_from(view, offset)
+                if code >= len(names) or names[code] not in registered:
+                    continue
+                operation = names[code]
+                if operation == 'Expression':
+                    if texts is None:
+                        texts = open(self.text_path, 'rb')
+                    texts.seek(int(first))
+                    operands = [texts.read(int(second)).decode('utf-8')]
+                elif OPERATION_REGISTRY.arity(operation) == 1:
+                    operands = [first]
+                else:
+                    operands = [first, second]
+                entries.append((operation, operands, result, timestamp))
+            if texts is not None:
+                texts.close()
+        return entries
+    
+    def compact(self, keep_last=0):
+        """
+        Rewrite the log keeping only the newest entries.
+        
+        The kept records are copied as raw bytes and the operation table as a
+        whole, so records of operations that are not registered in this
+        session survive; only the expression text of kept records is copied,
+        with their offsets updated. The new files are written next to the old
+        ones and swapped in with os.replace(), so an interrupted compaction
+        leaves the old log intact.
+        
+        Args:
+            keep_last (int): Number of newest entries to keep (0 truncates)
+            
+        Returns:
+            int: Number of entries removed
+        """
+        total = len(self)
+        keep = min(max(keep_last, 0), total)
+        record_size = self.RECORD.size
+        expression = self.codes.get('Expression')
+        self.close()
+        
+        paths = self.file_paths(self.path + '.tmp')
+        # Leftovers of an interrupted compaction
+        for path in paths:
+            if os.path.exists(path):
+                os.remove(path)
+        
+        with open(self.path, 'rb') as log_file:
+            log_file.seek(len(self.MAGIC) + (total - keep) * record_size)
+            records = bytearray(log_file.read(keep * record_size))
+        texts = bytearray()
+        if expression is not None and expression in records[::record_size]:
+            with open(self.text_path, 'rb') as text_file:
+                for offset in range(0, len(records), record_size):
+                    if records[offset] != expression:
+                        continue
+                    code, first, second, result, timestamp = self.RECORD.unpack_from(records, offset)
+                    text_file.seek(int(first))
+                    self.RECORD.pack_into(records, offset, code, len(texts), second, result, timestamp)
+                    texts += text_file.read(int(second))
+        with open(self.ops_path, 'rb') as ops_file:
+            names = ops_file.read()
+        
+        for path, data in zip(paths, (self.MAGIC + records, texts, names)):
+            with open(path, 'wb') as new_file:
+                new_file.write(data)
+        os.replace(paths[1], self.text_path)
+        os.replace(paths[2], self.ops_path)
+        os.replace(paths[0], self.path)
+        self.open()
+        return total - keep
+
+
+def evaluate_job_chunk(lines, numeric_mode='float'):
+    """
+    Process-pool worker: evaluate one chunk of batch records.
+    
+    Rows that use 'ans' before this chunk has produced a result of its own
+    cannot be evaluated here and are returned as None for the parent to
+    resolve once the previous chunk's final result is known.
+    
+    Args:
+        lines (list): Stripped batch records
+        numeric_mode (str): The parent calculator's numeric mode
+        
+    Returns:
+        tuple: (output texts with None for pending rows,
+                final 'ans' of the chunk or None if it never produced one)
+    """
+    calculator = SimpleCalculator(numeric_mode=numeric_mode)
+    outputs = []
+    has_result = False
+    for line in lines:
+        if not has_result and 'ans' in line.lower():
+            outputs.append(None)
+            continue
+        text, calculation = calculator.evaluate_batch_record(line)
+        outputs.append(text)
+        if calculation is not None:
+            has_result = True
+    return outputs, (calculator.current_result if has_result else None)
+
+
+class ScreenRenderer:
+    """
+    Buffered output for the interactive calculator.
+    
+    Every screen (menu, result, history page, statistics) is assembled as a
+    list of lines and written with a single write() call instead of one
+    print() per line, and the menu is rendered once and reused until the
+    operation registry changes. Long histories are formatted and written in
+    chunks of HISTORY_CHUNK rows.
+    
+    Output modes:
+    - 'full': the boxed screens, with the menu before every choice
+    - 'minimal': the menu once, then one "3 + 4 = 7" line per result
+    - 'quiet': no menu, banners or prompts; bare results and errors only
+    - 'json': one JSON object per result, history entry or error
+    
+    input() flushes stdout before reading, so buffered screens always
+    appear before the next prompt.
+    """
+    
+    MODES = ('full', 'minimal', 'quiet', 'json')
+    HISTORY_CHUNK = 512  # Rows formatted and written per write() by show_history
+    
+    def __init__(self, mode='full', stream=None):
+        """
+        Args:
+            mode (str): One of MODES
+            stream (file): Output stream (default: sys.stdout at write time)
+        
+        Raises:
+            ValueError: If the mode is unknown
+        """
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown output mode '{mode}' (choose from {', '.join(self.MODES)})")
+        self.mode = mode
+        self.stream = stream
+        self.verbose = mode in ('full', 'minimal')  # Banners, menus, prompts
+        self.menu_key = None
+        self.menu_text = None
+        self.menu_shown = False
+        if mode == 'json':
+            import json
+            self.dumps = json.dumps
+    
+    def write(self, text):
+        """Write a finished block of text with one write() call."""
+        (self.stream or sys.stdout).write(text)
+    
+    def lines(self, lines):
+        """Write a list of lines as one screen."""
+        self.write("\n".join(lines) + "\n")
+    
+    def stream_lines(self, rows, header=()):
+        """
+        Write header lines and then rows in chunks of HISTORY_CHUNK.
+        
+        Args:
+            rows (iterable): Lines, formatted lazily as they are consumed
+            header (list): Lines written together with the first chunk
+        """
+        rows = iter(rows)
+        chunk = list(header) + list(islice(rows, self.HISTORY_CHUNK))
+        while chunk:
+            self.lines(chunk)
+            chunk = list(islice(rows, self.HISTORY_CHUNK))
+    
+    def menu(self, key, render):
+        """
+        Show the menu, rendering it again only when key changes.
+        
+        Args:
+            key: Any value that changes whenever the menu content changes
+            render (callable): Returns the menu lines
+        """
+        if self.mode == 'full' or (self.mode == 'minimal' and not self.menu_shown):
+            if key != self.menu_key:
+                self.menu_key = key
+                self.menu_text = "\n".join(render()) + "\n"
+            self.write(self.menu_text)
+            self.menu_shown = True
+    
+    def record(self, fields):
+        """Write one JSON object per line (json mode)."""
+        self.write(self.dumps(fields) + "\n")
+    
+    def message(self, text):
+        """Informational text: banners, tips and confirmations (full and minimal only)."""
+        if self.verbose:
+            self.write(text + "\n")
+    
+    def error(self, message):
+        """Report a failed calculation."""
+        if self.mode == 'json':
+            self.record({'error': message})
+        else:
+            self.write(f"❌ Error: {message}\n")
+    
+    def warning(self, message):
+        """Report invalid input or another problem that is not a calculation error."""
+        if self.mode == 'json':
+            self.record({'warning': message})
+        else:
+            self.write(f"❌ {message}\n")
+    
+    def prompt(self, text):
+        """Return the input prompt to show ('' in quiet and json modes)."""
+        return text if self.verbose else ''
+
 
 class SimpleCalculator:
     """
@@ -13,30 +1671,153 @@ class SimpleCalculator:
     and maintains calculation history.
     """
     
-    def __init__(self):
-        """Initialize calculator with empty history and default settings."""
-        self.history = []
+    # Menu, history display and batch mode all dispatch through the registry
+    operations = OPERATION_REGISTRY
+    
+    # Menu commands that are not arithmetic operations. 7-9 keep their
+    # original numbers; later commands are appended after Exit
+    MENU_COMMANDS = {
+        7: "Show Calculation History",
+        8: "Clear History",
+        9: "Exit",
+        10: "Evaluate Expression",
+        11: "Search History",
+        12: "Show Statistics",
+    }
+    
+    # Methods timed by enable_stats(): the menu dispatcher, the arithmetic
+    # methods, formatting and history
+    STATS_METHODS = ('perform_calculation', 'add', 'subtract', 'multiply', 'divide',
+                     'power', 'square_root', 'format_result', 'display_result',
+                     'add_to_history')
+    
+    # Numeric modes: 'float' computes everything in floats; 'exact' keeps
+    # integers as ints and divides into Fractions, shadowing these methods
+    # with their exact_* versions on the instance
+    NUMERIC_MODES = ('float', 'exact')
+    EXACT_METHODS = ('parse_number', 'add', 'subtract', 'multiply', 'divide', 'power',
+                     'square_root')
+    
+    def __init__(self, expression_cache_size=256, history_capacity=10000, history_file=None,
+                 output_mode='full', numeric_mode='float'):
+        """
+        Initialize calculator with empty history and default settings.
+        
+        Args:
+            expression_cache_size (int): How many compiled expressions to keep
+                in the LRU cache
+            history_capacity (int): Maximum number of history entries kept;
+                older entries are overwritten
+            history_file (str): Optional path of a persistent history log; the
+                newest entries are loaded from it and new ones are appended
+            output_mode (str): 'full', 'minimal', 'quiet' or 'json'; see ScreenRenderer
+            numeric_mode (str): 'float' or 'exact' (exact integer and
+                fraction arithmetic with a float fallback)
+        
+        Raises:
+            ValueError: If the output or numeric mode is unknown
+        """
+        if numeric_mode not in self.NUMERIC_MODES:
+            raise ValueError(f"Unknown numeric mode '{numeric_mode}' (choose from {', '.join(self.NUMERIC_MODES)})")
+        self.numeric_mode = numeric_mode
+        self.bind_numeric_mode()
+        self.renderer = ScreenRenderer(output_mode)
+        self.history = CalculationHistory(history_capacity)
+        self.history_log = None
+        if history_file is not None:
+            self.history_log = HistoryLog(history_file)
+            for operation, operands, result, timestamp in self.history_log.read_tail(history_capacity):
+                self.history.append(operation, operands, result, timestamp)
         self.current_result = 0
         self.is_new_calculation = True
+        
+        # LRU cache of compiled expressions keyed by expression text
+        self.expression_cache = OrderedDict()
+        self.expression_cache_size = expression_cache_size
+        self.expression_cache_hits = 0
+        self.expression_cache_misses = 0
+        
+        # Opt-in memoization for power() and square_root(); see enable_result_cache()
+        self.result_cache = None
+        
+        # Opt-in latency instrumentation; see enable_stats()
+        self.call_stats = None
+
+    @classmethod
+    def register_operation(cls, operation, choice=None):
+        """
+        Add a custom operation for every calculator: it gets a menu number
+        (13, 14, ...), batch keywords and history entries.
+            
+        Register operations before starting run_jobs() workers, which only
+        see operations registered at the time they are started.
+            
+        Args:
+            operation (Operation): The new operation
+            choice (int): Optional menu number, from 13 up
+            
+        Returns:
+            Operation: The registered operation
+        
+        Raises:
+            ValueError: If the name, a keyword or the menu number is taken;
+                numbers below 13 belong to the built-in operations and the
+                menu commands
+        """
+        if choice is not None and choice < cls.operations.FIRST_CUSTOM_CHOICE:
+            command = cls.MENU_COMMANDS.get(choice)
+            owner = f"the {command} command" if command else "a built-in operation"
+            raise ValueError(f"Menu number {choice} is reserved for {owner}")
+        return cls.operations.register(operation, choice)
+    
+    def bind_numeric_mode(self):
+        """
+        Shadow the float methods with their exact_* versions in exact mode.
+        """
+        if self.numeric_mode == 'exact':
+            for name in self.EXACT_METHODS:
+                setattr(self, name, getattr(self, 'exact_' + name))
+    
+    def menu_choices(self):
+        """Return the highest valid menu number."""
+        return max(max(self.operations.by_choice), max(self.MENU_COMMANDS))
     
     def display_menu(self):
         """
         Display the main calculator menu with available operations.
+        
+        The menu is rendered once and redrawn from the cached text; it is
+        rendered again only after operations are registered.
+        """
+        self.renderer.menu(len(self.operations), self.menu_lines)
+    
+    def menu_lines(self):
+        """
+        Render the main menu.
+        
+        Returns:
+            list: The menu lines
         """
-        print("\n" + "="*50)
-        print("            SIMPLE CALCULATOR")
-        print("="*50)
-        print("Available Operations:")
-        print("1. Addition (+)")
-        print("2. Subtraction (-)")
-        print("3. Multiplication (*)")
-        print("4. Division (/)")
-        print("5. Power (^)")
-        print("6. Square Root (√)")
-        print("7. Show Calculation History")
-        print("8. Clear History")
-        print("9. Exit")
-        print("="*50)
+        lines = ["", "="*50, "            SIMPLE CALCULATOR", "="*50, "Available Operations:"]
+        entries = dict(self.MENU_COMMANDS)
+        for operation in self.operations:
+            entries[operation.choice] = f"{operation.name} ({operation.symbol})"
+        for choice in sorted(entries):
+            lines.append(f"{choice}. {entries[choice]}")
+        lines.append("="*50)
+        return lines
+    
+    def ask(self, prompt):
+        """
+        Read one line of input, showing the prompt unless the output mode is quiet.
+        
+        Args:
+            prompt (str): The prompt text
+        
+        Returns:
+            str: The line entered
+        """
+        return input(self.renderer.prompt(prompt))
     
     def get_number_input(self, prompt="Enter a number: "):
         """
@@ -46,125 +1827,594 @@ class SimpleCalculator:
             prompt (str): The prompt to display to user
             
         Returns:
-            float: Validated numeric input from user
+            float: Validated numeric input from user (an int or Fraction
+            in exact mode)
         """
         while True:
             try:
-                value = input(prompt)
+                value = self.ask(prompt)
                 
                 # Allow using current result as input
                 if value.lower() == 'ans':
                     return self.current_result
                 
-                # Convert to float
-                return float(value)
+                # Convert to a number (float, or int/Fraction in exact mode)
+                return self.parse_number(value)
             except ValueError:
-                print("❌ Invalid input! Please enter a valid number or 'ans' for previous result.")
+                self.renderer.warning("Invalid input! Please enter a valid number or 'ans' for previous result.")
     
     def get_operation_choice(self):
         """
         Get and validate user's operation choice.
         
         Returns:
-            int: Validated operation choice (1-9)
+            int: Validated operation choice (1-12, or higher with custom operations)
         """
+        last = self.menu_choices()
         while True:
             try:
-                choice = int(input("Select operation (1-9): "))
-                if 1 <= choice <= 9:
+                choice = int(self.ask(f"Select operation (1-{last}): "))
+                if 1 <= choice <= last:
                     return choice
                 else:
-                    print("❌ Please enter a number between 1 and 9.")
+                    self.renderer.warning(f"Please enter a number between 1 and {last}.")
             except ValueError:
-                print("❌ Invalid input! Please enter a number between 1 and 9.")
+                self.renderer.warning(f"Invalid input! Please enter a number between 1 and {last}.")
+    
+    def add(self, a, b):
+        """
+        Perform addition of two numbers.
+        
+        Args:
+            a (float): First number
+            b (float): Second number
+            
+        Returns:
+            float: Result of a + b
+        """
+        return a + b
+    
+    def subtract(self, a, b):
+        """
+        Perform subtraction of two numbers.
+        
+        Args:
+            a (float): First number
+            b (float): Second number
+            
+        Returns:
+            float: Result of a - b
+        """
+        return a - b
+    
+    def multiply(self, a, b):
+        """
+        Perform multiplication of two numbers.
+        
+        Args:
+            a (float): First number
+            b (float): Second number
+            
+        Returns:
+            float: Result of a * b
+        """
+        return a * b
+    
+    def divide(self, a, b):
+        """
+        Perform division of two numbers with zero division check.
+        
+        Args:
+            a (float): Numerator
+            b (float): Denominator
+            
+        Returns:
+            float: Result of a / b
+            
+        Raises:
+            ZeroDivisionError: If denominator is zero
+        """
+        if b == 0:
+            raise ZeroDivisionError("Division by zero is not allowed!")
+        return a / b
+    
+    def power(self, base, exponent):
+        """
+        Calculate base raised to the power of exponent.
+        
+        Args:
+            base (float): The base number
+            exponent (float): The exponent
+            
+        Returns:
+            float: Result of base^exponent
+        """
+        if self.result_cache is not None:
+            return self.result_cache.get_or_compute(math.pow, (base, exponent))
+        return math.pow(base, exponent)
+    
+    def square_root(self, number):
+        """
+        Calculate square root of a number with validation.
+        
+        Args:
+            number (float): The number to find square root of
+            
+        Returns:
+            float: Square root of the number
+            
+        Raises:
+            ValueError: If number is negative
+        """
+        if self.result_cache is not None:
+            return self.result_cache.get_or_compute(checked_square_root, (number,))
+        return checked_square_root(number)
+    
+    def parse_number(self, text):
+        """
+        Convert numeric input text to a number.
+        
+        Args:
+            text (str): Numeric literal
+        
+        Returns:
+            float: The number
+        
+        Raises:
+            ValueError: If the text is not a valid number
+        """
+        return float(text)
+    
+    def exact_parse_number(self, text):
+        """
+        Exact-mode parse_number(): integral literals become ints, decimals
+        ("0.1", "2e-3") Fractions, see parse_exact(). Menu, batch, expression
+        and --array input all read numbers this way.
+        
+        Raises:
+            ValueError: If the text is not a valid number or too large
+        """
+        try:
+            return parse_exact(text)
+        except OverflowError as e:
+            raise ValueError(f"Number too large for exact mode: {e}") from None
+    
+    def exact_add(self, a, b):
+        """
+        Exact-mode add(): exact for ints and Fractions; float addition when
+        an operand is larger than EXACT_MAX_BITS.
+        
+        Raises:
+            OverflowError: If such an operand does not fit in a float
+        """
+        if type(a) is int and type(b) is int:
+            # Fast path: checking the bit lengths inline costs little
+            if a.bit_length() > EXACT_MAX_BITS or b.bit_length() > EXACT_MAX_BITS:
+                return float(a) + float(b)
+            return a + b
+        if (not isinstance(a, float) and not isinstance(b, float)
+                and max(exact_bits(a), exact_bits(b)) > EXACT_MAX_BITS):
+            return float(a) + float(b)
+        return a + b
+    
+    def exact_subtract(self, a, b):
+        """
+        Exact-mode subtract(): exact for ints and Fractions; float subtraction
+        when an operand is larger than EXACT_MAX_BITS.
+        
+        Raises:
+            OverflowError: If such an operand does not fit in a float
+        """
+        if type(a) is int and type(b) is int:
+            if a.bit_length() > EXACT_MAX_BITS or b.bit_length() > EXACT_MAX_BITS:
+                return float(a) - float(b)
+            return a - b
+        if (not isinstance(a, float) and not isinstance(b, float)
+                and max(exact_bits(a), exact_bits(b)) > EXACT_MAX_BITS):
+            return float(a) - float(b)
+        return a - b
+    
+    def exact_multiply(self, a, b):
+        """
+        Exact-mode multiply(): exact for ints and Fractions; float
+        multiplication when the product could exceed EXACT_MAX_BITS.
+        
+        Raises:
+            OverflowError: If an operand does not fit in a float
+        """
+        if type(a) is int and type(b) is int:
+            if a.bit_length() + b.bit_length() > EXACT_MAX_BITS:
+                return float(a) * float(b)
+            return a * b
+        if (not isinstance(a, float) and not isinstance(b, float)
+                and exact_bits(a) + exact_bits(b) > EXACT_MAX_BITS):
+            return float(a) * float(b)
+        return a * b
+    
+    def exact_divide(self, a, b):
+        """
+        Exact-mode divide(): an int when b divides a, otherwise a Fraction;
+        a float when either operand is a float or an integer operand is
+        larger than EXACT_MAX_BITS.
+        
+        Raises:
+            ZeroDivisionError: If denominator is zero
+        """
+        if b == 0:
+            raise ZeroDivisionError("Division by zero is not allowed!")
+        if isinstance(a, float) or isinstance(b, float):
+            return a / b
+        if isinstance(a, int) and isinstance(b, int):
+            if max(a.bit_length(), b.bit_length()) > EXACT_MAX_BITS:
+                return a / b
+            quotient, remainder = divmod(a, b)
+            if not remainder:
+                return quotient
+        from fractions import Fraction
+        
+        return exact_number(Fraction(a, b))
+    
+    def exact_power(self, base, exponent):
+        """
+        Exact-mode power(): exact for integer exponents, see exact_pow().
+        """
+        if self.result_cache is not None:
+            return self.result_cache.get_or_compute(exact_pow, (base, exponent))
+        return exact_pow(base, exponent)
+    
+    def exact_square_root(self, number):
+        """
+        Exact-mode square_root(): exact for perfect squares, see exact_sqrt().
+        """
+        if self.result_cache is not None:
+            return self.result_cache.get_or_compute(exact_sqrt, (number,))
+        return exact_sqrt(number)
+    
+    def calculate_array(self, operation, a, b=None):
+        """
+        Apply one arithmetic method to a whole column of values in one call.
+        
+        Per-element semantics match the scalar methods, except that rows which
+        would raise (division by zero, negative square root, overflow) are
+        flagged in the error mask and set to NaN instead of aborting the batch.
+        Scalars are broadcast against columns.
+        
+        With NumPy installed the work is vectorized and NumPy arrays are
+        returned; otherwise any sequence or buffer-protocol object (list,
+        array('d'), memoryview) is processed in a Python loop and the results
+        come back as array('d') plus array('b') for the mask. In exact mode
+        NumPy is not used and the results are a list of exact values.
+        
+        Args:
+            operation (str): 'add', 'subtract', 'multiply', 'divide', 'power',
+                'square_root' or any name or keyword in the operation registry
+            a: First operand column (or scalar)
+            b: Second operand column (or scalar); omitted for square_root
+            
+        Returns:
+            tuple: (results, errors) with one entry per row
+            
+        Raises:
+            ValueError: If the operation is unknown or the operand count is wrong
+        """
+        spec = self.operations.lookup(operation)
+        if spec is None:
+            raise ValueError(f"Unknown operation '{operation}'")
+        unary = spec.arity == 1
+        if unary != (b is None):
+            raise ValueError(f"{operation} expects {spec.arity} operand column(s)")
+        
+        exact = self.numeric_mode == 'exact'
+        np = load_numpy() if spec.batch_kernel is not None and not exact else None
+        if np is not None:
+            columns = [np.asarray(a, dtype=np.float64)]
+            if not unary:
+                columns.append(np.asarray(b, dtype=np.float64))
+            return spec.batch_kernel(np, *columns)
+        
+        # Pure Python fallback: reuse the scalar kernel for each row
+        kernel = spec.bind(self)
+        columns = [a] if unary else [a, b]
+        rows = max((len(c) for c in columns if not isinstance(c, (int, float))), default=1)
+        columns = [[c] * rows if isinstance(c, (int, float)) else c for c in columns]
+        if any(len(c) != rows for c in columns):
+            raise ValueError("Operand columns must have the same length")
+        
+        results = [0] * rows if exact else array('d', bytes(8 * rows))
+        errors = array('b', bytes(rows))
+        nan = math.nan
+        for i, operands in enumerate(zip(*columns)):
+            try:
+                value = kernel(*operands)
+                if isinstance(value, float) and math.isinf(value) and not any(map(math.isinf, operands)):
+                    raise OverflowError
+                results[i] = value
+            except (ZeroDivisionError, ValueError, OverflowError):
+                results[i] = nan
+                errors[i] = 1
+        return results, errors
+    
+    def add_array(self, a, b):
+        """Element-wise a + b over columns. See calculate_array()."""
+        return self.calculate_array('add', a, b)
+    
+    def subtract_array(self, a, b):
+        """Element-wise a - b over columns. See calculate_array()."""
+        return self.calculate_array('subtract', a, b)
+    
+    def multiply_array(self, a, b):
+        """Element-wise a * b over columns. See calculate_array()."""
+        return self.calculate_array('multiply', a, b)
+    
+    def divide_array(self, a, b):
+        """Element-wise a / b over columns; zero denominators are flagged."""
+        return self.calculate_array('divide', a, b)
+    
+    def power_array(self, base, exponent):
+        """Element-wise base ^ exponent; overflow/domain errors are flagged."""
+        return self.calculate_array('power', base, exponent)
+    
+    def square_root_array(self, numbers):
+        """Element-wise square root; negative numbers are flagged."""
+        return self.calculate_array('square_root', numbers)
+    
+    def compile_expression(self, text):
+        """
+        Parse and compile an infix expression, using the LRU cache.
+        
+        The same expression text is only ever parsed once while it stays in
+        the cache; later calls return the cached CompiledExpression.
+        
+        Args:
+            text (str): Expression such as "(a + b) ^ 2 / sqrt(c)"
+            
+        Returns:
+            CompiledExpression: Callable taking a dict of variable bindings
+            
+        Raises:
+            ValueError: If the expression is malformed
+        """
+        cache = self.expression_cache
+        compiled = cache.get(text)
+        if compiled is not None:
+            cache.move_to_end(text)
+            self.expression_cache_hits += 1
+            return compiled
+        
+        self.expression_cache_misses += 1
+        instructions = ExpressionParser(text, self.parse_number).parse()
+        compiled = CompiledExpression(text, instructions, compile_instructions(instructions, self))
+        cache[text] = compiled
+        if len(cache) > self.expression_cache_size:
+            cache.popitem(last=False)  # Evict the least recently used entry
+        return compiled
+    
+    def evaluate_expression(self, text, variables=None):
+        """
+        Evaluate an infix expression with the given variable bindings.
+        
+        'ans' is bound to the current result unless variables overrides it.
+        
+        Args:
+            text (str): Expression text
+            variables (dict): Optional name -> number bindings
+            
+        Returns:
+            float: The value of the expression
+            
+        Raises:
+            ValueError: If the expression is malformed, a variable is unbound
+                or a square root of a negative number is taken
+            ZeroDivisionError: If dividing by zero
+            OverflowError: If the result is too large
+        """
+        bindings = {'ans': self.current_result}
+        if variables:
+            bindings.update(variables)
+        return self.compile_expression(text)(bindings)
+    
+    def run_once(self, text):
+        """
+        Evaluate a single expression for a one-shot command such as
+        `python 13_Simple_Calculator.py "2^10"`.
+        
+        Prints only the result (or one JSON object with --output json) and
+        never shows the menu or banner. The calculation is added to the
+        history only when a history log was opened.
+        
+        Args:
+            text (str): Expression text
+        
+        Returns:
+            int: Exit status, 0 on success and 1 on errors
+        """
+        try:
+            result = self.evaluate_expression(text)
+        except (ZeroDivisionError, ValueError) as e:
+            self.renderer.error(str(e))
+            return 1
+        except OverflowError:
+            self.renderer.error("Result is too large!")
+            return 1
+        
+        if self.renderer.mode == 'full':
+            self.renderer.write(self.format_result(result) + "\n")
+        else:
+            self.display_result("Expression", [text], result)
+        if self.history_log is not None:
+            self.add_to_history("Expression", [text], result)
+        return 0
+    
+    def expression_cache_info(self):
+        """
+        Report compiled-expression cache statistics.
+        
+        Returns:
+            dict: hits, misses, size and maxsize
+        """
+        return {
+            'hits': self.expression_cache_hits,
+            'misses': self.expression_cache_misses,
+            'size': len(self.expression_cache),
+            'maxsize': self.expression_cache_size,
+        }
+    
+    def clear_expression_cache(self):
+        """
+        Drop all compiled expressions and reset the hit/miss counters.
+        """
+        self.expression_cache.clear()
+        self.expression_cache_hits = 0
+        self.expression_cache_misses = 0
     
-    def add(self, a, b):
+    def enable_result_cache(self, maxsize=1024, policy='lru'):
         """
-        Perform addition of two numbers.
+        Turn on memoization of power() and square_root() results.
+        
+        Calling it again replaces the cache (and its statistics).
         
         Args:
-            a (float): First number
-            b (float): Second number
+            maxsize (int): Maximum number of cached results
+            policy (str): Eviction policy, 'lru' or 'lfu'
             
-        Returns:
-            float: Result of a + b
+        Raises:
+            ValueError: If maxsize is not positive or the policy is unknown
         """
-        return a + b
+        self.result_cache = ResultCache(maxsize, policy)
     
-    def subtract(self, a, b):
+    def disable_result_cache(self):
         """
-        Perform subtraction of two numbers.
+        Turn off memoization and drop the cached results.
+        """
+        self.result_cache = None
+    
+    def resize_result_cache(self, maxsize):
+        """
+        Change the result cache size at runtime, evicting entries if it shrinks.
         
-        Args:
-            a (float): First number
-            b (float): Second number
-            
-        Returns:
-            float: Result of a - b
+        Raises:
+            ValueError: If the cache is disabled or maxsize is not positive
         """
-        return a - b
+        if self.result_cache is None:
+            raise ValueError("The result cache is not enabled")
+        self.result_cache.resize(maxsize)
     
-    def multiply(self, a, b):
+    def clear_result_cache(self):
         """
-        Perform multiplication of two numbers.
+        Drop all memoized results and reset the cache statistics.
+        """
+        if self.result_cache is not None:
+            self.result_cache.clear()
+    
+    def result_cache_info(self):
+        """
+        Report result cache statistics.
         
-        Args:
-            a (float): First number
-            b (float): Second number
-            
         Returns:
-            float: Result of a * b
+            dict or None: hit rate, size, evictions etc., or None when disabled
         """
-        return a * b
+        if self.result_cache is None:
+            return None
+        return self.result_cache.info()
     
-    def divide(self, a, b):
+    def enable_stats(self, methods=None):
         """
-        Perform division of two numbers with zero division check.
+        Start recording call counts, errors and latency histograms.
+        
+        Each instrumented method is shadowed by a timing wrapper on this
+        instance only. Statistics are per process: run_jobs() workers are
+        not instrumented. perform_calculation includes the time spent
+        waiting for input in the interactive menu.
+        
+        Calling it again restarts the statistics. Compiled expressions bind
+        the arithmetic methods when they are compiled, so the expression
+        cache is emptied and expressions are compiled against the wrappers.
         
         Args:
-            a (float): Numerator
-            b (float): Denominator
-            
-        Returns:
-            float: Result of a / b
-            
-        Raises:
-            ZeroDivisionError: If denominator is zero
+            methods (tuple): Method names to instrument (default: STATS_METHODS)
         """
-        if b == 0:
-            raise ZeroDivisionError("Division by zero is not allowed!")
-        return a / b
+        self.disable_stats()
+        self.call_stats = CalculatorStats()
+        for name in methods or self.STATS_METHODS:
+            setattr(self, name, self.call_stats.wrap(name, getattr(self, name)))
+        self.expression_cache.clear()
     
-    def power(self, base, exponent):
+    def disable_stats(self):
         """
-        Calculate base raised to the power of exponent.
+        Stop recording and remove the timing wrappers, including those bound
+        into cached compiled expressions.
+        """
+        if self.call_stats is not None:
+            for name in self.call_stats.methods:
+                self.__dict__.pop(name, None)
+            self.bind_numeric_mode()
+            self.expression_cache.clear()
+        self.call_stats = None
+    
+    def stats(self):
+        """
+        Report the recorded statistics.
         
-        Args:
-            base (float): The base number
-            exponent (float): The exponent
-            
         Returns:
-            float: Result of base^exponent
+            dict: {'enabled': bool, ...}; when enabled also 'started',
+            'uptime_s' and 'methods' (see CallStats.as_dict)
         """
-        return math.pow(base, exponent)
+        if self.call_stats is None:
+            return {'enabled': False}
+        return {'enabled': True, **self.call_stats.snapshot()}
     
-    def square_root(self, number):
+    def dump_stats(self, path):
         """
-        Calculate square root of a number with validation.
+        Write stats() to a JSON file, e.g. when the program exits.
         
         Args:
-            number (float): The number to find square root of
-            
-        Returns:
-            float: Square root of the number
-            
-        Raises:
-            ValueError: If number is negative
+            path (str): Output file path
         """
-        if number < 0:
-            raise ValueError("Cannot calculate square root of a negative number!")
-        return math.sqrt(number)
+        import json
+        
+        with open(path, 'w', encoding='utf-8') as stats_file:
+            json.dump(self.stats(), stats_file, indent=2)
+            stats_file.write("\n")
     
+    def show_stats(self):
+        """
+        Display per-method call counts, errors and latencies (menu option 12).
+        """
+        if self.call_stats is None:
+            choice = self.ask("\nStatistics are off. Start recording now? (y/n): ").lower()
+            if choice == 'y':
+                self.enable_stats()
+                self.renderer.message("✅ Recording statistics from now on.")
+            return
+        
+        stats = self.stats()
+        if self.renderer.mode == 'json':
+            self.renderer.record(stats)
+            return
+        
+        lines = ["", "="*72, " "*26 + "CALCULATOR STATISTICS", "="*72]
+        if not stats['methods']:
+            lines.append("No calls recorded yet.")
+        else:
+            lines.append(f"{'Method':<20} {'Calls':>8} {'Errors':>7} {'Mean us':>10} {'p99 us':>10} {'Max us':>10}")
+            lines.append("-"*72)
+            for name, method in stats['methods'].items():
+                p99 = method['p99_us']
+                p99 = f"<={p99:g}" if p99 is not None else ">1e+06"
+                errors = sum(method['errors'].values())
+                lines.append(f"{name:<20} {method['calls']:>8} {errors:>7} {method['mean_us']:>10.1f} "
+                             f"{p99:>10} {method['max_us']:>10.1f}")
+            error_types = {}
+            for method in stats['methods'].values():
+                for error, count in method['errors'].items():
+                    error_types[error] = error_types.get(error, 0) + count
+            if error_types:
+                lines.append("-"*72)
+                lines.append("Errors: " + ", ".join(f"{error} x{count}" for error, count in sorted(error_types.items())))
+        lines.append(f"Recording for {stats['uptime_s']:.0f} s")
+        lines.append("="*72)
+        self.renderer.lines(lines)
+
     def format_result(self, result):
         """
         Format the result for display, handling large numbers and decimals.
@@ -175,6 +2425,13 @@ class SimpleCalculator:
         Returns:
             str: Formatted result string
         """
+        if isinstance(result, int):
+            return str(result)
+        if not isinstance(result, float):
+            from fractions import Fraction  # Only exact mode produces fractions
+            
+            if isinstance(result, Fraction):
+                return format_fraction(result)
         if result == int(result):
             return str(int(result))
         else:
@@ -190,48 +2447,137 @@ class SimpleCalculator:
             operands (list): List of operands used
             result (float): The result of the calculation
         """
-        history_entry = {
-            'operation': operation,
-            'operands': operands,
-            'result': result,
-            'timestamp': self.get_current_time()
-        }
-        self.history.append(history_entry)
+        if self.numeric_mode == 'exact':
+            # The history columns are float64, so exact values are stored rounded
+            if operation != 'Expression':
+                operands = [to_float(operand) for operand in operands]
+            result = to_float(result)
+        self.history.append(operation, operands, result)
+        if self.history_log is not None:
+            self.history_log.append(operation, operands, result)
     
-    def get_current_time(self):
+    def get_current_time(self, timestamp=None):
         """
         Get current time in a formatted string.
         
+        Args:
+            timestamp (int): Epoch seconds to format instead of now
+            
         Returns:
             str: Formatted current time
         """
-        from datetime import datetime
-        return datetime.now().strftime("%H:%M:%S")
+        return time.strftime("%H:%M:%S", time.localtime(timestamp))
     
     def show_history(self):
         """
         Display the calculation history.
+        
+        Rows are formatted lazily and written in chunks, so a long history
+        starts appearing at once and is never formatted as a whole up front.
         """
         if not self.history:
-            print("\nNo calculations in history.")
+            self.renderer.message("\nNo calculations in history.")
             return
         
-        print("\n" + "="*60)
-        print("                  CALCULATION HISTORY")
-        print("="*60)
-        print(f"{'Time':<10} {'Operation':<25} {'Result':<15}")
-        print("-"*60)
-        
-        for entry in self.history:
-            # Format the operation display
-            if entry['operation'] == 'Square Root':
-                op_display = f"√{entry['operands'][0]}"
-            elif entry['operation'] == 'Power':
-                op_display = f"{entry['operands'][0]}^{entry['operands'][1]}"
-            else:
-                op_display = f"{entry['operands'][0]} {self.get_operator_symbol(entry['operation'])} {entry['operands'][1]}"
+        self.renderer.stream_lines(map(self.render_history_row, self.history), self.history_header(
+            "                  CALCULATION HISTORY"))
+    
+    def history_header(self, title):
+        """
+        Lines above a history table (none in quiet and json modes).
+        
+        Args:
+            title (str): The centered table title
+        
+        Returns:
+            list: The header lines
+        """
+        if not self.renderer.verbose:
+            return []
+        return ["", "="*60, title, "="*60, f"{'Time':<10} {'Operation':<25} {'Result':<15}", "-"*60]
+    
+    def render_history_row(self, entry):
+        """
+        Render one history entry for the current output mode.
+        
+        Args:
+            entry (dict): Entry from CalculationHistory
+        
+        Returns:
+            str: A table row, or a JSON object in json mode
+        """
+        if self.renderer.mode == 'json':
+            return self.renderer.dumps(entry)
+        return self.format_history_row(entry)
+    
+    def format_history_row(self, entry):
+        """
+        Format one history entry as a table row.
+        
+        Args:
+            entry (dict): Entry from CalculationHistory
+            
+        Returns:
+            str: The formatted row
+        """
+        op_display = self.describe_operation(entry['operation'], entry['operands'])
+        return f"{self.get_current_time(entry['timestamp']):<10} {op_display:<25} {self.format_result(entry['result']):<15}"
+    
+    def show_history_page(self, indexes, page=1, page_size=20):
+        """
+        Display one page of history entries.
+        
+        Only the rows on the requested page are rebuilt and formatted.
+        
+        Args:
+            indexes (list): History indexes, e.g. from CalculationHistory.query()
+            page (int): 1-based page number
+            page_size (int): Rows per page
             
-            print(f"{entry['timestamp']:<10} {op_display:<25} {self.format_result(entry['result']):<15}")
+        Returns:
+            int: Total number of pages
+        """
+        pages = max(1, -(-len(indexes) // page_size))
+        if not indexes:
+            self.renderer.message("\nNo matching calculations in history.")
+            return pages
+        
+        lines = self.history_header(
+            f"          CALCULATION HISTORY (page {page} of {pages}, {len(indexes)} matches)")
+        for index in indexes[(page - 1) * page_size:page * page_size]:
+            lines.append(self.render_history_row(self.history.entry(index)))
+        self.renderer.lines(lines)
+        return pages
+    
+    def search_history(self, page_size=20):
+        """
+        Ask for query filters and page through the matching history entries.
+        """
+        self.renderer.message("\nLeave a filter empty to skip it.")
+        operation = self.ask(f"Operation ({', '.join(CalculationHistory.OPERATIONS)}): ").strip().title()
+        filters = {'operation': operation or None}
+        
+        for key, prompt in (('min_result', "Minimum result: "), ('max_result', "Maximum result: "),
+                            ('minutes', "Only the last N minutes: ")):
+            while True:
+                value = self.ask(prompt).strip()
+                try:
+                    filters[key] = float(value) if value else None
+                    break
+                except ValueError:
+                    self.renderer.warning("Invalid input! Please enter a valid number or leave it empty.")
+        
+        minutes = filters.pop('minutes')
+        if minutes is not None:
+            filters['since'] = int(time.time() - minutes * 60)
+        
+        indexes = self.history.query(**filters)
+        page = 1
+        while True:
+            pages = self.show_history_page(indexes, page, page_size)
+            if page >= pages or self.ask("\nPress Enter for the next page or 'q' to stop: ").lower() == 'q':
+                break
+            page += 1
     
     def get_operator_symbol(self, operation):
         """
@@ -243,21 +2589,56 @@ class SimpleCalculator:
         Returns:
             str: Symbol for the operation
         """
-        symbols = {
-            'Addition': '+',
-            'Subtraction': '-',
-            'Multiplication': '*',
-            'Division': '/',
-            'Power': '^'
-        }
-        return symbols.get(operation, '?')
+        spec = self.operations.get(operation)
+        return spec.symbol if spec is not None else '?'
+    
+    def describe_operation(self, operation, operands):
+        """
+        Format an operation with its operands, e.g. "3.0 + 4.0" or "√9.0".
+            
+        Args:
+            operation (str): The operation name
+            operands (list): Operands (or [text] for expressions)
+            
+        Returns:
+            str: The operation as displayed in results and history
+        """
+        if operation == 'Expression':
+            return operands[0]
+        if self.numeric_mode == 'exact':
+            # Fractions as "0.1" rather than "1/10"
+            operands = [operand if isinstance(operand, (int, float)) else self.format_result(operand)
+                        for operand in operands]
+        spec = self.operations.get(operation)
+        if spec is None:
+            return f" {self.get_operator_symbol(operation)} ".join(map(str, operands))
+        return spec.format(operands)
     
     def clear_history(self):
         """
-        Clear the calculation history.
+        Clear the calculation history (including the persistent log, if any).
         """
         self.history.clear()
-        print("\n✅ Calculation history cleared!")
+        if self.history_log is not None:
+            self.history_log.compact(0)
+        self.renderer.message("\n✅ Calculation history cleared!")
+    
+    def compact_history(self, keep_last):
+        """
+        Shrink the persistent history log to its newest entries.
+        
+        Args:
+            keep_last (int): Number of newest entries to keep
+            
+        Returns:
+            int: Number of entries removed
+            
+        Raises:
+            ValueError: If no history file is in use
+        """
+        if self.history_log is None:
+            raise ValueError("No history file is in use")
+        return self.history_log.compact(keep_last)
     
     def perform_calculation(self, choice):
         """
@@ -267,71 +2648,32 @@ class SimpleCalculator:
             choice (int): The operation choice from menu
         """
         try:
-            if choice == 1:  # Addition
-                if self.is_new_calculation:
-                    num1 = self.get_number_input("Enter first number: ")
-                else:
-                    num1 = self.current_result
-                    print(f"Using previous result: {self.format_result(num1)}")
-                
-                num2 = self.get_number_input("Enter second number: ")
-                result = self.add(num1, num2)
-                operation = "Addition"
-                operands = [num1, num2]
-                
-            elif choice == 2:  # Subtraction
-                if self.is_new_calculation:
-                    num1 = self.get_number_input("Enter first number: ")
-                else:
-                    num1 = self.current_result
-                    print(f"Using previous result: {self.format_result(num1)}")
-                
-                num2 = self.get_number_input("Enter second number: ")
-                result = self.subtract(num1, num2)
-                operation = "Subtraction"
-                operands = [num1, num2]
-                
-            elif choice == 3:  # Multiplication
-                if self.is_new_calculation:
-                    num1 = self.get_number_input("Enter first number: ")
-                else:
-                    num1 = self.current_result
-                    print(f"Using previous result: {self.format_result(num1)}")
+            spec = self.operations.by_choice.get(choice)
+            if spec is not None:
+                # Two-operand operations continue from the previous result
+                operands = []
+                for prompt in spec.prompts:
+                    if not operands and spec.arity > 1 and not self.is_new_calculation:
+                        operands.append(self.current_result)
+                        self.renderer.message(f"Using previous result: {self.format_result(self.current_result)}")
+                    else:
+                        operands.append(self.get_number_input(prompt))
                 
-                num2 = self.get_number_input("Enter second number: ")
-                result = self.multiply(num1, num2)
-                operation = "Multiplication"
-                operands = [num1, num2]
+                result = spec.bind(self)(*operands)
+                operation = spec.name
                 
-            elif choice == 4:  # Division
-                if self.is_new_calculation:
-                    num1 = self.get_number_input("Enter numerator: ")
-                else:
-                    num1 = self.current_result
-                    print(f"Using previous result: {self.format_result(num1)}")
-                
-                num2 = self.get_number_input("Enter denominator: ")
-                result = self.divide(num1, num2)
-                operation = "Division"
-                operands = [num1, num2]
-                
-            elif choice == 5:  # Power
-                if self.is_new_calculation:
-                    base = self.get_number_input("Enter base: ")
-                else:
-                    base = self.current_result
-                    print(f"Using previous result: {self.format_result(base)}")
+            elif choice == 10:  # Expression
+                text = self.ask("Enter expression (e.g. (a + b) ^ 2 / sqrt(c)): ").strip()
+                expression = self.compile_expression(text)
                 
-                exponent = self.get_number_input("Enter exponent: ")
-                result = self.power(base, exponent)
-                operation = "Power"
-                operands = [base, exponent]
+                # Bind 'ans' to the previous result and ask for any other variables
+                bindings = {'ans': self.current_result}
+                for name in sorted(expression.variables - {'ans'}):
+                    bindings[name] = self.get_number_input(f"Enter value for {name}: ")
                 
-            elif choice == 6:  # Square Root
-                number = self.get_number_input("Enter number: ")
-                result = self.square_root(number)
-                operation = "Square Root"
-                operands = [number]
+                result = expression(bindings)
+                operation = "Expression"
+                operands = [text]
                 
             else:
                 return
@@ -345,14 +2687,16 @@ class SimpleCalculator:
             self.add_to_history(operation, operands, result)
             
         except ZeroDivisionError as e:
-            print(f"❌ Error: {e}")
+            self.renderer.error(str(e))
         except ValueError as e:
-            print(f"❌ Error: {e}")
+            self.renderer.error(str(e))
         except OverflowError:
-            print("❌ Error: Result is too large!")
+            self.renderer.error("Result is too large!")
+        except EOFError:
+            raise  # End of input: run() ends the session
         except Exception as e:
-            print(f"❌ Unexpected error: {e}")
-    
+            self.renderer.warning(f"Unexpected error: {e}")
+
     def display_result(self, operation, operands, result):
         """
         Display the calculation result in a formatted way.
@@ -362,28 +2706,330 @@ class SimpleCalculator:
             operands (list): List of operands used
             result (float): The calculation result
         """
-        print("\n" + "="*40)
-        print("          CALCULATION RESULT")
-        print("="*40)
+        mode = self.renderer.mode
+        if mode == 'json':
+            display = self.format_result(result)
+            if self.numeric_mode == 'exact':
+                # JSON has no fractions: they are sent as floats and 'display' stays exact
+                operands = [value if isinstance(value, (int, float, str)) else float(value) for value in operands]
+                if not isinstance(result, (int, float)):
+                    result = float(result)
+            self.renderer.record({'operation': operation, 'operands': operands, 'result': result,
+                                  'display': display})
+        elif mode == 'quiet':
+            self.renderer.write(self.format_result(result) + "\n")
+        elif mode == 'minimal':
+            self.renderer.write(f"{self.describe_operation(operation, operands)} = {self.format_result(result)}\n")
+        else:
+            self.renderer.lines([
+                "", "="*40, "          CALCULATION RESULT", "="*40,
+                f"Operation: {self.describe_operation(operation, operands)}",
+                f"Result: {self.format_result(result)}",
+                "="*40,
+            ])
+    
+    def parse_batch_operand(self, token):
+        """
+        Convert a batch operand token to a number.
+        
+        Args:
+            token (str): Numeric literal or 'ans'
+            
+        Returns:
+            float: The operand value
+            
+        Raises:
+            ValueError: If the token is not a valid number
+        """
+        if token.lower() == 'ans':
+            return self.current_result
+        return self.parse_number(token)
+    
+    def evaluate_batch_line(self, line):
+        """
+        Evaluate a single batch record such as "add 3 4" or "sqrt ans".
+        
+        The record is computed with the regular arithmetic methods. The
+        calculator state ('ans') is left for the caller to update.
+        
+        Args:
+            line (str): The operation record (without trailing newline)
+            
+        Returns:
+            tuple: (operation, operands, result)
+            
+        Raises:
+            ValueError: For unknown operations, wrong operand counts,
+                invalid numbers or negative square roots
+            ZeroDivisionError: If dividing by zero
+            OverflowError: If the result is too large
+        """
+        tokens = line.split()
+        if tokens[0].lower() == 'expr':
+            # "expr <infix expression>" goes through the compiled-expression cache
+            text = line.split(None, 1)[1] if len(tokens) > 1 else ''
+            return "Expression", [text], self.evaluate_expression(text)
+        
+        spec = self.operations.lookup(tokens[0])
+        if spec is None:
+            raise ValueError(f"Unknown operation '{tokens[0]}'")
+        if len(tokens) - 1 != spec.arity:
+            raise ValueError(f"{spec.name} expects {spec.arity} operand(s), got {len(tokens) - 1}")
+        
+        operands = [self.parse_batch_operand(token) for token in tokens[1:]]
+        result = spec.bind(self)(*operands)
+        return spec.name, operands, result
+    
+    def run_batch(self, input_stream, output_stream, record_history=False):
+        """
+        Stream operation records from input_stream and write one result per line.
+        
+        Lines are processed one at a time, so neither the input nor the output
+        is ever held in memory as a whole. Blank lines and lines starting with
+        '#' are skipped. A failing record writes an "error: ..." line and leaves
+        'ans' unchanged, matching the interactive error handling.
+        
+        Args:
+            input_stream (iterable): Text lines, e.g. an open file or sys.stdin
+            output_stream (file): Writable text stream for the results
+            record_history (bool): Also store each calculation in the history
+            
+        Returns:
+            tuple: (number of successful operations, number of errors)
+        """
+        write = output_stream.write
+        evaluate = self.evaluate_batch_record
+        succeeded = failed = 0
+        
+        for line in input_stream:
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            
+            text, calculation = evaluate(line)
+            write(text + "\n")
+            if calculation is None:
+                failed += 1
+                continue
+            
+            if record_history:
+                self.add_to_history(*calculation)
+            succeeded += 1
+        
+        return succeeded, failed
+    
+    def evaluate_batch_record(self, line):
+        """
+        Evaluate one batch record and format its output line.
+        
+        On success 'ans' is updated. Errors are turned into an "error: ..."
+        line the same way perform_calculation reports them.
+        
+        Args:
+            line (str): The stripped operation record
+            
+        Returns:
+            tuple: (output text, (operation, operands, result) or None on error)
+        """
+        try:
+            operation, operands, result = self.evaluate_batch_line(line)
+            text = self.format_result(result)
+        except OverflowError:
+            return "error: Result is too large!", None
+        except (ZeroDivisionError, ValueError) as e:
+            return f"error: {e}", None
+        
+        self.current_result = result
+        self.is_new_calculation = False
+        return text, (operation, operands, result)
+    
+    def run_jobs(self, input_stream, output_stream, workers=None, chunk_size=10000):
+        """
+        Evaluate a large job file of batch records across all CPU cores.
+        
+        Records are split into chunks that are evaluated by a process pool
+        and written back in input order; only a bounded window of chunks is
+        in flight at any time, so memory use does not grow with the file.
+        
+        Records that use 'ans' before their chunk has produced a result of
+        its own depend on earlier chunks. Workers leave those rows pending
+        and they are evaluated here, sequentially and in order, once the
+        previous chunk's final 'ans' is known. A file that is one long 'ans'
+        chain therefore falls back to sequential evaluation.
+        
+        Args:
+            input_stream (iterable): Text lines in the batch record format
+            output_stream (file): Writable text stream for the results
+            workers (int): Number of worker processes (default: CPU count)
+            chunk_size (int): Records per chunk sent to a worker
+            
+        Returns:
+            tuple: (number of successful operations, number of errors)
+        """
+        from concurrent.futures import ProcessPoolExecutor
+        
+        workers = workers or os.cpu_count() or 1
+        if workers == 1:
+            return self.run_batch(input_stream, output_stream)
+        
+        def read_chunks():
+            chunk = []
+            for line in input_stream:
+                line = line.strip()
+                if not line or line.startswith('#'):
+                    continue
+                chunk.append(line)
+                if len(chunk) == chunk_size:
+                    yield chunk
+                    chunk = []
+            if chunk:
+                yield chunk
+        
+        counts = [0, 0]
+        in_flight = deque()
+        with ProcessPoolExecutor(workers) as pool:
+            for chunk in read_chunks():
+                in_flight.append((chunk, pool.submit(evaluate_job_chunk, chunk, self.numeric_mode)))
+                if len(in_flight) >= 4 * workers:
+                    self.merge_job_chunk(*in_flight.popleft(), output_stream, counts)
+            while in_flight:
+                self.merge_job_chunk(*in_flight.popleft(), output_stream, counts)
+        
+        return counts[0], counts[1]
+    
+    def merge_job_chunk(self, chunk, future, output_stream, counts):
+        """
+        Write one finished chunk, resolving rows that depend on earlier chunks.
+        
+        Args:
+            chunk (list): The chunk's records
+            future (Future): Result of evaluate_job_chunk for the chunk
+            output_stream (file): Writable text stream for the results
+            counts (list): [succeeded, failed] counters to update
+        """
+        outputs, final_result = future.result()
+        lines = []
+        for line, text in zip(chunk, outputs):
+            if text is None:
+                # Uses 'ans' from an earlier chunk: evaluate now, in order
+                text, calculation = self.evaluate_batch_record(line)
+            lines.append(text)
+            counts[text.startswith("error: ")] += 1
+        output_stream.write("\n".join(lines) + "\n")
+        
+        if final_result is not None:
+            self.current_result = final_result
+            self.is_new_calculation = False
+        
+    def read_operand_columns(self, input_stream, operation):
+        """
+        Read rows of operands ("3 4" or "3,4" per line) for one operation.
+        
+        The stream is parsed in bulk into a typed array and split into
+        columns without a per-value float() call; 'ans' stands for the
+        current result. In exact mode the tokens are parsed one by one with
+        parse_exact() instead, so no value is rounded to a float.
+        
+        Args:
+            input_stream (file): Readable text or binary stream
+            operation (str): Operation name or batch keyword
+        
+        Returns:
+            list: One operand column per operand (NumPy arrays if available)
         
-        if operation == "Square Root":
-            print(f"Operation: √{operands[0]}")
-        elif operation == "Power":
-            print(f"Operation: {operands[0]}^{operands[1]}")
+        Raises:
+            ValueError: If the operation is unknown, or for bad tokens and
+                rows with the wrong number of operands (with line numbers)
+        """
+        spec = self.operations.lookup(operation)
+        if spec is None:
+            raise ValueError(f"Unknown operation '{operation}'")
+        if self.numeric_mode == 'exact':
+            values = self.read_exact_rows(input_stream, spec.arity)
         else:
-            operator = self.get_operator_symbol(operation)
-            print(f"Operation: {operands[0]} {operator} {operands[1]}")
+            reader = load_number_reader()
+            values = reader.read_numbers(input_stream, ans=self.current_result, columns=spec.arity)
+            if load_numpy() is not None:
+                values = reader.to_numpy(values)
+        return [values[column::spec.arity] for column in range(spec.arity)]
+    
+    def read_exact_rows(self, input_stream, columns):
+        """
+        Exact-mode parser for read_operand_columns(): every token goes
+        through parse_exact(), with the number reader's error messages.
+        
+        Args:
+            input_stream (file): Readable text or binary stream
+            columns (int): Number of operands on every non-blank line
+        
+        Returns:
+            list: The values row by row
+        
+        Raises:
+            ValueError: For bad tokens and rows with the wrong number of
+                operands (with line numbers)
+        """
+        reader = load_number_reader()
+        text = input_stream.read()
+        if isinstance(text, bytes):
+            text = text.decode('utf-8', 'replace')
+        values = []
+        problems = []
+        for line_number, line in enumerate(text.replace(',', ' ').split('\n'), 1):
+            tokens = line.split()
+            if tokens and len(tokens) != columns:
+                noun = "number" if columns == 1 else "numbers"
+                problems.append((line_number, line.strip(), f"expected {columns} {noun}, got {len(tokens)}"))
+                continue
+            for token in tokens:
+                try:
+                    if token == 'ans':
+                        values.append(self.current_result)
+                    else:
+                        values.append(parse_exact(token))  # As exact_parse_number()
+                except ValueError:
+                    problems.append((line_number, token, "not a number"))
+                except OverflowError:
+                    problems.append((line_number, token, "out of range"))
+        if problems:
+            more = f" (and {len(problems) - 1} more)" if len(problems) > 1 else ""
+            raise ValueError(reader.format_problem(problems[0]) + more)
+        return values
+    
+    def run_array(self, operation, input_stream, output_stream):
+        """
+        Apply one operation to every row of an operand file with calculate_array().
         
-        print(f"Result: {self.format_result(result)}")
-        print("="*40)
+        Writes one result per row, or "error" for rows that would raise
+        (division by zero, negative square root, overflow).
+        
+        Args:
+            operation (str): Operation name or batch keyword, e.g. 'div'
+            input_stream (file): Operand rows, one per line
+            output_stream (file): Writable text stream for the results
+        
+        Returns:
+            tuple: (number of rows computed, number of error rows)
+        """
+        columns = self.read_operand_columns(input_stream, operation)
+        results, errors = self.calculate_array(operation, *columns)
+        format_result = self.format_result
+        if not isinstance(results, list):
+            results = results.tolist()
+        lines = ["error" if failed else format_result(value)
+                 for value, failed in zip(results, errors.tolist())]
+        if lines:
+            output_stream.write("\n".join(lines) + "\n")
+        failed = sum(errors.tolist())
+        return len(lines) - failed, failed
     
     def run(self):
         """
         Main method to run the calculator program.
         Handles the main loop and user interaction.
         """
-        print("🚀 Welcome to the Simple Calculator!")
-        print("💡 Tip: You can use 'ans' to use the previous result in your next calculation.")
+        self.renderer.message("🚀 Welcome to the Simple Calculator!\n"
+                              "💡 Tip: You can use 'ans' to use the previous result in your next calculation.")
         
         while True:
             self.display_menu()
@@ -398,37 +3044,127 @@ class SimpleCalculator:
                     self.clear_history()
                     continue
                 elif choice == 9:  # Exit
-                    print("\n👋 Thank you for using the Simple Calculator! Goodbye!")
+                    self.renderer.message("\n👋 Thank you for using the Simple Calculator! Goodbye!")
                     sys.exit()
+                elif choice == 11:  # Search History
+                    self.search_history()
+                    continue
+                elif choice == 12:  # Statistics
+                    self.show_stats()
+                    continue
                 
-                # Perform calculation for choices 1-6
+                # Perform calculation for operations and expressions (10)
                 self.perform_calculation(choice)
                 
                 # Ask if user wants to continue with result
                 if not self.is_new_calculation:
-                    continue_choice = input("\nDo you want to perform another operation with this result? (y/n): ").lower()
+                    continue_choice = self.ask("\nDo you want to perform another operation with this result? (y/n): ").lower()
                     if continue_choice != 'y':
                         self.is_new_calculation = True
-                        reset_choice = input("Do you want to reset calculator? (y/n): ").lower()
+                        reset_choice = self.ask("Do you want to reset calculator? (y/n): ").lower()
                         if reset_choice == 'y':
                             self.current_result = 0
                         
             except KeyboardInterrupt:
-                print("\n\n⚠️  Program interrupted by user. Exiting...")
+                self.renderer.message("\n\n⚠️  Program interrupted by user. Exiting...")
+                sys.exit()
+            except EOFError:
+                # Piped input ran out: end the session like Exit
+                self.renderer.message("\n👋 Thank you for using the Simple Calculator! Goodbye!")
                 sys.exit()
             except Exception as e:
-                print(f"\n❌ An unexpected error occurred: {e}")
-                print("Please try again.")
+                self.renderer.warning(f"An unexpected error occurred: {e}")
+                self.renderer.message("Please try again.")
 
 # Main execution
 if __name__ == "__main__":
     """
     Program entry point.
-    Creates a calculator instance and starts the program.
+    Creates a calculator instance and starts the program, or runs the
+    headless batch mode when --batch is given (or the parallel job runner
+    for --jobs, or the vectorized operand-file mode for --array). With
+    --history-file the history is kept in a persistent log across sessions,
+    and --stats-file writes per-method latency statistics when the program
+    exits. A single expression argument is evaluated once and printed.
     """
+    # One-shot fast path: `python 13_Simple_Calculator.py "2^10"` skips
+    # argparse, the menu, the banner and any history setup
+    if len(sys.argv) == 2 and not sys.argv[1].startswith('-'):
+        sys.exit(SimpleCalculator().run_once(sys.argv[1]))
+    
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Simple command-line calculator")
+    parser.add_argument('expression', nargs='?',
+                        help="evaluate one expression, print the result and exit, e.g. \"2^10\"")
+    parser.add_argument('--batch', metavar='FILE',
+                        help="evaluate operation records from FILE ('-' for stdin) without the menu")
+    parser.add_argument('--jobs', metavar='FILE',
+                        help="evaluate a large job file of operation records in parallel")
+    parser.add_argument('--array', nargs=2, metavar=('OP', 'FILE'),
+                        help="apply OP to every row of operands in FILE ('-' for stdin) in one vectorized call")
+    parser.add_argument('--workers', metavar='N', type=int,
+                        help="number of worker processes for --jobs (default: CPU count)")
+    parser.add_argument('--cache-size', metavar='N', type=int,
+                        help="memoize up to N power/square root results")
+    parser.add_argument('--cache-policy', choices=ResultCache.POLICIES, default='lru',
+                        help="eviction policy for --cache-size (default: lru)")
+    parser.add_argument('--history-file', metavar='PATH',
+                        help="keep calculation history in a persistent log at PATH")
+    parser.add_argument('--exact', action='store_true',
+                        help="exact arithmetic: integers stay ints, decimals and division give fractions, "
+                             "floats only as a fallback")
+    parser.add_argument('--output', choices=ScreenRenderer.MODES, default='full',
+                        help="interactive output: full screens, minimal lines, quiet results only, or JSON")
+    parser.add_argument('--stats-file', metavar='PATH',
+                        help="record per-operation counts and latencies and write them to PATH as JSON on exit")
+    parser.add_argument('--compact-history', metavar='N', type=int,
+                        help="shrink the history log to its newest N entries and exit (0 truncates)")
+    args = parser.parse_args()
+    
     try:
-        calculator = SimpleCalculator()
-        calculator.run()
+        calculator = SimpleCalculator(history_file=args.history_file, output_mode=args.output,
+                                      numeric_mode='exact' if args.exact else 'float')
+        if args.cache_size is not None:
+            calculator.enable_result_cache(args.cache_size, args.cache_policy)
+        if args.stats_file is not None:
+            import atexit
+            
+            calculator.enable_stats()
+            atexit.register(calculator.dump_stats, args.stats_file)
+        if args.compact_history is not None:
+            removed = calculator.compact_history(args.compact_history)
+            print(f"✅ Removed {removed} entries from {args.history_file}")
+        elif args.jobs is not None:
+            with open(args.jobs, encoding='utf-8') as job_file:
+                calculator.run_jobs(job_file, sys.stdout, args.workers)
+            sys.stdout.flush()
+        elif args.expression is not None:
+            status = calculator.run_once(args.expression)
+            sys.stdout.flush()
+            sys.exit(status)
+        elif args.array is not None:
+            operation, path = args.array
+            try:
+                if path == '-':
+                    calculator.run_array(operation, sys.stdin, sys.stdout)
+                else:
+                    with open(path, 'rb') as operand_file:
+                        calculator.run_array(operation, operand_file, sys.stdout)
+            except ValueError as e:
+                print(f"❌ Error: {e}")
+                sys.exit(1)
+            sys.stdout.flush()
+        elif args.batch is not None:
+            record_history = calculator.history_log is not None
+            if args.batch == '-':
+                calculator.run_batch(sys.stdin, sys.stdout, record_history)
+            else:
+                with open(args.batch, encoding='utf-8') as batch_file:
+                    calculator.run_batch(batch_file, sys.stdout, record_history)
+            sys.stdout.flush()
+        else:
+            calculator.run()
     except Exception as e:
         print(f"Failed to start calculator: {e}")
         sys.exit(1)
\ No newline at end of file
@@ -0,0 +1,404 @@
+"""
+Program: Calculator Network Service
+Description: Exposes the SimpleCalculator from 13_Simple_Calculator.py as an
+asyncio TCP service speaking line-delimited JSON, plus a load generator and a
+benchmark that reports requests/sec and p50/p99 latency.
+
+Protocol (one JSON object per line in each direction, answered in order):
+
+    {"id": 1, "op": "add", "args": [3, 4]}         -> {"id": 1, "result": 7.0, "display": "7"}
+    {"id": 2, "op": "pow", "args": ["ans", 2]}     -> {"id": 2, "result": 49.0, "display": "49"}
+    {"id": 3, "op": "expr", "expr": "(a + b) ^ 2", "vars": {"a": 1, "b": 2}}
+    {"id": 4, "op": "div", "args": [1, 0]}         -> {"id": 4, "error": "Division by zero is not allowed!"}
+    {"id": 5, "op": "history", "limit": 10}        -> {"id": 5, "history": [...]}
+    {"id": 6, "op": "clear"}                       -> {"id": 6, "cleared": true}
+
+Operation names are the batch-mode keywords of SimpleCalculator (add, sub,
+mul, div, pow, sqrt and their symbols). Each connection gets its own
+calculator, so 'ans', is_new_calculation and history are per session.
+Clients may pipeline: send many requests without waiting for replies.
+
+Usage:
+    python 14_Calculator_Server.py serve --port 8765
+    python 14_Calculator_Server.py load --port 8765 --connections 1000
+    python 14_Calculator_Server.py benchmark --connections 1000
+"""
+
+import argparse
+import asyncio
+import importlib.util
+import json
+import os
+import subprocess
+import sys
+import time
+from collections import deque
+
+
+def load_calculator_module():
+    """
+    Import 13_Simple_Calculator.py (its file name is not a valid module name).
+
+    Returns:
+        module: The calculator module
+    """
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "13_Simple_Calculator.py")
+    spec = importlib.util.spec_from_file_location("simple_calculator", path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+calculator_module = load_calculator_module()
+SimpleCalculator = calculator_module.SimpleCalculator
+
+
+def raise_file_limit():
+    """
+    Raise the open-file limit to its hard maximum where the OS allows it.
+    Each connection needs a file descriptor on both ends.
+    """
+    try:
+        import resource
+    except ImportError:  # Not available on Windows
+        return
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft < hard:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+
+
+def is_number(value):
+    """True for JSON numbers (int or float), but not for booleans."""
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def handle_request(calculator, request):
+    """
+    Execute one protocol request against a session's calculator.
+
+    Errors, including malformed fields such as a non-numeric 'limit',
+    'vars' value or 'args' entry, are reported in the response the same way
+    perform_calculation reports them, and leave the session state unchanged.
+
+    Args:
+        calculator (SimpleCalculator): The connection's calculator
+        request (dict): The decoded request
+
+    Returns:
+        dict: The response (without the request id)
+    """
+    op = request.get('op')
+
+    if op == 'clear':
+        calculator.history.clear()
+        calculator.current_result = 0
+        calculator.is_new_calculation = True
+        return {'cleared': True}
+
+    try:
+        if op == 'history':
+            history = calculator.history
+            limit = max(0, min(int(request.get('limit', len(history))), len(history)))
+            entries = [history.entry(index) for index in range(len(history) - limit, len(history))]
+            return {'history': entries}
+
+        if op == 'expr':
+            text = request.get('expr', '')
+            variables = request.get('vars')
+            if variables is not None and not (isinstance(variables, dict)
+                                              and all(map(is_number, variables.values()))):
+                return {'error': "'vars' must map names to numbers"}
+            if not isinstance(text, str):
+                return {'error': "'expr' must be a string"}
+            result = calculator.evaluate_expression(text, variables)
+            operation, operands = "Expression", [text]
+        else:
+            spec = calculator.operations.lookup(op) if isinstance(op, str) else None
+            if spec is None:
+                return {'error': f"Unknown operation '{op}'"}
+            operation = spec.name
+            args = request.get('args', [])
+            if not isinstance(args, list) or not all(is_number(arg) or isinstance(arg, str) for arg in args):
+                return {'error': "'args' must be a list of numbers (or 'ans')"}
+            if len(args) != spec.arity:
+                return {'error': f"{operation} expects {spec.arity} operand(s), got {len(args)}"}
+            operands = [calculator.parse_batch_operand(arg) if isinstance(arg, str) else float(arg)
+                        for arg in args]
+            result = spec.bind(calculator)(*operands)
+        display = calculator.format_result(result)
+    except OverflowError:
+        return {'error': "Result is too large!"}
+    except (ZeroDivisionError, ValueError, TypeError) as e:
+        return {'error': str(e)}
+
+    calculator.current_result = result
+    calculator.is_new_calculation = False
+    calculator.add_to_history(operation, operands, result)
+    return {'result': result, 'display': display}
+
+
+async def discard_line(reader):
+    """
+    Drop the rest of an over-long request line, up to and including its
+    newline, without ever buffering more than the reader's limit.
+    """
+    while True:
+        try:
+            await reader.readuntil(b'\n')
+            return
+        except asyncio.LimitOverrunError as e:
+            await reader.readexactly(e.consumed)
+        except asyncio.IncompleteReadError:
+            return
+
+
+class CalculatorServer:
+    """
+    asyncio TCP server with one SimpleCalculator session per connection.
+    """
+
+    # Flush to the socket once this much output is buffered; below it,
+    # pipelined replies are batched into fewer send() calls.
+    HIGH_WATER = 64 * 1024
+
+    def __init__(self, history_capacity=1000):
+        """
+        Args:
+            history_capacity (int): History entries kept per session
+        """
+        self.history_capacity = history_capacity
+        self.sessions = 0
+        self.requests = 0
+
+    async def handle_connection(self, reader, writer):
+        """Serve one client until it disconnects."""
+        calculator = SimpleCalculator(history_capacity=self.history_capacity)
+        self.sessions += 1
+        transport = writer.transport
+        dumps = json.dumps
+
+        try:
+            while True:
+                try:
+                    line = await reader.readuntil(b'\n')
+                except asyncio.IncompleteReadError as e:
+                    line = e.partial  # Last line without a newline, b'' at EOF
+                except asyncio.LimitOverrunError:
+                    # Longer than the StreamReader limit (64 KiB by default)
+                    writer.write(b'{"error": "request too long"}\n')
+                    await discard_line(reader)
+                    continue
+                if not line:
+                    break
+                try:
+                    request = json.loads(line)
+                    if not isinstance(request, dict):
+                        raise ValueError
+                except ValueError:
+                    writer.write(b'{"error": "Invalid JSON request"}\n')
+                    continue
+
+                try:
+                    response = handle_request(calculator, request)
+                except Exception as e:
+                    # A bad request must never end the whole session
+                    response = {'error': f"Invalid request: {e}"}
+                if 'id' in request:
+                    response['id'] = request['id']
+                writer.write(dumps(response).encode() + b"\n")
+                self.requests += 1
+
+                # Keep answering pipelined requests that are already buffered;
+                # only wait for the socket when a lot of output piles up.
+                if transport.get_write_buffer_size() > self.HIGH_WATER:
+                    await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self.sessions -= 1
+            writer.close()
+
+    async def serve(self, host, port, ready=None):
+        """
+        Accept connections forever.
+
+        Args:
+            host (str): Interface to bind
+            port (int): Port to bind (0 picks a free port)
+            ready (callable): Called with the bound port once listening
+        """
+        server = await asyncio.start_server(self.handle_connection, host, port, backlog=4096)
+        bound_port = server.sockets[0].getsockname()[1]
+        if ready is not None:
+            ready(bound_port)
+        async with server:
+            await server.serve_forever()
+
+
+def sample_requests():
+    """
+    Cycle through a representative request mix for the load generator.
+
+    Returns:
+        list: Encoded request lines (without ids)
+    """
+    return [
+        {'op': 'add', 'args': [3, 4]},
+        {'op': 'mul', 'args': ['ans', 2.5]},
+        {'op': 'pow', 'args': ['ans', 2]},
+        {'op': 'sqrt', 'args': ['ans']},
+        {'op': 'div', 'args': ['ans', 3]},
+        {'op': 'expr', 'expr': '(a + b) ^ 2 / sqrt(c)', 'vars': {'a': 1, 'b': 2, 'c': 9}},
+    ]
+
+
+async def run_client(host, port, requests, pipeline, latencies):
+    """
+    One load-generator connection: keep `pipeline` requests outstanding.
+
+    Args:
+        host (str): Server host
+        port (int): Server port
+        requests (int): Requests to send on this connection
+        pipeline (int): Maximum requests in flight
+        latencies (list): Per-request latencies (seconds) are appended here
+
+    Returns:
+        int: Number of error responses
+    """
+    reader, writer = await asyncio.open_connection(host, port)
+    mix = sample_requests()
+    sent_at = deque()
+    errors = 0
+    next_id = 0
+
+    def send():
+        nonlocal next_id
+        request = dict(mix[next_id % len(mix)], id=next_id)
+        writer.write(json.dumps(request).encode() + b"\n")
+        sent_at.append(time.perf_counter())
+        next_id += 1
+
+    while next_id < min(pipeline, requests):
+        send()
+    for _ in range(requests):
+        await writer.drain()
+        line = await reader.readline()
+        latencies.append(time.perf_counter() - sent_at.popleft())
+        if b'"error"' in line:
+            errors += 1
+        if next_id < requests:
+            send()
+
+    writer.close()
+    await writer.wait_closed()
+    return errors
+
+
+def percentile(sorted_values, fraction):
+    """Return the value at the given fraction (0-1) of a sorted list."""
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+
+async def run_load(host, port, connections, requests, pipeline):
+    """
+    Drive the server with many concurrent connections.
+
+    Returns:
+        dict: requests, errors, seconds, requests_per_sec, p50_ms, p99_ms
+    """
+    latencies = []
+    start = time.perf_counter()
+    errors = await asyncio.gather(*(run_client(host, port, requests, pipeline, latencies)
+                                    for _ in range(connections)))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return {
+        'connections': connections,
+        'requests': len(latencies),
+        'errors': sum(errors),
+        'seconds': round(elapsed, 3),
+        'requests_per_sec': round(len(latencies) / elapsed, 1),
+        'p50_ms': round(percentile(latencies, 0.50) * 1000, 3),
+        'p99_ms': round(percentile(latencies, 0.99) * 1000, 3),
+    }
+
+
+def print_report(report):
+    """Print a load/benchmark report as a small table."""
+    print("=" * 40)
+    print("        CALCULATOR SERVICE LOAD TEST")
+    print("=" * 40)
+    for key, value in report.items():
+        print(f"{key:<18} {value}")
+    print("=" * 40)
+
+
+def run_benchmark(connections, requests, pipeline):
+    """
+    Start a server in a separate process and load it from this one, so the
+    client and the server do not share an event loop or a GIL.
+
+    Returns:
+        dict: The load report
+    """
+    server = subprocess.Popen(
+        [sys.executable, os.path.abspath(__file__), 'serve', '--port', '0'],
+        stdout=subprocess.PIPE, text=True,
+    )
+    try:
+        # The server announces "Listening on host:port" once it is ready
+        port = int(server.stdout.readline().rsplit(':', 1)[1])
+        return asyncio.run(run_load('127.0.0.1', port, connections, requests, pipeline))
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="SimpleCalculator as an asyncio TCP service")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    serve = commands.add_parser('serve', help="run the calculator service")
+    serve.add_argument('--host', default='127.0.0.1')
+    serve.add_argument('--port', type=int, default=8765)
+
+    for name, help_text in (('load', "load an already running service"),
+                            ('benchmark', "start a service and load it")):
+        command = commands.add_parser(name, help=help_text)
+        if name == 'load':
+            command.add_argument('--host', default='127.0.0.1')
+            command.add_argument('--port', type=int, default=8765)
+        command.add_argument('--connections', type=int, default=1000)
+        command.add_argument('--requests', type=int, default=100, help="requests per connection")
+        command.add_argument('--pipeline', type=int, default=8, help="requests in flight per connection")
+        command.add_argument('--json', action='store_true', help="print the report as JSON")
+
+    args = parser.parse_args()
+    raise_file_limit()
+
+    if args.command == 'serve':
+        def announce(port):
+            print(f"Listening on {args.host}:{port}", flush=True)
+        try:
+            asyncio.run(CalculatorServer().serve(args.host, args.port, announce))
+        except KeyboardInterrupt:
+            pass
+        return
+
+    if args.command == 'load':
+        report = asyncio.run(run_load(args.host, args.port, args.connections, args.requests, args.pipeline))
+    else:
+        report = run_benchmark(args.connections, args.requests, args.pipeline)
+
+    if args.json:
+        print(json.dumps(report))
+    else:
+        print_report(report)
+
+
+if __name__ == "__main__":
+    main()
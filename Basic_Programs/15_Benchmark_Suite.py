@@ -0,0 +1,435 @@
+"""
+Program: Benchmark Suite
+Description: Measures the computational core of the programs in this folder:
+the SimpleCalculator operations (13) in float and exact mode, the five
+odd/even methods (07-11), the three swap methods (02-04) and the
+largest-of-three finder (12), plus the cold-start time of a one-shot
+calculator invocation.
+
+Every kernel is run over several input sizes and number magnitudes (small
+integers, floats and integers with a million digits). The 'exact' group runs
+the same calculator operations with numeric_mode='exact' (ints and Fractions
+instead of floats), to be read against the 'calculator' table. Results are
+printed as a comparison table and can be saved as JSON. Given a stored
+baseline, the suite exits with status 1 when a kernel got slower than the
+allowed threshold.
+
+--startup times a one-shot calculator command ("2^10") as fresh processes
+against a bare `python -c pass`, so process spawn is separated from the
+calculator's own import and init work, and lists the modules it imports
+(from -X importtime) by cumulative import time. Two launch forms are
+measured: running the file as a script, which compiles all of it on every
+start, and `python -m 13_Simple_Calculator`, which loads the cached bytecode.
+The suite exits with status 1 when the median overhead of the -m form
+exceeds --startup-budget milliseconds.
+
+Usage:
+    python 15_Benchmark_Suite.py
+    python 15_Benchmark_Suite.py --groups parity,swap --sizes 1000,100000
+    python 15_Benchmark_Suite.py --output baseline.json
+    python 15_Benchmark_Suite.py --baseline baseline.json --threshold 0.25
+    python 15_Benchmark_Suite.py --startup --startup-budget 25
+"""
+
+import argparse
+import importlib.util
+import json
+import math
+import os
+import py_compile
+import random
+import statistics
+import subprocess
+import sys
+import time
+
+# One-shot calculator commands measured by --startup (run in this folder)
+STARTUP_COMMANDS = {
+    'script': ["13_Simple_Calculator.py", "2^10"],
+    'module': ["-m", "13_Simple_Calculator", "2^10"],
+}
+
+
+def load_program(filename):
+    """
+    Import one of the numbered programs in this folder by file name.
+
+    The programs keep their input() calls under `if __name__ == "__main__"`,
+    so importing them only defines their functions.
+
+    Args:
+        filename (str): e.g. "07_Odd_Even_Method1.py"
+
+    Returns:
+        module: The loaded program
+    """
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), filename)
+    name = "program_" + os.path.splitext(filename)[0].lower()
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def collect_kernels():
+    """
+    Load every program and list its kernels.
+
+    Returns:
+        dict: group -> list of (kernel name, function, number of arguments)
+    """
+    program = load_program("13_Simple_Calculator.py")
+    calculator = program.SimpleCalculator()
+    exact = program.SimpleCalculator(numeric_mode='exact')
+    parity_files = [
+        ("modulus", "07_Odd_Even_Method1.py"),
+        ("bitwise_and", "08_Odd_Even_Method2.py"),
+        ("floor_division", "09_Odd_Even_Method3.py"),
+        ("recursive", "10_Odd_Even_Method4.py"),
+        ("list_indexing", "11_Odd_Even_Method5.py"),
+    ]
+    return {
+        'calculator': [
+            ('add', calculator.add, 2),
+            ('subtract', calculator.subtract, 2),
+            ('multiply', calculator.multiply, 2),
+            ('divide', calculator.divide, 2),
+            ('power', calculator.power, 2),
+            ('square_root', calculator.square_root, 1),
+        ],
+        'exact': [
+            ('add', exact.add, 2),
+            ('subtract', exact.subtract, 2),
+            ('multiply', exact.multiply, 2),
+            ('divide', exact.divide, 2),
+            ('power', exact.power, 2),
+            ('square_root', exact.square_root, 1),
+        ],
+        'parity': [(name, load_program(filename).check_even_odd, 1) for name, filename in parity_files],
+        'swap': [
+            ('temp_variable', load_program("02_Swap_Numbers_Method1.py").swap_with_temp, 2),
+            ('arithmetic', load_program("03_Swap_Numbers_Method2.py").swap_with_arithmetic, 2),
+            ('tuple_unpacking', load_program("04_Swap_Numbers_Method3.py").swap_with_tuple, 2),
+        ],
+        'largest': [
+            ('largest_of_three', load_program("12_Find_Largest_Number.py").largest_of_three, 3),
+        ],
+    }
+
+
+def make_values(magnitude, count, rng):
+    """
+    Generate benchmark inputs of one magnitude.
+
+    Million-digit integers are expensive to create and hold, so a small pool
+    of them is generated and reused cyclically.
+
+    Args:
+        magnitude (str): 'small_int', 'float' or 'huge_int'
+        count (int): Number of values
+        rng (random.Random): Seeded random generator
+
+    Returns:
+        list: The values
+    """
+    if magnitude == 'small_int':
+        # Kept small enough that small_int ** small_int stays a finite float
+        return [rng.randint(1, 100) for _ in range(count)]
+    if magnitude == 'float':
+        return [rng.uniform(1.0, 100.0) for _ in range(count)]
+    if magnitude == 'huge_int':
+        bits = int(10**6 * math.log2(10))  # About one million decimal digits
+        pool = [rng.getrandbits(bits) | (1 << (bits - 1)) for _ in range(4)]
+        return [pool[i % len(pool)] for i in range(count)]
+    raise ValueError(f"Unknown magnitude '{magnitude}'")
+
+
+def time_kernel(function, arguments, repeat, budget):
+    """
+    Time a kernel over a list of argument tuples.
+
+    Calls run in blocks of doubling size (1, 2, 4 ... 64) and the clock is
+    only checked between blocks, so cheap kernels pay no per-call overhead
+    while very slow ones (e.g. million-digit multiplication) stop once the
+    time budget is spent.
+
+    Args:
+        function (callable): The kernel
+        arguments (list): Argument tuples
+        repeat (int): Number of timed passes; the fastest one is reported
+        budget (float): Seconds allowed for all passes together
+
+    Returns:
+        tuple: (calls in the fastest pass, seconds per call)
+    """
+    blocks = []
+    start = size = 0
+    while start < len(arguments):
+        size = min(size * 2 or 1, 64)
+        blocks.append(arguments[start:start + size])
+        start += size
+
+    perf_counter = time.perf_counter
+    deadline = perf_counter() + budget
+    best_calls, best_time = 0, math.inf
+    for _ in range(repeat):
+        calls = 0
+        begin = perf_counter()
+        for block in blocks:
+            for args in block:
+                function(*args)
+            calls += len(block)
+            if perf_counter() > deadline:
+                break
+        per_call = (perf_counter() - begin) / calls
+        if per_call < best_time:
+            best_calls, best_time = calls, per_call
+        if perf_counter() > deadline:
+            break
+    return best_calls, best_time
+
+
+def run_suite(groups, sizes, magnitudes, repeat=3, budget=1.0, seed=2024):
+    """
+    Benchmark every kernel of the selected groups.
+
+    Returns:
+        list: One result dict per (kernel, magnitude, size)
+    """
+    kernels = collect_kernels()
+    rng = random.Random(seed)
+    results = []
+
+    for magnitude in magnitudes:
+        for size in sizes:
+            # One shared column per argument position, so every kernel of a
+            # group sees exactly the same inputs
+            columns = [make_values(magnitude, size, rng) for _ in range(3)]
+            for group in groups:
+                for name, function, arity in kernels[group]:
+                    arguments = list(zip(*columns[:arity]))
+                    record = {'group': group, 'kernel': name, 'magnitude': magnitude, 'size': size}
+                    try:
+                        function(*arguments[0])  # Fail fast on unsupported inputs
+                        calls, seconds = time_kernel(function, arguments, repeat, budget)
+                        record.update(status='ok', calls=calls, ns_per_op=round(seconds * 1e9, 1))
+                    except (ArithmeticError, ValueError, TypeError, RecursionError) as e:
+                        record.update(status=f"error: {type(e).__name__}", calls=0, ns_per_op=None)
+                    results.append(record)
+    return results
+
+
+def format_time(ns):
+    """Format nanoseconds per operation with a readable unit."""
+    if ns is None:
+        return "n/a"
+    for unit, scale in (("s", 1e9), ("ms", 1e6), ("us", 1e3)):
+        if ns >= scale:
+            return f"{ns / scale:.2f} {unit}"
+    return f"{ns:.1f} ns"
+
+
+def print_table(results, magnitudes):
+    """
+    Print one comparison table per group and size: kernels as rows,
+    magnitudes as columns, time per operation in the cells.
+    """
+    cells = {(r['group'], r['kernel'], r['magnitude'], r['size']): r for r in results}
+    groups = list(dict.fromkeys(r['group'] for r in results))
+    sizes = sorted({r['size'] for r in results})
+    table_keys = [(group, size) for group in groups for size in sizes]
+
+    for group, size in table_keys:
+        kernels = list(dict.fromkeys(r['kernel'] for r in results if r['group'] == group))
+        width = 20 + 16 * len(magnitudes)
+        print()
+        print("=" * width)
+        print(f"{group.upper()} (n = {size}, time per operation)")
+        print("=" * width)
+        print(f"{'Kernel':<20}" + "".join(f"{m:>16}" for m in magnitudes))
+        print("-" * width)
+        for kernel in kernels:
+            row = f"{kernel:<20}"
+            for magnitude in magnitudes:
+                record = cells.get((group, kernel, magnitude, size))
+                if record is None:
+                    cell = ""
+                elif record['status'] == 'ok':
+                    cell = format_time(record['ns_per_op'])
+                else:
+                    cell = record['status'].split(": ")[-1]
+                row += f"{cell:>16}"
+            print(row)
+
+
+def find_regressions(results, baseline, threshold):
+    """
+    Compare results against a stored baseline.
+
+    Args:
+        results (list): Fresh results
+        baseline (list): Results loaded from an earlier --output file
+        threshold (float): Allowed slowdown, e.g. 0.2 for 20%
+
+    Returns:
+        list: (result, baseline ns_per_op) for every regressed kernel
+    """
+    def key(r):
+        return (r['group'], r['kernel'], r['magnitude'], r['size'])
+
+    previous = {key(r): r for r in baseline if r.get('status') == 'ok'}
+    regressions = []
+    for record in results:
+        old = previous.get(key(record))
+        if old is None or record['status'] != 'ok':
+            continue
+        if record['ns_per_op'] > old['ns_per_op'] * (1 + threshold):
+            regressions.append((record, old['ns_per_op']))
+    return regressions
+
+
+def parse_importtime(stderr):
+    """
+    Parse the report written by `python -X importtime`.
+
+    Args:
+        stderr (str): The interpreter's standard error
+
+    Returns:
+        list: (module, self us, cumulative us, depth) in report order;
+        depth 0 is a module imported directly by the program
+    """
+    imports = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        imports.append((name.strip(), int(self_us), int(cumulative_us), depth))
+    return imports
+
+
+def measure_startup(runs=20):
+    """
+    Time the one-shot calculator commands as fresh processes.
+
+    The calculator's bytecode is compiled first, as it would be for an
+    installed copy, so the -m form never pays for compilation.
+
+    Args:
+        runs (int): Processes started per command; medians are reported
+
+    Returns:
+        dict: interpreter_ms (median of `python -c pass`), and for each of
+        STARTUP_COMMANDS its median *_ms and *_overhead_ms over the bare
+        interpreter; imports lists the modules the calculator imports beyond
+        a bare interpreter as (module, cumulative us), slowest first
+    """
+    folder = os.path.dirname(os.path.abspath(__file__))
+    py_compile.compile(os.path.join(folder, "13_Simple_Calculator.py"), doraise=True)
+    commands = {'interpreter': [sys.executable, "-c", "pass"]}
+    for name, arguments in STARTUP_COMMANDS.items():
+        commands[name] = [sys.executable] + arguments
+
+    startup = {}
+    for name, command in commands.items():
+        times = []
+        for _ in range(runs):
+            start = time.perf_counter()
+            subprocess.run(command, cwd=folder, stdout=subprocess.DEVNULL, check=True)
+            times.append(time.perf_counter() - start)
+        startup[f"{name}_ms"] = statistics.median(times) * 1000
+    for name in STARTUP_COMMANDS:
+        startup[f"{name}_overhead_ms"] = startup[f"{name}_ms"] - startup['interpreter_ms']
+
+    reports = {}
+    for name in ('interpreter', 'module'):
+        command = commands[name]
+        completed = subprocess.run([command[0], "-X", "importtime"] + command[1:], cwd=folder,
+                                   stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True, check=True)
+        reports[name] = parse_importtime(completed.stderr)
+    baseline = {module for module, _, _, _ in reports['interpreter']}
+    startup['imports'] = sorted(((module, cumulative) for module, _, cumulative, depth in reports['module']
+                                 if depth == 0 and module not in baseline), key=lambda item: -item[1])
+    return startup
+
+
+def print_startup(startup):
+    """Print the startup measurement and the slowest imports."""
+    print("=" * 60)
+    print("STARTUP (one-shot \"2^10\", median wall-clock time)")
+    print("=" * 60)
+    print(f"{'Command':<34} {'Total':>11} {'Overhead':>12}")
+    print("-" * 60)
+    print(f"{'python -c pass':<34} {startup['interpreter_ms']:>8.1f} ms {'':>12}")
+    for name, arguments in STARTUP_COMMANDS.items():
+        command = "python " + " ".join(arguments)
+        print(f"{command:<34} {startup[f'{name}_ms']:>8.1f} ms {startup[f'{name}_overhead_ms']:>9.1f} ms")
+    print("-" * 60)
+    print(f"{'Import (beyond the interpreter)':<34} {'Cumulative':>11}")
+    for module, cumulative in startup['imports'][:10]:
+        print(f"{module:<34} {format_time(cumulative * 1000):>11}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the Basic_Programs kernels")
+    parser.add_argument('--groups', default='calculator,exact,parity,swap,largest',
+                        help="comma-separated groups (calculator, exact, parity, swap, largest)")
+    parser.add_argument('--sizes', default='1000,10000', help="comma-separated input sizes")
+    parser.add_argument('--magnitudes', default='small_int,float,huge_int',
+                        help="comma-separated magnitudes (small_int, float, huge_int)")
+    parser.add_argument('--repeat', type=int, default=3, help="timed passes per case (best is kept)")
+    parser.add_argument('--budget', type=float, default=1.0, help="seconds allowed per case")
+    parser.add_argument('--output', metavar='FILE', help="write the results as JSON")
+    parser.add_argument('--baseline', metavar='FILE', help="compare against results from an earlier --output")
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help="allowed slowdown against the baseline (default: 0.2 = 20%%)")
+    parser.add_argument('--startup', action='store_true',
+                        help="measure the cold start of a one-shot calculator command instead")
+    parser.add_argument('--startup-runs', type=int, default=20, help="processes started per command (default: 20)")
+    parser.add_argument('--startup-budget', type=float, default=25.0,
+                        help="allowed overhead of the -m command over a bare interpreter in ms (default: 25)")
+    args = parser.parse_args()
+
+    if args.startup:
+        startup = measure_startup(args.startup_runs)
+        print_startup(startup)
+        if args.output:
+            with open(args.output, 'w', encoding='utf-8') as output_file:
+                json.dump({'python': sys.version.split()[0], 'startup': startup}, output_file, indent=2)
+            print(f"\nResults written to {args.output}")
+        if startup['module_overhead_ms'] > args.startup_budget:
+            print(f"\n❌ Startup overhead {startup['module_overhead_ms']:.1f} ms exceeds the "
+                  f"{args.startup_budget:g} ms budget")
+            sys.exit(1)
+        print(f"\n✅ Startup overhead within the {args.startup_budget:g} ms budget")
+        return
+
+    groups = args.groups.split(',')
+    magnitudes = args.magnitudes.split(',')
+    sizes = [int(size) for size in args.sizes.split(',')]
+
+    results = run_suite(groups, sizes, magnitudes, args.repeat, args.budget)
+    print_table(results, magnitudes)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as output_file:
+            json.dump({'python': sys.version.split()[0], 'results': results}, output_file, indent=2)
+        print(f"\nResults written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as baseline_file:
+            baseline = json.load(baseline_file)['results']
+        regressions = find_regressions(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n❌ {len(regressions)} kernel(s) regressed by more than {args.threshold:.0%}:")
+            for record, old in regressions:
+                print(f"  {record['group']}/{record['kernel']} [{record['magnitude']}, n={record['size']}]: "
+                      f"{format_time(old)} -> {format_time(record['ns_per_op'])}")
+            sys.exit(1)
+        print(f"\n✅ No kernel regressed by more than {args.threshold:.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,334 @@
+"""
+Program: Odd/Even Engine
+Description: The five odd/even methods of 07-11_Odd_Even_Method*.py gathered
+into one importable module with a callable API and a bulk entry point.
+
+Every kernel returns 0 for even and 1 for odd:
+
+    modulus         n % 2                (07_Odd_Even_Method1.py)
+    bitwise         n & 1                (08_Odd_Even_Method2.py)
+    floor_division  n - (n // 2) * 2     (09_Odd_Even_Method3.py)
+    table           low-byte lookup      (11_Odd_Even_Method5.py, list indexing)
+    recursive       bounded trampoline   (10_Odd_Even_Method4.py, reference only)
+
+The first four take constant time for machine-sized integers. For big
+non-negative integers 'bitwise' and 'table' stay constant-time because
+CPython only looks at the lowest digit, while % and // walk every digit.
+Negative big integers are converted to two's complement by & in O(digits).
+'recursive' needs n/2 steps and is only kept as a bounded reference.
+
+Numbers that arrive as text never need to become ints: decimal_parity()
+validates the digits (with the same rules as int()) and reads the parity
+off the last digit in one O(n) pass, and decimal_stream_parity() does the
+same for multi-megabyte digit streams in fixed-size chunks. This avoids
+CPython's superlinear decimal-to-int conversion and its max_str_digits
+limit (4300 digits by default).
+
+Usage:
+    python 16_Odd_Even_Engine.py 12 -7 18446744073709551617
+    python 16_Odd_Even_Engine.py --method modulus 42
+    python 16_Odd_Even_Engine.py --file huge_number.txt
+"""
+
+import argparse
+import importlib.util
+import os
+import sys
+import unicodedata
+
+PARITY_NAMES = ("even", "odd")
+
+# Parity of every possible low byte, for the table-lookup method
+PARITY_TABLE = bytes(value & 1 for value in range(256))
+
+
+def parity_modulus(n):
+    """Return 0 for even, 1 for odd using the modulus operator."""
+    return n % 2
+
+
+def parity_bitwise(n):
+    """Return 0 for even, 1 for odd by testing the least significant bit."""
+    return n & 1
+
+
+def parity_floor_division(n):
+    """Return 0 for even, 1 for odd by comparing n with (n // 2) * 2."""
+    return n - (n // 2) * 2
+
+
+def parity_table(n):
+    """Return 0 for even, 1 for odd by looking up the lowest byte."""
+    return PARITY_TABLE[n & 0xFF]
+
+
+def parity_recursive(n):
+    """
+    Reference implementation: the bounded, trampolined recursive method from
+    10_Odd_Even_Method4.py. O(n) time; raises ValueError for large inputs.
+    """
+    return PARITY_NAMES.index(load_recursive_method()(n))
+
+
+_recursive_method = None
+
+
+def load_recursive_method():
+    """
+    Load check_even_odd from 10_Odd_Even_Method4.py on first use.
+
+    Returns:
+        callable: The bounded recursive check_even_odd
+    """
+    global _recursive_method
+    if _recursive_method is None:
+        path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "10_Odd_Even_Method4.py")
+        spec = importlib.util.spec_from_file_location("odd_even_method4", path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        _recursive_method = module.check_even_odd
+    return _recursive_method
+
+
+METHODS = {
+    'modulus': parity_modulus,
+    'bitwise': parity_bitwise,
+    'floor_division': parity_floor_division,
+    'table': parity_table,
+    'recursive': parity_recursive,
+}
+
+
+def last_digit_parity(digit):
+    """
+    Return 0 or 1 for a single decimal digit (str of length 1 or a byte value).
+
+    ASCII '0'-'9' have the same parity as their digit. Other Unicode decimal
+    digits, which int() also accepts, are looked up.
+    """
+    if isinstance(digit, int):  # Indexing bytes gives the byte value
+        return digit & 1
+    if digit < '\x80':
+        return ord(digit) & 1
+    return unicodedata.decimal(digit) & 1
+
+
+def is_digit_run(text):
+    """Return True if text consists only of decimal digits (ASCII for bytes)."""
+    return text.isdigit() if isinstance(text, bytes) else text.isdecimal()
+
+
+def decimal_parity(text):
+    """
+    Parity of an integer written in decimal, without converting it to int.
+
+    Accepts exactly what int() accepts: surrounding whitespace, an optional
+    sign, decimal digits and single underscores between digits.
+
+    Args:
+        text (str or bytes): The integer as text
+
+    Returns:
+        int: 0 for even, 1 for odd
+
+    Raises:
+        ValueError: If text is not a valid integer
+    """
+    digits = text.strip()
+    if digits[:1] in ('+', '-', b'+', b'-'):
+        digits = digits[1:]
+    underscore = '_' if isinstance(digits, str) else b'_'
+    if underscore in digits:
+        if digits[:1] == underscore or digits[-1:] == underscore or underscore * 2 in digits:
+            raise ValueError(f"Invalid integer: {text[:50]!r}")
+        digits = digits.replace(underscore, underscore[:0])
+    if not digits or not is_digit_run(digits):
+        raise ValueError(f"Invalid integer: {text[:50]!r}")
+    return last_digit_parity(digits[-1])
+
+
+def decimal_stream_parity(stream, chunk_size=1 << 20):
+    """
+    Parity of a huge decimal integer read from a text or binary stream.
+
+    The stream is read in fixed-size chunks, so memory use does not depend
+    on the number of digits. Validation follows the rules of
+    decimal_parity(), including across chunk boundaries.
+
+    Args:
+        stream (file): Readable text or binary file object
+        chunk_size (int): Characters (or bytes) read at a time
+
+    Returns:
+        int: 0 for even, 1 for odd
+
+    Raises:
+        ValueError: If the stream does not contain a single valid integer
+    """
+    last_digit = None
+    started = ended = previous_underscore = False
+
+    while True:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            break
+        underscore = '_' if isinstance(chunk, str) else b'_'
+        if not started:
+            chunk = chunk.lstrip()
+            if not chunk:
+                continue
+            started = True
+            if chunk[:1] in ('+', '-', b'+', b'-'):
+                chunk = chunk[1:]
+        body = chunk.rstrip()
+        if body:
+            if ended:  # Digits after trailing whitespace, e.g. "12 34"
+                raise ValueError("Invalid integer: unexpected whitespace")
+            if body[:1] == underscore and (previous_underscore or last_digit is None):
+                raise ValueError("Invalid integer: misplaced underscore")
+            if underscore * 2 in body:
+                raise ValueError("Invalid integer: misplaced underscore")
+            previous_underscore = body[-1:] == underscore
+            digits = body.replace(underscore, underscore[:0])
+            if digits and not is_digit_run(digits):
+                raise ValueError("Invalid integer: non-digit characters")
+            if digits:
+                last_digit = digits[-1]
+        if len(body) < len(chunk):
+            ended = True
+
+    if last_digit is None or previous_underscore:
+        raise ValueError("Invalid integer: no digits" if last_digit is None else "Invalid integer: trailing underscore")
+    return last_digit_parity(last_digit)
+
+
+def get_kernel(method):
+    """
+    Look up a parity kernel by name.
+
+    Raises:
+        ValueError: If the method is unknown
+    """
+    try:
+        return METHODS[method]
+    except KeyError:
+        raise ValueError(f"Unknown parity method '{method}' (choose from {', '.join(METHODS)})") from None
+
+
+def parity(n, method='bitwise'):
+    """
+    Classify one integer.
+
+    Integers given as decimal text (str or bytes) are classified by
+    decimal_parity() without converting them, whatever the method.
+
+    Args:
+        n (int, str or bytes): The number to classify
+        method (str): Kernel name from METHODS
+
+    Returns:
+        str: "even" or "odd"
+
+    Raises:
+        TypeError: If n is not an integer
+        ValueError: If the method is unknown or the text is not an integer
+    """
+    if isinstance(n, (str, bytes)):
+        return PARITY_NAMES[decimal_parity(n)]
+    if not isinstance(n, int):
+        raise TypeError(f"Parity is only defined for integers, not {type(n).__name__}")
+    return PARITY_NAMES[get_kernel(method)(n)]
+
+
+def is_even(n):
+    """Return True if the integer n is even."""
+    return not n & 1
+
+
+def is_odd(n):
+    """Return True if the integer n is odd."""
+    return bool(n & 1)
+
+
+def classify(values, method='bitwise'):
+    """
+    Classify many integers in one call.
+
+    NumPy integer arrays are handled in a single vectorized `& 1`; any other
+    iterable is consumed once, lazily, so generators over huge inputs work.
+
+    Args:
+        values (iterable): Integers (or a NumPy integer array)
+        method (str): Kernel name from METHODS (ignored for NumPy arrays)
+
+    Returns:
+        bytearray or ndarray: One flag per value, 0 for even and 1 for odd
+    """
+    if type(values).__module__ == 'numpy' and getattr(values, 'dtype', None) is not None:
+        if values.dtype.kind in 'iu':
+            return (values & 1).astype('uint8')
+    if method == 'bitwise':
+        return bytearray(n & 1 for n in values)
+    return bytearray(map(get_kernel(method), values))
+
+
+def count_parity(values, method='bitwise'):
+    """
+    Count even and odd values without keeping per-value results.
+
+    Args:
+        values (iterable): Integers
+        method (str): Kernel name from METHODS
+
+    Returns:
+        tuple: (number of evens, number of odds)
+    """
+    kernel = get_kernel(method)
+    total = odd = 0
+    for n in values:
+        odd += kernel(n)
+        total += 1
+    return total - odd, odd
+
+
+def describe(text):
+    """Shorten very long numbers for display."""
+    text = text.strip()
+    if len(text) <= 60:
+        return text
+    return f"{text[:25]}...{text[-25:]} ({len(text)} characters)"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check whether integers are even or odd")
+    parser.add_argument('numbers', nargs='*', help="integers to classify (prompted if omitted)")
+    parser.add_argument('--method', choices=METHODS,
+                        help="convert to int and use this kernel (default: read the last digit)")
+    parser.add_argument('--file', help="stream one huge integer from a file ('-' for stdin)")
+    args = parser.parse_args()
+
+    if args.file is not None:
+        try:
+            if args.file == '-':
+                result = decimal_stream_parity(sys.stdin.buffer)
+            else:
+                with open(args.file, 'rb') as number_file:
+                    result = decimal_stream_parity(number_file)
+        except (OSError, ValueError) as e:
+            print(f"❌ {args.file}: {e}")
+            sys.exit(1)
+        print(f"The number in {args.file} is {PARITY_NAMES[result]}.")
+        return
+
+    numbers = args.numbers or [input("Enter a number: ")]
+    for text in numbers:
+        try:
+            value = text if args.method is None else int(text)
+            print(f"{describe(text)} is {parity(value, args.method or 'bitwise')}.")
+        except ValueError as e:
+            print(f"❌ {describe(text)}: {e}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,403 @@
+"""
+Program: Streaming Odd/Even Classifier
+Description: Classifies every integer in a huge newline-separated file as
+even or odd without creating a Python int per line.
+
+The parity of a decimal integer is the parity of its last digit, and the
+ASCII codes of '0'-'9' (48-57) have the same parity as the digits they
+stand for. So the file is memory-mapped, the byte before every newline is
+found with NumPy, and `byte & 1` classifies a whole chunk of lines in one
+vectorized step. This works for int64 values and for integers of any
+length alike, and nothing is ever converted to int.
+
+Each line must be an optional '+'/'-' followed by digits (an optional '\\r'
+before the newline is allowed). Empty lines are skipped. Without NumPy a
+slower pure Python line loop is used.
+
+Usage:
+    python 17_Odd_Even_Stream.py count numbers.txt
+    python 17_Odd_Even_Stream.py bitmap numbers.txt parity.bits
+    python 17_Odd_Even_Stream.py split numbers.txt even.txt odd.txt
+    python 17_Odd_Even_Stream.py benchmark --lines 5000000
+"""
+
+import argparse
+import importlib.util
+import mmap
+import os
+import sys
+import tempfile
+import time
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; the pure Python path is used instead
+    np = None
+
+CHUNK_SIZE = 64 * 1024 * 1024  # Bytes processed by NumPy at a time
+NEWLINE, CARRIAGE_RETURN, PLUS, MINUS = 10, 13, 43, 45
+VALID_BYTES = b'0123456789+-\r\n'
+
+
+def chunk_ranges(view, chunk_size):
+    """
+    Split a mapped file into byte ranges that end right after a newline.
+
+    Args:
+        view (mmap.mmap): The mapped file
+        chunk_size (int): Target chunk size in bytes
+
+    Yields:
+        tuple: (start, end) byte offsets
+    """
+    size = len(view)
+    start = 0
+    while start < size:
+        end = min(start + chunk_size, size)
+        if end < size:
+            newline = view.rfind(b'\n', start, end)
+            if newline == -1:  # A single line longer than the chunk
+                newline = view.find(b'\n', end)
+            end = size if newline == -1 else newline + 1
+        yield start, end
+        start = end
+
+
+def line_digits(line):
+    """
+    Strip the optional sign and '\r' from one line (without its newline).
+
+    Args:
+        line (bytes): The line
+
+    Returns:
+        bytes or None: The digits (b'' for an empty line), or None if the
+        line is not an integer
+    """
+    digits = line[:-1] if line[-1:] == b'\r' else line
+    if not digits:
+        return digits
+    if digits[:1] in (b'+', b'-'):
+        digits = digits[1:]
+    # bytes.isdigit() only accepts the ASCII digits 0-9
+    return digits if digits.isdigit() else None
+
+
+def first_bad_line(chunk):
+    """
+    Find the first malformed line of a chunk (slow path, errors only).
+
+    Returns:
+        int: 0-based line index within the chunk
+    """
+    for index, line in enumerate(chunk.split(b'\n')):
+        if line_digits(line) is None:
+            return index
+    return 0
+
+
+def classify_chunk(chunk, first_line):
+    """
+    Classify every line of one chunk with vectorized NumPy operations.
+
+    Validation never loops over lines in Python: bytes.translate() checks
+    that only digits, signs and line endings occur, and the number of signs
+    and '\r's in the chunk must equal the number found at line starts and
+    line ends. Every non-empty line must end with a digit.
+
+    Args:
+        chunk (bytes): Whole lines of the file
+        first_line (int): 1-based line number of the chunk's first line
+
+    Returns:
+        tuple: (buf, codes, lengths) where buf is a uint8 array over the
+               chunk and, per line, code 0 = even, 1 = odd, 2 = empty line
+               and length includes the newline
+
+    Raises:
+        ValueError: With the line number of the first malformed line
+    """
+    buf = np.frombuffer(chunk, dtype=np.uint8)
+    ends = np.flatnonzero(buf == NEWLINE)
+    if chunk[-1] != NEWLINE:
+        ends = np.append(ends, len(buf))  # Last line of the file has no newline
+    starts = np.empty_like(ends)
+    starts[0] = 0
+    starts[1:] = ends[:-1] + 1
+
+    # Index of each line's last character, ignoring a '\r' before the newline
+    last = ends - 1
+    has_cr = last >= starts
+    has_cr[has_cr] = buf[last[has_cr]] == CARRIAGE_RETURN
+    last -= has_cr
+    empty = last < starts
+
+    last_bytes = buf[np.where(empty, 0, last)]
+    first_bytes = buf[np.where(empty, 0, starts)]
+    if (chunk.translate(None, VALID_BYTES)
+            or chunk.count(b'-') != np.count_nonzero(~empty & (first_bytes == MINUS))
+            or chunk.count(b'+') != np.count_nonzero(~empty & (first_bytes == PLUS))
+            or chunk.count(b'\r') != np.count_nonzero(has_cr)
+            or (~empty & ((last_bytes < 48) | (last_bytes > 57))).any()):
+        raise ValueError(f"Line {first_line + first_bad_line(chunk)} is not an integer")
+
+    codes = (last_bytes & 1).astype(np.uint8)
+    codes[empty] = 2
+    lengths = np.diff(np.append(starts, len(buf)))
+    return buf, codes, lengths
+
+
+def scan_file(path, on_chunk, chunk_size=CHUNK_SIZE):
+    """
+    Memory-map a file and pass every chunk's classification to on_chunk.
+
+    Each chunk is copied out of the map once (a single memcpy), which keeps
+    no NumPy views of the map alive and lets bytes methods work on it.
+
+    Args:
+        path (str): File of newline-separated integers
+        on_chunk (callable): Called as on_chunk(buf, codes, lengths)
+        chunk_size (int): Bytes per chunk
+    """
+    with open(path, 'rb') as number_file:
+        if os.fstat(number_file.fileno()).st_size == 0:
+            return
+        with mmap.mmap(number_file.fileno(), 0, access=mmap.ACCESS_READ) as view:
+            line = 1
+            for start, end in chunk_ranges(view, chunk_size):
+                buf, codes, lengths = classify_chunk(view[start:end], line)
+                on_chunk(buf, codes, lengths)
+                line += len(codes)
+
+
+def iter_line_parity(path):
+    """
+    Pure Python fallback: yield (line, parity) for every non-empty line.
+
+    The yielded line keeps a trailing '\r' (but not the newline), so split
+    output is byte-for-byte the same as on the NumPy path.
+
+    Raises:
+        ValueError: With the line number of the first malformed line
+    """
+    with open(path, 'rb') as number_file:
+        for line_number, line in enumerate(number_file, 1):
+            line = line.rstrip(b'\n')
+            digits = line_digits(line)
+            if digits is None:
+                raise ValueError(f"Line {line_number} is not an integer")
+            if digits:
+                yield line, digits[-1] & 1
+
+
+def count_file(path, chunk_size=CHUNK_SIZE):
+    """
+    Count even and odd integers in a file.
+
+    Returns:
+        tuple: (evens, odds)
+    """
+    if np is None:
+        odd = total = 0
+        for _, parity in iter_line_parity(path):
+            odd += parity
+            total += 1
+        return total - odd, odd
+
+    totals = [0, 0]
+
+    def on_chunk(buf, codes, lengths):
+        counts = np.bincount(codes, minlength=3)
+        totals[0] += int(counts[0])
+        totals[1] += int(counts[1])
+
+    scan_file(path, on_chunk, chunk_size)
+    return totals[0], totals[1]
+
+
+def bitmap_file(path, output_path, chunk_size=CHUNK_SIZE):
+    """
+    Write one bit per non-empty line (1 = odd), most significant bit first,
+    padded with zero bits to a whole byte.
+
+    Returns:
+        tuple: (evens, odds)
+    """
+    counts = [0, 0]
+    with open(output_path, 'wb') as output:
+        if np is None:
+            byte = nbits = 0
+            for _, parity in iter_line_parity(path):
+                byte = (byte << 1) | parity
+                nbits += 1
+                counts[parity] += 1
+                if nbits % 8 == 0:
+                    output.write(bytes((byte,)))
+                    byte = 0
+            if nbits % 8:
+                output.write(bytes((byte << (8 - nbits % 8),)))
+            return counts[0], counts[1]
+
+        # Bits that did not fill a whole byte are carried into the next chunk
+        carry = [np.zeros(0, dtype=np.uint8)]
+
+        def on_chunk(buf, codes, lengths):
+            bits = np.concatenate([carry[0], codes[codes != 2]])
+            odd = int(bits.sum()) - int(carry[0].sum())
+            counts[1] += odd
+            counts[0] += len(bits) - len(carry[0]) - odd
+            full = len(bits) // 8 * 8
+            output.write(np.packbits(bits[:full]).tobytes())
+            carry[0] = bits[full:]
+
+        scan_file(path, on_chunk, chunk_size)
+        if len(carry[0]):
+            output.write(np.packbits(carry[0]).tobytes())
+    return counts[0], counts[1]
+
+
+def split_file(path, even_path, odd_path, chunk_size=CHUNK_SIZE):
+    """
+    Copy every line to an even or an odd output file, in input order.
+
+    Returns:
+        tuple: (evens, odds)
+    """
+    counts = [0, 0]
+    with open(even_path, 'wb') as even_file, open(odd_path, 'wb') as odd_file:
+        outputs = (even_file, odd_file)
+        if np is None:
+            for line, parity in iter_line_parity(path):
+                outputs[parity].write(line + b'\n')
+                counts[parity] += 1
+            return counts[0], counts[1]
+
+        def on_chunk(buf, codes, lengths):
+            # Expand the per-line codes to per-byte codes and select with them
+            byte_codes = np.repeat(codes, lengths)
+            for parity in (0, 1):
+                outputs[parity].write(buf[byte_codes == parity].tobytes())
+                counts[parity] += int(np.count_nonzero(codes == parity))
+            if buf[-1] != NEWLINE and codes[-1] != 2:
+                outputs[codes[-1]].write(b'\n')  # Terminate an unterminated last line
+
+        scan_file(path, on_chunk, chunk_size)
+    return counts[0], counts[1]
+
+
+def load_list_indexing_method():
+    """
+    Load check_even_odd from 11_Odd_Even_Method5.py for the benchmark.
+
+    Returns:
+        callable: The list-indexing parity check
+    """
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "11_Odd_Even_Method5.py")
+    spec = importlib.util.spec_from_file_location("odd_even_method5", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.check_even_odd
+
+
+def run_benchmark(lines, path=None):
+    """
+    Compare the mmap/NumPy scan with the pure Python line loop and with the
+    int() + list indexing approach of 11_Odd_Even_Method5.py.
+
+    Args:
+        lines (int): Number of random int64 values in the test file
+        path (str): Existing file to use instead of a generated one
+    """
+    generated = path is None
+    if generated:
+        import random
+        rng = random.Random(2024)
+        handle, path = tempfile.mkstemp(suffix='.txt')
+        with os.fdopen(handle, 'w') as number_file:
+            for start in range(0, lines, 100000):
+                block = [str(rng.randint(-2**63, 2**63 - 1)) for _ in range(min(100000, lines - start))]
+                number_file.write('\n'.join(block) + '\n')
+
+    check_even_odd = load_list_indexing_method()
+
+    def list_indexing():
+        odd = total = 0
+        with open(path, 'rb') as number_file:
+            for line in number_file:
+                if line.strip():
+                    odd += check_even_odd(int(line)) == "odd"
+                    total += 1
+        return total - odd, odd
+
+    def python_scan():
+        odd = total = 0
+        for _, parity in iter_line_parity(path):
+            odd += parity
+            total += 1
+        return total - odd, odd
+
+    candidates = [("11 int() + list indexing", list_indexing), ("pure Python last digit", python_scan)]
+    if np is not None:
+        candidates.append(("mmap + NumPy & 1", lambda: count_file(path)))
+
+    megabytes = os.path.getsize(path) / 1e6
+    print("=" * 72)
+    print(f"ODD/EVEN STREAM BENCHMARK ({megabytes:.1f} MB)")
+    print("=" * 72)
+    print(f"{'Method':<28} {'Seconds':>10} {'MB/s':>10} {'Mlines/s':>10} {'Speedup':>10}")
+    print("-" * 72)
+    try:
+        baseline = expected = None
+        for name, function in candidates:
+            start = time.perf_counter()
+            counts = function()
+            elapsed = time.perf_counter() - start
+            if expected is None:
+                expected, baseline = counts, elapsed
+            elif counts != expected:
+                raise RuntimeError(f"{name} counted {counts}, expected {expected}")
+            print(f"{name:<28} {elapsed:>10.3f} {megabytes / elapsed:>10.1f} "
+                  f"{sum(counts) / elapsed / 1e6:>10.2f} {baseline / elapsed:>9.1f}x")
+        print("-" * 72)
+        print(f"Even: {expected[0]}, odd: {expected[1]}")
+    finally:
+        if generated:
+            os.remove(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Classify a file of integers as even/odd")
+    commands = parser.add_subparsers(dest='command', required=True)
+    count = commands.add_parser('count', help="print the number of even and odd values")
+    count.add_argument('input')
+    bitmap = commands.add_parser('bitmap', help="write one bit per value (1 = odd)")
+    bitmap.add_argument('input')
+    bitmap.add_argument('output')
+    split = commands.add_parser('split', help="write even and odd values to separate files")
+    split.add_argument('input')
+    split.add_argument('even_output')
+    split.add_argument('odd_output')
+    benchmark = commands.add_parser('benchmark', help="compare against 11_Odd_Even_Method5.py")
+    benchmark.add_argument('--lines', type=int, default=2000000, help="values in the generated file")
+    benchmark.add_argument('--file', help="benchmark an existing file instead")
+    args = parser.parse_args()
+
+    try:
+        if args.command == 'benchmark':
+            run_benchmark(args.lines, args.file)
+            return
+        if args.command == 'count':
+            evens, odds = count_file(args.input)
+        elif args.command == 'bitmap':
+            evens, odds = bitmap_file(args.input, args.output)
+        else:
+            evens, odds = split_file(args.input, args.even_output, args.odd_output)
+    except (OSError, ValueError) as e:
+        print(f"❌ Error: {e}")
+        sys.exit(1)
+    print(f"Even: {evens}")
+    print(f"Odd: {odds}")
+
+
+if __name__ == "__main__":
+    main()
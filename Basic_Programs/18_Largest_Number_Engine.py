@@ -0,0 +1,549 @@
+"""
+Program: Largest Number Engine
+Description: Generalizes find_largest_of_three from 12_Find_Largest_Number.py
+to streams of any length: the largest value with its position, and the top k
+values with their positions.
+
+largest_of_three() reports the largest of three numbers and which one it was,
+letting the earlier number win ties. The same rules apply here to N numbers:
+
+    largest(values)      one pass, O(1) memory
+    top_k(values, k)     one pass, O(k) memory (bounded min-heap)
+
+NaN cannot be ranked against other numbers, so largest() and top_k() skip
+NaN values (a "nan" line in a file); they still count as positions, so the
+positions of the other values do not change.
+
+A position is the 0-based index of a value in the input. Values can come from
+any iterable (lists, generators, NumPy arrays) or from a file with one number
+per line, so hundreds of millions of readings never have to be held in memory.
+
+For large files on multi-core machines, parallel_top_k() splits the file at
+line boundaries, lets worker processes parse their chunk and reduce it with
+NumPy (np.partition instead of a Python-level heap), and merges the per-chunk
+results. Per-chunk positions are shifted by the number of values in earlier
+chunks, so the merged result, ties included, is identical to top_k(). Without
+NumPy the workers fall back to top_k().
+
+Floats lose precision above 2**53 and overflow to inf, so two different
+30-digit ids can compare equal. With exact_key() (--exact on the command
+line) integer and decimal strings are compared as text instead: sign, then
+number of integer digits, then the digits themselves. That is exact, linear
+in the length of the strings, and never builds a float or a big int.
+
+Usage:
+    python 18_Largest_Number_Engine.py readings.txt
+    python 18_Largest_Number_Engine.py readings.txt -k 100
+    python 18_Largest_Number_Engine.py readings.txt -k 100 --workers 0
+    python 18_Largest_Number_Engine.py ids.txt -k 10 --exact
+    generate_readings | python 18_Largest_Number_Engine.py - -k 10
+"""
+
+import argparse
+import heapq
+import importlib.util
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; workers use top_k() instead
+    np = None
+
+CHUNK_SIZE = 64 * 1024 * 1024  # Bytes of the input file per worker task
+
+# Whitespace other than newlines. Without it every line holds at most one
+# token, so bytes.split() cannot accept a line like "1 2" that float() rejects
+INLINE_WHITESPACE = b' \t\r\x0b\x0c'
+
+# Integer or decimal string for exact comparison: sign, integer digits, fraction
+EXACT_NUMBER = re.compile(r'([+-]?)([0-9]*)(?:\.([0-9]*))?')
+EXACT_NUMBER_BYTES = re.compile(EXACT_NUMBER.pattern.encode())
+
+# Maps every digit d to 9 - d, which reverses the order of digit strings
+COMPLEMENT = str.maketrans('0123456789', '9876543210')
+COMPLEMENT_BYTES = bytes.maketrans(b'0123456789', b'9876543210')
+
+
+def load_number_reader():
+    """
+    Import 21_Number_Reader.py for bulk parsing of number files.
+
+    Returns:
+        module: The bulk number reader
+    """
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "21_Number_Reader.py")
+    spec = importlib.util.spec_from_file_location("number_reader", path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+number_reader = load_number_reader()
+
+
+def largest(values, key=None):
+    """
+    Find the largest value of an iterable and its position.
+
+    Ties go to the earliest value, like largest_of_three(). NaN values are
+    skipped.
+
+    Args:
+        values (iterable): Numbers (consumed once)
+        key (callable): Optional sort key, as for max()
+
+    Returns:
+        tuple: (largest value, position), or None if values is empty or all NaN
+    """
+    # Start from the first value that is not NaN. After that NaN never wins
+    # a > comparison, so the main loops need no extra check.
+    iterator = enumerate(values)
+    if key is None:
+        for best_position, best in iterator:
+            if best == best:
+                break
+        else:
+            return None
+        for position, value in iterator:
+            if value > best:
+                best, best_position = value, position
+    else:
+        for best_position, best in iterator:
+            best_key = key(best)
+            if best_key == best_key:
+                break
+        else:
+            return None
+        for position, value in iterator:
+            value_key = key(value)
+            if value_key > best_key:
+                best, best_key, best_position = value, value_key, position
+    return best, best_position
+
+
+def top_k(values, k, key=None):
+    """
+    Find the k largest values of an iterable and their positions.
+
+    A min-heap holds the k best values seen so far; its root is the weakest
+    of them. A new value only enters if it beats the root, so most values
+    of a long stream cost a single comparison. Since later values lose ties,
+    equal values are ranked by position just like largest_of_three(). NaN
+    values are skipped.
+
+    Args:
+        values (iterable): Numbers (consumed once)
+        k (int): Number of values to keep
+        key (callable): Optional sort key, as for max()
+
+    Returns:
+        list: Up to k (value, position) tuples, largest first
+
+    Raises:
+        ValueError: If k is negative
+    """
+    if k < 0:
+        raise ValueError("k must not be negative")
+    if k == 0:
+        return []
+
+    # Heap entries are (key, -position, value): among equal keys the later
+    # position is the smaller entry, i.e. the first one to be pushed out
+    heap = []
+    iterator = enumerate(values)
+    for position, value in iterator:
+        value_key = value if key is None else key(value)
+        if value_key != value_key:
+            continue  # NaN; once the heap is full, NaN never beats the root
+        heap.append((value_key, -position, value))
+        if len(heap) == k:
+            break
+    heapq.heapify(heap)
+
+    if len(heap) == k:
+        heapreplace = heapq.heapreplace
+        threshold = heap[0][0]
+        if key is None:
+            for position, value in iterator:
+                if value > threshold:
+                    heapreplace(heap, (value, -position, value))
+                    threshold = heap[0][0]
+        else:
+            for position, value in iterator:
+                value_key = key(value)
+                if value_key > threshold:
+                    heapreplace(heap, (value_key, -position, value))
+                    threshold = heap[0][0]
+
+    heap.sort(reverse=True)
+    return [(value, -negative_position) for _, negative_position, value in heap]
+
+
+def exact_key(text):
+    """
+    Sort key that orders integer and decimal strings by their exact value.
+
+    Leading zeros of the integer part and trailing zeros of the fraction are
+    dropped, so "007.50" and "7.5" get the same key. Positive numbers compare
+    by (number of integer digits, integer digits, fraction digits). For
+    negative numbers every digit is complemented (d -> 9 - d) and the length
+    negated, which reverses that order; the fraction gets a '~' appended
+    (greater than any digit) so that "-0.5" still ranks above "-0.51".
+
+    Args:
+        text (str or bytes): e.g. "-123456789012345678901234567890.25"
+
+    Returns:
+        tuple: The sort key
+
+    Raises:
+        ValueError: If text is not an integer or decimal number
+    """
+    text = text.strip()
+    if isinstance(text, bytes):
+        match = EXACT_NUMBER_BYTES.fullmatch(text)
+        zero, complement, sentinel = b'0', COMPLEMENT_BYTES, b'~'
+    else:
+        match = EXACT_NUMBER.fullmatch(text)
+        zero, complement, sentinel = '0', COMPLEMENT, '~'
+    if match is None or not (match.group(2) or match.group(3)):
+        raise ValueError(f"Not an integer or decimal number: {text[:50]!r}")
+
+    sign, integer, fraction = match.groups()
+    integer = integer.lstrip(zero)
+    fraction = (fraction or zero[:0]).rstrip(zero)
+    if not integer and not fraction:
+        return (0,)
+    if sign in ('-', b'-'):
+        return (-1, -len(integer), integer.translate(complement), fraction.translate(complement) + sentinel)
+    return (1, len(integer), integer, fraction)
+
+
+def compare_exact(a, b):
+    """
+    Compare two integer or decimal strings exactly.
+
+    Returns:
+        int: -1 if a < b, 0 if they are equal, 1 if a > b
+    """
+    key_a, key_b = exact_key(a), exact_key(b)
+    return (key_a > key_b) - (key_a < key_b)
+
+
+def read_exact_numbers(stream):
+    """
+    Read one integer or decimal string per line, without converting it.
+
+    Blank lines are skipped and do not count as positions.
+
+    Args:
+        stream (file): Readable file object
+
+    Yields:
+        str or bytes: The stripped numbers in file order
+
+    Raises:
+        ValueError: If a line is not a number (the message has its line number)
+    """
+    for line_number, line in enumerate(stream, 1):
+        text = line.strip()
+        if text:
+            bad = find_bad_exact_line([text])
+            if bad is not None:
+                raise ValueError(f"Line {line_number}: not a number: {bad[1][:50]!r}")
+            yield text
+
+
+def read_numbers(stream):
+    """
+    Read one number per line from a text or binary stream.
+
+    Blank lines are skipped and do not count as positions. The stream is
+    parsed in blocks by the bulk number reader, so there is no per-line
+    float() call or exception handler.
+
+    Args:
+        stream (file): Readable file object
+
+    Yields:
+        float: The numbers in file order
+
+    Raises:
+        ValueError: If a line is not a number (the message has its line number)
+    """
+    for block in number_reader.read_number_blocks(stream, columns=1):
+        yield from block
+
+
+def find_bad_line(lines):
+    """
+    Find the first line that read_numbers() would reject.
+
+    Args:
+        lines (list): Lines as bytes, without newlines
+
+    Returns:
+        tuple: (1-based line number, stripped text), or None if all are valid
+    """
+    for line_number, line in enumerate(lines, 1):
+        try:
+            float(line)
+        except ValueError:
+            text = line.strip()
+            if text:
+                return line_number, text.decode('utf-8', 'replace')
+    return None
+
+
+def find_bad_exact_line(lines):
+    """
+    Find the first non-blank line that exact_key() would reject.
+
+    Args:
+        lines (list): Lines as str or bytes
+
+    Returns:
+        tuple: (1-based line number, stripped text as str), or None
+    """
+    for line_number, line in enumerate(lines, 1):
+        text = line.strip()
+        if text:
+            pattern = EXACT_NUMBER_BYTES if isinstance(text, bytes) else EXACT_NUMBER
+            match = pattern.fullmatch(text)
+            if match is None or not (match.group(2) or match.group(3)):
+                if isinstance(text, bytes):
+                    text = text.decode('utf-8', 'replace')
+                return line_number, text
+    return None
+
+
+def array_top_k(values, k):
+    """
+    Vectorized top_k() for a NumPy float array.
+
+    np.partition finds the k-th largest value (the threshold) in O(n). Every
+    value above it is taken, and the remaining places go to the earliest
+    values equal to it, which keeps the tie-break of top_k(). NaN values are
+    dropped first, as top_k() skips them, and positions still refer to the
+    original array.
+
+    Args:
+        values (ndarray): The numbers
+        k (int): Number of values to keep
+
+    Returns:
+        list: Up to k (value, position) tuples, largest first
+    """
+    if k == 0:
+        return []
+    valid = ~np.isnan(values)
+    if not valid.all():
+        # A NaN threshold would select nothing; rank the other values and
+        # map their positions back
+        original = np.flatnonzero(valid)
+        return [(value, int(original[position])) for value, position in array_top_k(values[valid], k)]
+
+    size = len(values)
+    if k >= size:
+        positions = np.arange(size)
+    else:
+        threshold = np.partition(values, size - k)[size - k]
+        above = np.flatnonzero(values > threshold)
+        ties = np.flatnonzero(values == threshold)[:k - len(above)]
+        positions = np.concatenate((above, ties))
+    positions = positions[np.lexsort((positions, -values[positions]))]
+    return list(zip(values[positions].tolist(), positions.tolist()))
+
+
+def chunk_ranges(path, chunk_size=CHUNK_SIZE):
+    """
+    Split a file into byte ranges that end right after a newline.
+
+    Args:
+        path (str): The file
+        chunk_size (int): Target chunk size in bytes
+
+    Returns:
+        list: (start, end) byte offsets
+    """
+    size = os.path.getsize(path)
+    ranges = []
+    start = 0
+    with open(path, 'rb') as number_file:
+        while start < size:
+            end = start + chunk_size
+            if end >= size:
+                end = size
+            else:
+                number_file.seek(end - 1)
+                number_file.readline()  # Move to the end of the current line
+                end = number_file.tell()
+            ranges.append((start, end))
+            start = end
+    return ranges
+
+
+def scan_chunk(task):
+    """
+    Worker: top k of one chunk of a file.
+
+    Args:
+        task (tuple): (path, start, end, k, exact)
+
+    Returns:
+        tuple: (number of values, number of lines, top k with chunk-local
+        positions, None) or (0, lines, [], (local line number, text)) for
+        the first invalid line
+    """
+    path, start, end, k, exact = task
+    with open(path, 'rb') as number_file:
+        number_file.seek(start)
+        chunk = number_file.read(end - start)
+    lines = chunk.count(b'\n') + (chunk[-1:] != b'\n')
+
+    if exact:
+        chunk_lines = chunk.split(b'\n')
+        bad = find_bad_exact_line(chunk_lines)
+        if bad is not None:
+            return 0, lines, [], bad
+        values = [text for text in map(bytes.strip, chunk_lines) if text]
+        return len(values), lines, top_k(values, k, key=exact_key), None
+
+    tokens = chunk.split()
+    try:
+        values = np.array(tokens, dtype=np.float64) if np is not None else list(map(float, tokens))
+    except ValueError:
+        values = None
+    if values is None or len(chunk.translate(None, INLINE_WHITESPACE)) != len(chunk):
+        bad = find_bad_line(chunk.split(b'\n'))
+        if bad is not None:
+            return 0, lines, [], bad
+
+    if np is not None:
+        return len(values), lines, array_top_k(values, k), None
+    return len(values), lines, top_k(values, k), None
+
+
+def merge_top_k(partials, k, key=None):
+    """
+    Merge per-chunk top-k results into the top k of the whole input.
+
+    Args:
+        partials (iterable): (results, position offset) per chunk, in order
+        k (int): Number of values to keep
+        key (callable): Optional sort key used for the chunks
+
+    Returns:
+        list: Up to k (value, position) tuples, largest first
+    """
+    candidates = []
+    for results, offset in partials:
+        candidates.extend((value, position + offset) for value, position in results)
+    # Candidates are in position order; the stable sort keeps it among ties
+    if key is None:
+        candidates.sort(key=lambda candidate: candidate[0], reverse=True)
+    else:
+        candidates.sort(key=lambda candidate: key(candidate[0]), reverse=True)
+    return candidates[:k]
+
+
+def parallel_top_k(path, k, workers=None, chunk_size=CHUNK_SIZE, exact=False):
+    """
+    top_k() of a file with one number per line, using several processes.
+
+    Args:
+        path (str): The file
+        k (int): Number of values to keep
+        workers (int): Worker processes (None = one per CPU, 1 = in-process)
+        chunk_size (int): Bytes per task
+        exact (bool): Compare the numbers as text with exact_key()
+
+    Returns:
+        list: Up to k (value, position) tuples, largest first, with the same
+        positions top_k(read_numbers(file), k) reports (values are bytes
+        in exact mode)
+
+    Raises:
+        ValueError: If k is negative or a line is not a number
+    """
+    if k < 0:
+        raise ValueError("k must not be negative")
+    if k == 0:
+        return []
+    tasks = [(path, start, end, k, exact) for start, end in chunk_ranges(path, chunk_size)]
+
+    if workers == 1 or len(tasks) <= 1:
+        chunk_results = list(map(scan_chunk, tasks))
+    else:
+        with ProcessPoolExecutor(workers) as pool:
+            chunk_results = list(pool.map(scan_chunk, tasks))
+
+    partials = []
+    offset = line_offset = 0
+    for count, lines, results, bad in chunk_results:
+        if bad is not None:
+            line_number, text = bad
+            raise ValueError(f"Line {line_offset + line_number}: not a number: {text[:50]!r}")
+        partials.append((results, offset))
+        offset += count
+        line_offset += lines
+    return merge_top_k(partials, k, exact_key if exact else None)
+
+
+def format_number(value):
+    """Show whole floats without a trailing .0, as the calculator does, and
+    shorten very long exact numbers."""
+    if isinstance(value, bytes):
+        value = value.decode('ascii')
+        if len(value) > 40:
+            return f"{value[:18]}...{value[-19:]}"
+        return value
+    if isinstance(value, float) and value.is_integer() and abs(value) < 1e16:
+        return str(int(value))
+    return str(value)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Find the largest numbers in a file or stream")
+    parser.add_argument('input', help="file with one number per line ('-' for stdin)")
+    parser.add_argument('-k', type=int, default=1, help="how many of the largest values to report (default: 1)")
+    parser.add_argument('--workers', type=int,
+                        help="scan the file in parallel with N processes (0 = one per CPU)")
+    parser.add_argument('--exact', action='store_true',
+                        help="compare integer/decimal strings exactly instead of as floats")
+    args = parser.parse_args()
+
+    reader, key = (read_exact_numbers, exact_key) if args.exact else (read_numbers, None)
+    try:
+        if args.workers is not None:
+            if args.input == '-':
+                raise ValueError("--workers needs a file, not stdin")
+            results = parallel_top_k(args.input, args.k, args.workers or None, exact=args.exact)
+        elif args.input == '-':
+            results = top_k(reader(sys.stdin.buffer), args.k, key)
+        else:
+            with open(args.input, 'rb') as number_file:
+                results = top_k(reader(number_file), args.k, key)
+    except (OSError, ValueError) as e:
+        print(f"❌ Error: {e}")
+        sys.exit(1)
+
+    if not results:
+        print("No numbers found.")
+        return
+
+    print("=" * 60)
+    print("RESULT:" if args.k == 1 else f"TOP {len(results)}:")
+    print(f"{'Rank':<6} {'Value':>40} {'Position':>12}")
+    print("-" * 60)
+    for rank, (value, position) in enumerate(results, 1):
+        print(f"{rank:<6} {format_number(value):>40} {position:>12}")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,438 @@
+"""
+Program: Order Statistics
+Description: Minimum, median and percentiles of number streams without
+sorting them, as a companion to the largest-number finders (12 and 18).
+
+Two ways to get a percentile:
+
+    exact    quickselect()/percentile() find the k-th smallest value of an
+             in-memory list in average O(n) time (np.partition for NumPy
+             arrays), instead of the O(n log n) of sorting.
+
+    sketch   QuantileSketch keeps logarithmically sized buckets of counts
+             (the DDSketch idea). Memory depends only on the range of the
+             values, not on how many there are, and two sketches merge by
+             adding their counts, so chunks of a file can be sketched in
+             parallel processes and combined.
+
+Percentiles use the "lower" definition: the p-th percentile of n values is
+the value of rank int(p / 100 * (n - 1)) in sorted order (0-based).
+
+Error bound of the sketch: with relative_accuracy a, every quantile it
+returns is within a * |x| of the exact value x of the same rank, for every
+quantile and every input, including after any number of merges. Buckets
+have boundaries at powers of gamma = (1 + a) / (1 - a), so at most
+ln(max / min) / ln(gamma) + 1 buckets are used per sign; for a = 0.01 and
+values between 1e-9 and 1e9 that is about 2,100 buckets.
+
+Usage:
+    python 19_Order_Statistics.py readings.txt
+    python 19_Order_Statistics.py readings.txt --percentiles 50,95,99,99.9
+    python 19_Order_Statistics.py readings.txt --sketch --accuracy 0.001
+    python 19_Order_Statistics.py readings.txt --sketch --workers 0
+"""
+
+import argparse
+import importlib.util
+import math
+import os
+import random
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; pure Python paths are used instead
+    np = None
+
+SKETCH_BLOCK = 1 << 20  # Values converted to NumPy at a time by update()
+
+
+def load_largest_engine():
+    """
+    Import 18_Largest_Number_Engine.py for its file reader and chunking.
+
+    Returns:
+        module: The largest-number engine
+    """
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "18_Largest_Number_Engine.py")
+    spec = importlib.util.spec_from_file_location("largest_number_engine", path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+largest_engine = load_largest_engine()
+
+
+def is_numpy_array(values):
+    """Return True for NumPy arrays (without importing NumPy)."""
+    return type(values).__module__ == 'numpy' and hasattr(values, 'dtype')
+
+
+def quickselect(values, k):
+    """
+    Return the k-th smallest value (0-based) in average O(n) time.
+
+    Each round picks a random pivot and keeps only the part of the values
+    that contains rank k, so the work shrinks geometrically. Equal values
+    are grouped with the pivot, which keeps inputs with many duplicates
+    linear as well. The input is not modified.
+
+    NaN has no rank (every comparison with it is false), so values holding
+    NaN are rejected, as QuantileSketch does.
+
+    Args:
+        values (sequence): Numbers (a list, array or NumPy array)
+        k (int): Rank, 0 <= k < len(values)
+
+    Returns:
+        The k-th smallest value
+
+    Raises:
+        IndexError: If k is out of range
+        ValueError: If a value is NaN
+    """
+    if not 0 <= k < len(values):
+        raise IndexError(f"Rank {k} is out of range for {len(values)} values")
+    if is_numpy_array(values):
+        # max() propagates NaN, so one pass finds any
+        if values.dtype.kind == 'f' and np.isnan(values.max()):
+            raise ValueError("Cannot select from values containing NaN")
+        return np.partition(values, k)[k].item()
+    if any(value != value for value in values):
+        raise ValueError("Cannot select from values containing NaN")
+
+    candidates = values
+    while True:
+        pivot = candidates[random.randrange(len(candidates))]
+        smaller = [value for value in candidates if value < pivot]
+        if k < len(smaller):
+            candidates = smaller
+            continue
+        equal = sum(1 for value in candidates if value == pivot)
+        if k < len(smaller) + equal:
+            return pivot
+        k -= len(smaller) + equal
+        candidates = [value for value in candidates if value > pivot]
+
+
+def percentile_rank(p, count):
+    """
+    Rank (0-based) of the p-th percentile among count values.
+
+    Raises:
+        ValueError: If p is outside 0-100 or there are no values
+    """
+    if not 0 <= p <= 100:
+        raise ValueError(f"Percentile must be between 0 and 100, got {p}")
+    if count == 0:
+        raise ValueError("No values")
+    return int(p / 100 * (count - 1))
+
+
+def percentile(values, p):
+    """
+    Exact p-th percentile (0-100) of in-memory values.
+
+    Args:
+        values (sequence): Numbers
+        p (float): Percentile, e.g. 99 for p99
+
+    Returns:
+        The value of rank int(p / 100 * (n - 1))
+    """
+    return quickselect(values, percentile_rank(p, len(values)))
+
+
+def median(values):
+    """
+    Exact median: the middle value, or the mean of the two middle values.
+
+    Raises:
+        ValueError: If there are no values
+    """
+    count = len(values)
+    if count == 0:
+        raise ValueError("No values")
+    upper = quickselect(values, count // 2)
+    if count % 2:
+        return upper
+    return (quickselect(values, count // 2 - 1) + upper) / 2
+
+
+class QuantileSketch:
+    """
+    Mergeable quantile sketch with a relative error guarantee.
+
+    A positive value v goes into bucket ceil(log_gamma(v)), which covers
+    (gamma^(i-1), gamma^i]. Reporting 2 * gamma^i / (gamma + 1) for that
+    bucket is off by at most relative_accuracy for every value in it.
+    Negative values use a second set of buckets on their magnitude; zeros
+    are counted separately. Minimum and maximum are kept exactly.
+    """
+
+    def __init__(self, relative_accuracy=0.01):
+        """
+        Args:
+            relative_accuracy (float): Allowed relative error, 0 < a < 1
+
+        Raises:
+            ValueError: If relative_accuracy is out of range
+        """
+        if not 0 < relative_accuracy < 1:
+            raise ValueError("relative_accuracy must be between 0 and 1")
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self.log_gamma = math.log(self.gamma)
+        self.positive = {}  # Bucket index -> count
+        self.negative = {}  # Same, for the magnitudes of negative values
+        self.zero_count = 0
+        self.count = 0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def __len__(self):
+        return self.count
+
+    def add(self, value):
+        """
+        Add one value.
+
+        Raises:
+            ValueError: If value is NaN or infinite
+        """
+        if not math.isfinite(value):
+            raise ValueError(f"Cannot add {value} to a quantile sketch")
+        if value > 0:
+            index = math.ceil(math.log(value) / self.log_gamma)
+            self.positive[index] = self.positive.get(index, 0) + 1
+        elif value < 0:
+            index = math.ceil(math.log(-value) / self.log_gamma)
+            self.negative[index] = self.negative.get(index, 0) + 1
+        else:
+            self.zero_count += 1
+        self.count += 1
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def update(self, values):
+        """
+        Add many values. With NumPy, blocks of values are bucketed with one
+        vectorized log and np.unique per block.
+
+        Args:
+            values (iterable): Numbers (consumed once)
+
+        Raises:
+            ValueError: If a value is NaN or infinite
+        """
+        if np is None:
+            for value in values:
+                self.add(value)
+            return
+
+        if is_numpy_array(values):
+            self.add_block(np.asarray(values, dtype=np.float64).ravel())
+            return
+        iterator = iter(values)
+        while True:
+            block = np.fromiter(islice(iterator, SKETCH_BLOCK), dtype=np.float64)
+            if not len(block):
+                return
+            self.add_block(block)
+
+    def add_block(self, block):
+        """
+        Add a NumPy float array with vectorized bucketing.
+
+        Raises:
+            ValueError: If a value is NaN or infinite
+        """
+        if len(block):
+            if not np.isfinite(block).all():
+                raise ValueError("Cannot add NaN or infinity to a quantile sketch")
+            for store, magnitudes in ((self.positive, block[block > 0]), (self.negative, -block[block < 0])):
+                if len(magnitudes):
+                    indexes, counts = np.unique(np.ceil(np.log(magnitudes) / self.log_gamma), return_counts=True)
+                    for index, count in zip(indexes.astype(np.int64).tolist(), counts.tolist()):
+                        store[index] = store.get(index, 0) + count
+            self.zero_count += int(np.count_nonzero(block == 0))
+            self.count += len(block)
+            self.min = min(self.min, block.min().item())
+            self.max = max(self.max, block.max().item())
+
+    def merge(self, other):
+        """
+        Add the counts of another sketch to this one.
+
+        Raises:
+            ValueError: If the sketches use different accuracies
+        """
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Only sketches with the same relative_accuracy can be merged")
+        for store, other_store in ((self.positive, other.positive), (self.negative, other.negative)):
+            for index, count in other_store.items():
+                store[index] = store.get(index, 0) + count
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
+
+    def bucket_value(self, index):
+        """Representative magnitude of a bucket (within the relative accuracy)."""
+        return 2 * self.gamma ** index / (self.gamma + 1)
+
+    def quantile(self, q):
+        """
+        Approximate q-quantile (0-1) with relative error at most
+        relative_accuracy against the exact value of rank int(q * (n - 1)).
+
+        Raises:
+            ValueError: If q is outside 0-1 or the sketch is empty
+        """
+        rank = percentile_rank(q * 100, self.count)
+        if rank == 0:
+            return self.min
+        if rank == self.count - 1:
+            return self.max
+
+        seen = 0
+        # Most negative values first: negative buckets by descending magnitude
+        for index in sorted(self.negative, reverse=True):
+            seen += self.negative[index]
+            if seen > rank:
+                return max(-self.bucket_value(index), self.min)
+        seen += self.zero_count
+        if seen > rank:
+            return 0.0
+        for index in sorted(self.positive):
+            seen += self.positive[index]
+            if seen > rank:
+                return min(self.bucket_value(index), self.max)
+        return self.max
+
+    def percentile(self, p):
+        """Approximate p-th percentile (0-100); see quantile()."""
+        return self.quantile(p / 100)
+
+
+def sketch_chunk(task):
+    """
+    Worker: sketch one chunk of a file with one number per line.
+
+    Args:
+        task (tuple): (path, start, end, relative_accuracy)
+
+    Returns:
+        tuple: (the chunk's sketch, number of lines, problems as (chunk-local
+        line number, token, reason)); the caller turns the line numbers
+        into file line numbers, as parallel_top_k() does
+    """
+    path, start, end, relative_accuracy = task
+    with open(path, 'rb') as number_file:
+        number_file.seek(start)
+        chunk = number_file.read(end - start)
+    lines = chunk.count(b'\n') + (chunk[-1:] != b'\n')
+    reader = largest_engine.number_reader
+    sketch = QuantileSketch(relative_accuracy)
+    problems = []
+    values = reader.parse_numbers(chunk, columns=1, bad=problems)
+    sketch.update(reader.to_numpy(values) if np is not None else values)
+    return sketch, lines, problems
+
+
+def sketch_file(path, relative_accuracy=0.01, workers=None, chunk_size=largest_engine.CHUNK_SIZE):
+    """
+    Sketch a file in parallel chunks and merge the chunk sketches.
+
+    Args:
+        path (str): File with one number per line
+        relative_accuracy (float): Sketch accuracy
+        workers (int): Worker processes (None = one per CPU, 1 = in-process)
+        chunk_size (int): Bytes per task
+
+    Returns:
+        QuantileSketch: The sketch of the whole file
+
+    Raises:
+        ValueError: If a line is not a number (the message has its line
+            number in the file and the number of further problems)
+    """
+    tasks = [(path, start, end, relative_accuracy)
+             for start, end in largest_engine.chunk_ranges(path, chunk_size)]
+    if workers == 1 or len(tasks) <= 1:
+        chunk_results = list(map(sketch_chunk, tasks))
+    else:
+        with ProcessPoolExecutor(workers) as pool:
+            chunk_results = list(pool.map(sketch_chunk, tasks))
+
+    total = QuantileSketch(relative_accuracy)
+    problems = []
+    line_offset = 0
+    for sketch, lines, chunk_problems in chunk_results:
+        problems.extend((line_offset + line_number, token, reason)
+                        for line_number, token, reason in chunk_problems)
+        total.merge(sketch)
+        line_offset += lines
+    if problems:
+        more = f" (and {len(problems) - 1} more)" if len(problems) > 1 else ""
+        raise ValueError(largest_engine.number_reader.format_problem(problems[0]) + more)
+    return total
+
+
+def load_values(path):
+    """
+    Read a whole file of numbers into memory for the exact statistics.
+
+    Returns:
+        ndarray or array: The values (a NumPy array if NumPy is available)
+    """
+    return largest_engine.number_reader.load_numbers(path, columns=1, numpy=np is not None)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Minimum, median and percentiles of a file of numbers")
+    parser.add_argument('input', help="file with one number per line")
+    parser.add_argument('--percentiles', default='50,95,99', help="comma-separated percentiles (default: 50,95,99)")
+    parser.add_argument('--sketch', action='store_true', help="use a bounded-memory sketch instead of exact selection")
+    parser.add_argument('--accuracy', type=float, default=0.01, help="relative accuracy of the sketch (default: 0.01)")
+    parser.add_argument('--workers', type=int, default=1, help="processes for --sketch (0 = one per CPU)")
+    args = parser.parse_args()
+
+    try:
+        percentiles = [float(p) for p in args.percentiles.split(',')]
+        if args.sketch:
+            sketch = sketch_file(args.input, args.accuracy, args.workers or None)
+            if not sketch.count:
+                raise ValueError("No numbers found")
+            rows = [('count', sketch.count), ('min', sketch.min)]
+            rows += [(f"p{p:g}", sketch.percentile(p)) for p in percentiles]
+            rows.append(('max', sketch.max))
+        else:
+            values = load_values(args.input)
+            if not len(values):
+                raise ValueError("No numbers found")
+            rows = [('count', len(values)), ('min', percentile(values, 0)), ('median', median(values))]
+            rows += [(f"p{p:g}", percentile(values, p)) for p in percentiles]
+            rows.append(('max', percentile(values, 100)))
+    except (OSError, ValueError) as e:
+        print(f"❌ Error: {e}")
+        sys.exit(1)
+
+    print("=" * 40)
+    title = f"SKETCH (±{args.accuracy:.2%})" if args.sketch else "EXACT"
+    print(f"ORDER STATISTICS - {title}")
+    print("-" * 40)
+    for name, value in rows:
+        print(f"{name:<10} {largest_engine.format_number(value):>29}")
+    print("=" * 40)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,534 @@
+"""
+Program: Swap Engine
+Description: The production version of the swap demonstrations in
+02-06_Swap_Numbers*.py: swapping whole regions of large buffers in place,
+and applying a batch of (i, j) index swaps to a large array at once.
+
+    swap_regions(buffer, a, b, length)   swap two equally sized, non-overlapping
+                                          regions of one buffer
+    swap_buffers(first, second)          swap the contents of two buffers
+    apply_swaps(data, first, second)     perform data[i], data[j] = data[j], data[i]
+                                          for every pair, in order
+    shuffle(data)                        in-place Fisher-Yates shuffle
+
+Buffers are anything with a writable, contiguous buffer: bytearray,
+array.array, NumPy arrays and mmap objects. Regions are swapped through
+memoryviews in blocks of BLOCK_SIZE bytes, so the only extra memory is one
+block-sized scratch buffer, however large the regions are.
+
+apply_swaps() gives exactly the result of the sequential tuple-unpacking loop
+(04_Swap_Numbers_Method3.py), but with NumPy it applies every run of pairs
+that do not share an index in one fancy-indexing assignment.
+
+swap_arrays() swaps two fixed-width integer arrays element-wise with one of
+the strategies of 02-05, vectorized over blocks of BLOCK_ELEMENTS:
+
+    temp        scratch = a; a = b; b = scratch     (02, any dtype)
+    xor         a ^= b; b ^= a; a ^= b              (integers only)
+    arithmetic  a += b; b = a - b; a -= b           (03, integers only)
+
+With Python ints the arithmetic swap cannot overflow; with int8-int64 it
+can. Each block is checked before it is swapped, and a block whose sums
+would overflow falls back to xor. Arrays that share memory fall back to
+temp, because xor and arithmetic zero out aliased elements. The 'auto'
+default per dtype comes from the 'kernels' benchmark (DEFAULT_STRATEGIES).
+
+Usage:
+    python 20_Swap_Engine.py demo
+    python 20_Swap_Engine.py benchmark --size 10000000 --pairs 10000000
+    python 20_Swap_Engine.py kernels --size 10000000
+"""
+
+import argparse
+import importlib.util
+import os
+import random
+import sys
+import time
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; apply_swaps() falls back to a loop
+    np = None
+
+BLOCK_SIZE = 1024 * 1024  # Bytes copied through the scratch buffer at a time
+MIN_WINDOW = 1024  # Pairs examined at a time by apply_swaps()
+MAX_WINDOW = 1 << 20
+SHUFFLE_BLOCK = 1 << 20  # Fisher-Yates pairs generated at a time
+BLOCK_ELEMENTS = 1 << 16  # Elements per block in swap_arrays()
+
+STRATEGIES = ('temp', 'xor', 'arithmetic')
+
+# Fastest strategy per dtype, from `python 20_Swap_Engine.py kernels`
+# (10^7 elements, full-range and small values). temp is three memcpy-like
+# passes, while xor and arithmetic also read both operands in every pass
+# and arithmetic adds an overflow check, so temp won for every width.
+DEFAULT_STRATEGIES = {
+    'int8': 'temp', 'int16': 'temp', 'int32': 'temp', 'int64': 'temp',
+    'uint8': 'temp', 'uint16': 'temp', 'uint32': 'temp', 'uint64': 'temp',
+}
+
+
+def swap_blocks(first, second, block_size=BLOCK_SIZE):
+    """
+    Swap the contents of two equally long byte memoryviews in place.
+
+    Args:
+        first (memoryview): Writable byte view
+        second (memoryview): Writable byte view of the same length
+        block_size (int): Scratch buffer size in bytes
+    """
+    size = len(first)
+    scratch = bytearray(min(block_size, size))
+    with memoryview(scratch) as temp:
+        for start in range(0, size, block_size):
+            end = min(start + block_size, size)
+            count = end - start
+            temp[:count] = first[start:end]
+            first[start:end] = second[start:end]
+            second[start:end] = temp[:count]
+
+
+def writable_bytes(view):
+    """
+    Check that a memoryview can be swapped in place and return its byte view.
+
+    Raises:
+        TypeError: If the buffer is read-only
+        ValueError: If the buffer is not contiguous
+    """
+    if view.readonly:
+        raise TypeError("Cannot swap in a read-only buffer")
+    if not view.c_contiguous:
+        raise ValueError("Only contiguous buffers can be swapped in place")
+    return view.cast('B')
+
+
+def swap_regions(buffer, start_a, start_b, length, block_size=BLOCK_SIZE):
+    """
+    Swap buffer[start_a:start_a + length] with buffer[start_b:start_b + length].
+
+    Positions and length count elements of the buffer (bytes for a bytearray,
+    items for an array or NumPy array).
+
+    Args:
+        buffer: Writable contiguous buffer (bytearray, array, ndarray, mmap)
+        start_a (int): Start of the first region
+        start_b (int): Start of the second region
+        length (int): Number of elements in each region
+        block_size (int): Scratch buffer size in bytes
+
+    Raises:
+        IndexError: If a region is outside the buffer
+        ValueError: If the regions overlap
+    """
+    with memoryview(buffer) as view, writable_bytes(view) as raw:
+        itemsize = view.itemsize
+        a, b, size = start_a * itemsize, start_b * itemsize, length * itemsize
+        if min(a, b, size) < 0 or max(a, b) + size > len(raw):
+            raise IndexError("Swap region is outside the buffer")
+        if a == b or size == 0:
+            return
+        if a < b + size and b < a + size:
+            raise ValueError("Swap regions must not overlap")
+        with raw[a:a + size] as first, raw[b:b + size] as second:
+            swap_blocks(first, second, block_size)
+
+
+def swap_buffers(buffer_a, buffer_b, block_size=BLOCK_SIZE):
+    """
+    Swap the whole contents of two equally sized buffers in place.
+
+    Raises:
+        ValueError: If the buffers differ in size
+    """
+    with memoryview(buffer_a) as view_a, memoryview(buffer_b) as view_b, \
+            writable_bytes(view_a) as raw_a, writable_bytes(view_b) as raw_b:
+        if len(raw_a) != len(raw_b):
+            raise ValueError(f"Buffers differ in size ({len(raw_a)} and {len(raw_b)} bytes)")
+        swap_blocks(raw_a, raw_b, block_size)
+
+
+def as_array(data):
+    """
+    View data as a NumPy array without copying (None if NumPy is missing or
+    the data has no buffer, e.g. a list).
+    """
+    if np is None:
+        return None
+    if isinstance(data, np.ndarray):
+        return data
+    try:
+        with memoryview(data) as view:
+            if view.readonly or view.ndim != 1:
+                return None
+    except TypeError:
+        return None
+    return np.asarray(memoryview(data))
+
+
+def independent_prefix(first, second):
+    """
+    Count the leading pairs that do not share an index with an earlier pair.
+
+    The pairs are interleaved (i0, j0, i1, j1, ...); np.unique reports where
+    each index occurs first, and the earliest repeated occurrence ends the
+    independent run. A pair (i, i) counts as a repeat of itself.
+
+    Returns:
+        int: Number of leading pairs that can be swapped simultaneously
+    """
+    both = np.empty(2 * len(first), dtype=np.intp)
+    both[0::2] = first
+    both[1::2] = second
+    _, first_seen = np.unique(both, return_index=True)
+    if len(first_seen) == len(both):
+        return len(first)
+    repeated = np.ones(len(both), dtype=bool)
+    repeated[first_seen] = False
+    return int(np.argmax(repeated)) // 2
+
+
+def apply_swaps(data, first, second):
+    """
+    Swap data[first[n]] with data[second[n]] for n = 0, 1, 2 ... in order.
+
+    Pairs that touch disjoint positions commute, so every run of such pairs
+    is applied with one vectorized assignment. Runs are found a window at a
+    time; the window grows while runs are long and shrinks after a conflict.
+
+    Args:
+        data: list, array, bytearray, mmap or NumPy array (modified in place)
+        first (sequence): First index of every pair
+        second (sequence): Second index of every pair
+
+    Raises:
+        ValueError: If first and second differ in length
+        IndexError: If an index is out of range
+    """
+    if len(first) != len(second):
+        raise ValueError("first and second must have the same length")
+    array_view = as_array(data)
+    if array_view is None:
+        for i, j in zip(first, second):
+            data[i], data[j] = data[j], data[i]
+        return
+
+    if not len(first):
+        return
+    size = len(array_view)
+    first = np.asarray(first, dtype=np.intp)
+    second = np.asarray(second, dtype=np.intp)
+    if min(first.min(), second.min()) < -size or max(first.max(), second.max()) >= size:
+        raise IndexError("Swap index out of range")
+    # Negative indexes would hide that -1 and size - 1 are the same position
+    first, second = first % size, second % size
+
+    start, window = 0, MIN_WINDOW
+    while start < len(first):
+        i = first[start:start + window]
+        j = second[start:start + window]
+        count = independent_prefix(i, j)
+        if count == len(i):
+            window = min(window * 2, MAX_WINDOW)
+        else:
+            window = max(MIN_WINDOW, 2 * count)
+        if count == 0:  # The next pair is (i, i), which changes nothing
+            count = 1
+        else:
+            i, j = i[:count], j[:count]
+            # The right-hand side is gathered before anything is written
+            array_view[np.concatenate((i, j))] = array_view[np.concatenate((j, i))]
+        start += count
+
+
+def shuffle(data, seed=None):
+    """
+    Shuffle data in place with the Fisher-Yates algorithm.
+
+    The swap pairs (i, j) with j drawn from 0..i are generated in blocks and
+    applied with apply_swaps(), so every permutation is equally likely.
+
+    Args:
+        data: Mutable sequence or buffer (see apply_swaps)
+        seed (int): Optional seed for a reproducible shuffle
+    """
+    size = len(data)
+    if np is None:
+        rng = random.Random(seed)
+        for i in range(size - 1, 0, -1):
+            j = rng.randint(0, i)
+            data[i], data[j] = data[j], data[i]
+        return
+
+    rng = np.random.default_rng(seed)
+    for top in range(size - 1, 0, -SHUFFLE_BLOCK):
+        first = np.arange(top, max(top - SHUFFLE_BLOCK, 0), -1, dtype=np.intp)
+        # Exact integer draws: scaling a float by i + 1 is slightly biased
+        # towards some indexes once i + 1 is large
+        second = rng.integers(0, first + 1, dtype=np.intp)
+        apply_swaps(data, first, second)
+
+
+def sum_overflows(a, b, total):
+    """
+    Check whether a + b wrapped around for any element.
+
+    Signed: the sum overflowed where it has a different sign than both
+    operands. Unsigned: where it is smaller than an operand.
+
+    Args:
+        a (ndarray): First operands
+        b (ndarray): Second operands
+        total (ndarray): a + b computed with wraparound
+
+    Returns:
+        bool: True if any element overflowed
+    """
+    if a.dtype.kind == 'u':
+        return bool((total < a).any())
+    return bool((((a ^ total) & (b ^ total)) < 0).any())
+
+
+def swap_block(a, b, strategy, scratch):
+    """
+    Swap two equally long blocks in place with one strategy.
+
+    Args:
+        a (ndarray): First block
+        b (ndarray): Second block
+        strategy (str): 'temp', 'xor' or 'arithmetic'
+        scratch (ndarray): Buffer at least as long as the blocks
+
+    Returns:
+        str: The strategy actually used (xor if the sums would overflow)
+    """
+    if strategy == 'arithmetic':
+        total = scratch[:len(a)]
+        np.add(a, b, out=total)
+        if sum_overflows(a, b, total):
+            strategy = 'xor'
+        else:
+            np.subtract(total, b, out=b)   # b = (a + b) - b = a
+            np.subtract(total, b, out=a)   # a = (a + b) - a = b
+            return strategy
+    if strategy == 'xor':
+        np.bitwise_xor(a, b, out=a)
+        np.bitwise_xor(b, a, out=b)
+        np.bitwise_xor(a, b, out=a)
+        return strategy
+    temp = scratch[:len(a)]
+    np.copyto(temp, a)
+    np.copyto(a, b)
+    np.copyto(b, temp)
+    return 'temp'
+
+
+def swap_arrays(a, b, strategy='auto', block_size=BLOCK_ELEMENTS):
+    """
+    Swap the contents of two equally long arrays in place, element-wise.
+
+    Args:
+        a: NumPy array or array.array
+        b: Array of the same length and dtype
+        strategy (str): 'auto', 'temp', 'xor' or 'arithmetic'
+        block_size (int): Elements processed per step
+
+    Returns:
+        dict: Number of blocks swapped with each strategy
+
+    Raises:
+        ValueError: If the arrays differ in length or dtype, or the strategy
+        is unknown
+    """
+    if strategy != 'auto' and strategy not in STRATEGIES:
+        raise ValueError(f"Unknown swap strategy '{strategy}' (choose from auto, {', '.join(STRATEGIES)})")
+    array_a, array_b = as_array(a), as_array(b)
+    if array_a is None or array_b is None:  # No NumPy: copy bytes through a block
+        swap_buffers(a, b)
+        return {'temp': 1}
+    if array_a.shape != array_b.shape or array_a.dtype != array_b.dtype:
+        raise ValueError("Arrays must have the same length and dtype")
+
+    if strategy == 'auto':
+        strategy = DEFAULT_STRATEGIES.get(array_a.dtype.name, 'temp')
+    if array_a.dtype.kind not in 'iu' or np.shares_memory(array_a, array_b):
+        strategy = 'temp'
+
+    used = {}
+    scratch = np.empty(min(block_size, len(array_a)), dtype=array_a.dtype)
+    for start in range(0, len(array_a), block_size):
+        end = start + block_size
+        name = swap_block(array_a[start:end], array_b[start:end], strategy, scratch)
+        used[name] = used.get(name, 0) + 1
+    return used
+
+
+def load_tuple_swap():
+    """
+    Load swap_with_tuple from 04_Swap_Numbers_Method3.py.
+
+    Returns:
+        callable: swap_with_tuple(a, b) -> (b, a)
+    """
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "04_Swap_Numbers_Method3.py")
+    spec = importlib.util.spec_from_file_location("swap_numbers_method3", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.swap_with_tuple
+
+
+def run_demo():
+    """Show each operation on a small buffer."""
+    data = bytearray(b"ABCDEFGHIJ")
+    print(f"Before:              {data.decode()}")
+    swap_regions(data, 0, 6, 3)
+    print(f"swap_regions(0,6,3): {data.decode()}")
+
+    first, second = bytearray(b"left"), bytearray(b"RGHT")
+    swap_buffers(first, second)
+    print(f"swap_buffers:        {first.decode()} {second.decode()}")
+
+    values = list(range(8))
+    apply_swaps(values, [0, 1, 0], [7, 6, 1])
+    print(f"apply_swaps:         {values}")
+
+    values = list(range(10))
+    shuffle(values, seed=2024)
+    print(f"shuffle:             {values}")
+
+
+def run_benchmark(size, pairs, seed=2024):
+    """
+    Compare the tuple-unpacking loop of 04_Swap_Numbers_Method3.py with
+    apply_swaps(), and a region swap through slices with swap_regions().
+
+    Args:
+        size (int): Number of int64 elements
+        pairs (int): Number of random swap pairs
+    """
+    if np is None:
+        print("❌ Error: the benchmark needs NumPy")
+        return
+    rng = np.random.default_rng(seed)
+    first = rng.integers(0, size, pairs)
+    second = rng.integers(0, size, pairs)
+    swap_with_tuple = load_tuple_swap()
+
+    def tuple_loop():
+        values = np.arange(size).tolist()
+        for i, j in zip(first.tolist(), second.tolist()):
+            values[i], values[j] = swap_with_tuple(values[i], values[j])
+        return np.array(values)
+
+    def vectorized():
+        values = np.arange(size)
+        apply_swaps(values, first, second)
+        return values
+
+    print("=" * 60)
+    print(f"SWAP ENGINE BENCHMARK ({size} elements, {pairs} pairs)")
+    print("=" * 60)
+    results = []
+    for name, function in (("04 tuple swap, list loop", tuple_loop), ("apply_swaps (NumPy)", vectorized)):
+        start = time.perf_counter()
+        results.append(function())
+        print(f"{name:<32} {time.perf_counter() - start:>10.3f} s")
+    if not np.array_equal(results[0], results[1]):
+        raise RuntimeError("apply_swaps disagrees with the sequential loop")
+
+    half = size // 2
+    values = np.arange(2 * half)
+    start = time.perf_counter()
+    values[:half], values[half:] = values[half:].copy(), values[:half].copy()
+    print(f"{'region swap via slice copies':<32} {time.perf_counter() - start:>10.3f} s")
+    start = time.perf_counter()
+    swap_regions(values, 0, half, half)
+    print(f"{'swap_regions (1 MB scratch)':<32} {time.perf_counter() - start:>10.3f} s")
+    print("=" * 60)
+
+
+def run_kernel_benchmark(size, repeat=3, seed=2024):
+    """
+    Time every swap_arrays() strategy for int8-int64 (and unsigned) arrays,
+    with full-range values (frequent overflow) and small values (none), and
+    print the fastest strategy per dtype.
+
+    Args:
+        size (int): Elements per array
+        repeat (int): Timed runs per case (the fastest counts)
+
+    Returns:
+        dict: dtype name -> fastest strategy
+    """
+    if np is None:
+        print("❌ Error: the kernel benchmark needs NumPy")
+        return {}
+    rng = np.random.default_rng(seed)
+    dtypes = ['int8', 'int16', 'int32', 'int64', 'uint8', 'uint16', 'uint32', 'uint64']
+    cases = ('full range', 'small values')
+
+    print("=" * 72)
+    print(f"SWAP KERNELS ({size} elements, best of {repeat}, ms)")
+    print("=" * 72)
+    print(f"{'dtype':<8} {'values':<13}" + "".join(f"{name:>12}" for name in STRATEGIES) + f"{'fallbacks':>12}")
+    print("-" * 72)
+    best = {}
+    for dtype in dtypes:
+        info = np.iinfo(dtype)
+        totals = dict.fromkeys(STRATEGIES, 0.0)
+        for case in cases:
+            low, high = (info.min, info.max) if case == 'full range' else (0, min(info.max, 100))
+            original_a = rng.integers(low, high, size, dtype=dtype, endpoint=True)
+            original_b = rng.integers(low, high, size, dtype=dtype, endpoint=True)
+            row = f"{dtype:<8} {case:<13}"
+            fallbacks = 0
+            for strategy in STRATEGIES:
+                timings = []
+                for _ in range(repeat):
+                    a, b = original_a.copy(), original_b.copy()
+                    start = time.perf_counter()
+                    used = swap_arrays(a, b, strategy)
+                    timings.append(time.perf_counter() - start)
+                    if not (np.array_equal(a, original_b) and np.array_equal(b, original_a)):
+                        raise RuntimeError(f"{strategy} swap of {dtype} is wrong")
+                if strategy == 'arithmetic':
+                    fallbacks = used.get('xor', 0)
+                totals[strategy] += min(timings)
+                row += f"{min(timings) * 1000:>12.2f}"
+            print(row + f"{fallbacks:>12}")
+        best[dtype] = min(totals, key=totals.get)
+    print("-" * 72)
+    print("Fastest strategy per dtype (both value ranges together):")
+    for dtype, strategy in best.items():
+        print(f"  {dtype:<8} {strategy}")
+    print("=" * 72)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="In-place bulk swaps for large buffers")
+    commands = parser.add_subparsers(dest='command', required=True)
+    commands.add_parser('demo', help="show each operation on a small buffer")
+    benchmark = commands.add_parser('benchmark', help="compare with the tuple-swap loop")
+    benchmark.add_argument('--size', type=int, default=10**7, help="elements in the array")
+    benchmark.add_argument('--pairs', type=int, default=10**7, help="random swap pairs")
+    kernels = commands.add_parser('kernels', help="pick the fastest safe swap_arrays() strategy per dtype")
+    kernels.add_argument('--size', type=int, default=10**7, help="elements per array")
+    kernels.add_argument('--repeat', type=int, default=3, help="timed runs per case")
+    args = parser.parse_args()
+
+    try:
+        if args.command == 'demo':
+            run_demo()
+        elif args.command == 'kernels':
+            run_kernel_benchmark(args.size, args.repeat)
+        else:
+            run_benchmark(args.size, args.pairs)
+    except (ValueError, IndexError, TypeError) as e:
+        print(f"❌ Error: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
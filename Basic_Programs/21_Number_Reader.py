@@ -0,0 +1,374 @@
+"""
+Program: Bulk Number Reader
+Description: Parses whole buffers of delimited numbers from files and pipes
+straight into array('d') / array('q') or NumPy arrays.
+
+Reading numbers one at a time, as float(input()) or a per-line try/except
+around float() does, costs a Python loop iteration, an exception handler
+and a temporary string for every value. Here a buffer is split once and
+converted with map(float, ...) (or map(int, ...)) directly into a typed
+array, so the whole loop runs in C. Only when that fails is the buffer
+scanned again line by line, to report every bad token with its line
+number instead of re-prompting.
+
+Numbers are separated by whitespace or commas. Files are read in
+fixed-size chunks that end at a line break, so memory stays bounded and
+line numbers stay exact. With columns=N every non-blank line must hold
+exactly N numbers (rows of operands). The token 'ans' can stand for a
+value given by the caller, e.g. the previous calculator result.
+
+Usage:
+    python 21_Number_Reader.py summary numbers.txt
+    python 21_Number_Reader.py summary pairs.csv --columns 2 --int
+    cat numbers.txt | python 21_Number_Reader.py summary - --keep-going
+    python 21_Number_Reader.py benchmark --count 1000000
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from array import array
+from itertools import chain
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; typed arrays are returned instead
+    np = None
+
+CHUNK_SIZE = 1024 * 1024  # Bytes parsed at a time when reading a stream
+
+# array typecode -> converter applied to every token
+CONVERTERS = {'d': float, 'q': int}
+
+# Whitespace other than newlines, which separates the columns of a row
+INLINE_WHITESPACE = b' \t\r\x0b\x0c'
+
+# Bytes that may end a chunk when a line is longer than the chunk size
+SEPARATORS = INLINE_WHITESPACE + b','
+
+ANS = b'ans'
+
+
+def get_converter(typecode):
+    """
+    Look up the token converter for an array typecode.
+
+    Raises:
+        ValueError: If the typecode is not 'd' (float) or 'q' (int64)
+    """
+    try:
+        return CONVERTERS[typecode]
+    except KeyError:
+        raise ValueError(f"Unsupported typecode '{typecode}' (choose from {', '.join(CONVERTERS)})") from None
+
+
+def format_problem(problem):
+    """Format a (line number, token, reason) problem as an error message."""
+    line_number, token, reason = problem
+    return f"Line {line_number}: {reason}: {token[:50]!r}"
+
+
+def scan_lines(data, typecode, ans, columns, first_line):
+    """
+    Slow path of parse_numbers(): parse line by line and collect problems.
+
+    In column mode a line with any problem is left out as a whole, so the
+    remaining values still form complete rows.
+
+    Returns:
+        tuple: (array of the valid values, list of problems)
+    """
+    convert = get_converter(typecode)
+    values = array(typecode)
+    problems = []
+    for line_number, line in enumerate(data.split(b'\n'), first_line):
+        tokens = line.split()
+        if columns is not None and tokens and len(tokens) != columns:
+            noun = "number" if columns == 1 else "numbers"
+            reason = f"expected {columns} {noun}, got {len(tokens)}"
+            problems.append((line_number, line.strip().decode('utf-8', 'replace'), reason))
+            continue
+        row = array(typecode)
+        row_problems = []
+        for token in tokens:
+            try:
+                row.append(ans if token == ANS and ans is not None else convert(token))
+            except ValueError:
+                row_problems.append((line_number, token.decode('utf-8', 'replace'), "not a number"))
+            except OverflowError:
+                row_problems.append((line_number, token.decode('utf-8', 'replace'), "out of range"))
+        if row_problems:
+            problems.extend(row_problems)
+            if columns is not None:
+                continue
+        values.extend(row)
+    return values, problems
+
+
+def parse_numbers(data, typecode='d', ans=None, columns=None, bad=None, first_line=1):
+    """
+    Parse a whole buffer of delimited numbers into a typed array.
+
+    Args:
+        data (bytes or str): The text, numbers separated by whitespace or commas
+        typecode (str): 'd' for float64 values, 'q' for int64 values
+        ans (float or int): Value of the 'ans' token (None: 'ans' is an error)
+        columns (int): Require exactly this many numbers on every non-blank line
+        bad (list): If given, problems are appended to it as
+            (line number, token, reason) and the bad tokens (or, with columns,
+            lines) are skipped instead of raising
+        first_line (int): Line number of the first line of data
+
+    Returns:
+        array: The numbers in order (row by row with columns)
+
+    Raises:
+        ValueError: On the first bad token when bad is None; the message
+            has its line number (and the number of further problems)
+    """
+    convert = get_converter(typecode)
+    if isinstance(data, str):
+        data = data.encode('utf-8')
+    if b',' in data:
+        data = data.replace(b',', b' ')
+    if ans is not None:
+        if typecode == 'q' and ans != int(ans):
+            raise ValueError(f"'ans' is not an integer: {ans}")
+        ans = convert(ans)
+
+    try:
+        if columns is None:
+            tokens = data.split()
+        elif columns == 1:
+            # A line holds two tokens exactly when removing the whitespace
+            # other than newlines merges them, which changes the token count
+            tokens = data.split()
+            if len(data.translate(None, INLINE_WHITESPACE).split()) != len(tokens):
+                raise ValueError("Wrong number of columns")
+        else:
+            rows = [line.split() for line in data.split(b'\n')]
+            if not all(len(row) in (0, columns) for row in rows):
+                raise ValueError("Wrong number of columns")
+            tokens = list(chain.from_iterable(rows))
+        if ans is not None and ANS in data:
+            tokens = [ans if token == ANS else token for token in tokens]
+        return array(typecode, map(convert, tokens))
+    except (ValueError, OverflowError):
+        pass
+
+    values, problems = scan_lines(data, typecode, ans, columns, first_line)
+    if bad is not None:
+        bad.extend(problems)
+    elif problems:
+        more = f" (and {len(problems) - 1} more)" if len(problems) > 1 else ""
+        raise ValueError(format_problem(problems[0]) + more)
+    return values
+
+
+def read_number_blocks(stream, typecode='d', ans=None, columns=None, bad=None, chunk_size=CHUNK_SIZE):
+    """
+    Parse a stream in chunks, yielding one typed array per chunk.
+
+    Chunks end at the last line break they contain. A line longer than the
+    chunk size is cut at a separator instead (never in column mode, where
+    a row must stay in one piece).
+
+    Args:
+        stream (file): Readable binary or text file object
+        typecode, ans, columns, bad: As for parse_numbers()
+        chunk_size (int): Bytes read at a time
+
+    Yields:
+        array: The numbers of one chunk (possibly empty)
+
+    Raises:
+        ValueError: On the first bad token when bad is None
+    """
+    stream = getattr(stream, 'buffer', stream)  # Read text stdin as bytes
+    line_number = 1
+    pending = []
+    while True:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            break
+        if isinstance(chunk, str):
+            chunk = chunk.encode('utf-8')
+        cut = chunk.rfind(b'\n') + 1
+        if not cut and columns is None:
+            cut = max(chunk.rfind(bytes([separator])) for separator in SEPARATORS) + 1
+        if not cut:
+            pending.append(chunk)
+            continue
+        pending.append(chunk[:cut])
+        data = b''.join(pending)
+        pending = [chunk[cut:]]
+        yield parse_numbers(data, typecode, ans, columns, bad, line_number)
+        line_number += data.count(b'\n')
+    data = b''.join(pending)
+    if data:
+        yield parse_numbers(data, typecode, ans, columns, bad, line_number)
+
+
+def read_numbers(stream, typecode='d', ans=None, columns=None, bad=None, chunk_size=CHUNK_SIZE):
+    """
+    Read a whole stream into one typed array.
+
+    Args:
+        stream (file): Readable binary or text file object
+        typecode, ans, columns, bad, chunk_size: As for read_number_blocks()
+
+    Returns:
+        array: All numbers in order
+    """
+    values = array(typecode)
+    for block in read_number_blocks(stream, typecode, ans, columns, bad, chunk_size):
+        values += block
+    return values
+
+
+def to_numpy(values, columns=None):
+    """
+    View a typed array as a NumPy array without copying.
+
+    Args:
+        values (array): Result of parse_numbers() or read_numbers()
+        columns (int): Reshape to (rows, columns) if more than one
+
+    Returns:
+        ndarray: float64 or int64 values
+    """
+    result = np.frombuffer(values, dtype=np.float64 if values.typecode == 'd' else np.int64)
+    return result.reshape(-1, columns) if columns and columns > 1 else result
+
+
+def load_numbers(path, typecode='d', ans=None, columns=None, bad=None, numpy=False):
+    """
+    Read all numbers from a file ('-' for stdin).
+
+    Args:
+        path (str): File path, or '-' for standard input
+        typecode, ans, columns, bad: As for parse_numbers()
+        numpy (bool): Return a NumPy array, shaped (rows, columns) for columns > 1
+
+    Returns:
+        array or ndarray: The numbers
+
+    Raises:
+        OSError: If the file cannot be read
+        ValueError: On a bad token when bad is None, or if numpy is
+            requested but NumPy is not installed
+    """
+    if numpy and np is None:
+        raise ValueError("NumPy is not installed")
+    if path == '-':
+        values = read_numbers(sys.stdin, typecode, ans, columns, bad)
+    else:
+        with open(path, 'rb') as number_file:
+            values = read_numbers(number_file, typecode, ans, columns, bad)
+    return to_numpy(values, columns) if numpy else values
+
+
+def read_one_at_a_time(stream):
+    """Baseline for the benchmark: float() per line with try/except."""
+    values = []
+    for line in stream:
+        try:
+            values.append(float(line))
+        except ValueError:
+            if line.strip():
+                raise
+    return values
+
+
+def run_benchmark(count, repeat=3):
+    """
+    Compare per-line float() parsing with the bulk reader on a temporary file.
+
+    Both parsers pay for the same string-to-double conversion, so the time
+    difference is the loop and exception overhead. The bulk reader also
+    stores 8 bytes per value instead of a list slot plus a float object.
+
+    Args:
+        count (int): Numbers to generate
+        repeat (int): Runs per parser; the best time is reported
+    """
+    import random
+    rng = random.Random(1)
+    with tempfile.NamedTemporaryFile('wb', suffix='.txt', delete=False) as number_file:
+        number_file.write(b''.join(b'%r\n' % (rng.uniform(-1e6, 1e6),) for _ in range(count)))
+    try:
+        def per_line():
+            with open(number_file.name, 'rb') as stream:
+                return read_one_at_a_time(stream)
+
+        def bulk():
+            return load_numbers(number_file.name)
+
+        rows = []
+        for name, parser in (("float() per line", per_line), ("bulk array('d')", bulk)):
+            best = float('inf')
+            for _ in range(repeat):
+                start = time.perf_counter()
+                values = parser()
+                best = min(best, time.perf_counter() - start)
+            size = sys.getsizeof(values)
+            if isinstance(values, list):
+                size += sum(map(sys.getsizeof, values))
+            rows.append((name, best, size, values))
+        if list(rows[1][3]) != rows[0][3]:
+            raise AssertionError("Bulk reader and per-line parsing disagree")
+
+        baseline = rows[0][1]
+        print("=" * 60)
+        print(f"{'Parser':<20} {'Time (s)':>10} {'Speedup':>10} {'Memory (MB)':>14}")
+        print("-" * 60)
+        for name, seconds, size, _ in rows:
+            print(f"{name:<20} {seconds:>10.4f} {baseline / seconds:>9.1f}x {size / 1e6:>14.1f}")
+        print("=" * 60)
+        print(f"{count} numbers, {os.path.getsize(number_file.name)} bytes")
+    finally:
+        os.remove(number_file.name)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Parse files of delimited numbers in bulk")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    summary = commands.add_parser('summary', help="count and summarize the numbers in a file")
+    summary.add_argument('input', help="file of numbers ('-' for stdin)")
+    summary.add_argument('--int', action='store_true', help="parse 64-bit integers instead of floats")
+    summary.add_argument('--columns', type=int, help="require N numbers on every non-blank line")
+    summary.add_argument('--keep-going', action='store_true', help="report every bad token instead of stopping")
+
+    benchmark = commands.add_parser('benchmark', help="compare with per-line float() parsing")
+    benchmark.add_argument('--count', type=int, default=1_000_000, help="numbers to generate (default: 1000000)")
+    args = parser.parse_args()
+
+    if args.command == 'benchmark':
+        run_benchmark(args.count)
+        return
+
+    bad = [] if args.keep_going else None
+    try:
+        values = load_numbers(args.input, 'q' if args.int else 'd', columns=args.columns, bad=bad)
+    except (OSError, ValueError) as e:
+        print(f"❌ Error: {e}")
+        sys.exit(1)
+
+    for problem in bad or ():
+        print(f"❌ {format_problem(problem)}")
+    if not values:
+        print("No numbers found.")
+    else:
+        print(f"Count: {len(values)}")
+        print(f"Sum:   {sum(values)}")
+        print(f"Min:   {min(values)}")
+        print(f"Max:   {max(values)}")
+    if bad:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
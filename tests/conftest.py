@@ -0,0 +1,65 @@
+"""
+Shared fixtures for the tests of the numbered programs in Basic_Programs.
+
+The program files start with digits, so they are imported by path, the same
+way the programs load each other.
+"""
+
+import importlib.util
+import os
+import sys
+
+import pytest
+
+PROGRAMS = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "Basic_Programs")
+
+
+def load_program(filename):
+    """
+    Import a numbered program by file name (once per test session).
+
+    Args:
+        filename (str): e.g. "13_Simple_Calculator.py"
+
+    Returns:
+        module: The loaded program
+    """
+    name = "program_" + os.path.splitext(filename)[0].lower()
+    if name not in sys.modules:
+        spec = importlib.util.spec_from_file_location(name, os.path.join(PROGRAMS, filename))
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[name] = module
+        spec.loader.exec_module(module)
+    return sys.modules[name]
+
+
+@pytest.fixture(scope="session")
+def calc():
+    """The 13_Simple_Calculator module."""
+    return load_program("13_Simple_Calculator.py")
+
+
+@pytest.fixture
+def run_menu(calc, monkeypatch, capsys):
+    """
+    Run the interactive calculator on scripted input lines.
+
+    Returns a function(lines, **calculator options) -> (calculator, output).
+    The session ends at Exit or at the end of the input.
+    """
+    def run(lines, **options):
+        answers = iter(lines)
+
+        def fake_input(prompt=""):
+            try:
+                return next(answers)
+            except StopIteration:
+                raise EOFError("EOF when reading a line") from None
+
+        monkeypatch.setattr("builtins.input", fake_input)
+        calculator = calc.SimpleCalculator(**options)
+        with pytest.raises(SystemExit):
+            calculator.run()
+        return calculator, capsys.readouterr().out
+
+    return run
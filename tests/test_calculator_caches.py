@@ -0,0 +1,58 @@
+"""Tests for the result cache and the compiled-expression cache of 13_Simple_Calculator.py."""
+
+import math
+
+import pytest
+
+
+@pytest.mark.parametrize("policy", ["lru", "lfu"])
+def test_signed_zeros_do_not_share_an_entry(calc, policy):
+    calculator = calc.SimpleCalculator()
+    calculator.enable_result_cache(16, policy)
+    assert math.copysign(1.0, calculator.power(-0.0, 1)) == -1.0
+    assert math.copysign(1.0, calculator.power(0.0, 1)) == 1.0
+    assert math.copysign(1.0, calculator.square_root(-0.0)) == -1.0
+    assert math.copysign(1.0, calculator.square_root(0.0)) == 1.0
+    assert calculator.result_cache_info()['misses'] == 4
+
+
+def test_repeated_arguments_hit_the_cache(calc):
+    calculator = calc.SimpleCalculator()
+    calculator.enable_result_cache(2)
+    for _ in range(3):
+        assert calculator.power(2.0, 10.0) == 1024.0
+    info = calculator.result_cache_info()
+    assert (info['hits'], info['misses']) == (2, 1)
+
+
+@pytest.mark.parametrize("policy", ["lru", "lfu"])
+def test_nan_arguments_share_an_entry(calc, policy):
+    calculator = calc.SimpleCalculator()
+    calculator.enable_result_cache(2, policy)
+    calculator.power(2.0, 1.0)
+    for _ in range(3):
+        # float('nan') builds a new object each time, so identity cannot match
+        assert math.isnan(calculator.power(float('nan'), 2.0))
+    assert calculator.power(2.0, 1.0) == 2.0
+    info = calculator.result_cache_info()
+    assert (info['hits'], info['misses'], info['evictions']) == (3, 2, 0)
+
+
+def test_cached_errors_are_raised_again(calc):
+    calculator = calc.SimpleCalculator()
+    calculator.enable_result_cache(4)
+    for _ in range(2):
+        with pytest.raises(ValueError):
+            calculator.square_root(-4.0)
+
+
+def test_lru_eviction(calc):
+    calculator = calc.SimpleCalculator()
+    calculator.enable_result_cache(2, 'lru')
+    calculator.power(2.0, 1.0)
+    calculator.power(2.0, 2.0)
+    calculator.power(2.0, 1.0)  # Refreshes (2, 1)
+    calculator.power(2.0, 3.0)  # Evicts (2, 2)
+    calculator.power(2.0, 1.0)
+    info = calculator.result_cache_info()
+    assert (info['hits'], info['misses'], info['evictions']) == (2, 3, 1)
@@ -0,0 +1,53 @@
+"""Tests for the interactive menu of 13_Simple_Calculator.py."""
+
+import math
+import subprocess
+import sys
+
+import pytest
+
+
+def test_exit_keeps_its_original_menu_number(calc):
+    commands = calc.SimpleCalculator.MENU_COMMANDS
+    assert commands[7] == "Show Calculation History"
+    assert commands[8] == "Clear History"
+    assert commands[9] == "Exit"
+    # Commands added later are numbered after Exit
+    assert min(number for number, name in commands.items() if number > 9) == 10
+
+
+def test_nine_exits_the_menu(run_menu):
+    calculator, output = run_menu(["1", "3", "4", "n", "n", "9"], output_mode='quiet')
+    assert output.splitlines() == ["7"]
+    assert calculator.current_result == 7
+
+
+def test_expression_is_choice_ten(run_menu):
+    calculator, _ = run_menu(["10", "2 ^ 10", "n", "n", "9"], output_mode='quiet')
+    assert calculator.current_result == 1024
+
+
+def test_end_of_input_ends_the_session(run_menu):
+    calculator, output = run_menu(["1", "3", "4", "n", "n"], output_mode='quiet')
+    assert output.splitlines() == ["7"]
+
+
+def test_end_of_input_inside_a_calculation(run_menu):
+    _, output = run_menu(["1", "3"], output_mode='json')
+    assert output == ""
+
+
+def test_piped_quiet_session_exits(calc):
+    completed = subprocess.run([sys.executable, calc.__file__, "--output", "quiet"],
+                               input="1\n3\n4\nn\nn\n", capture_output=True, text=True, timeout=30)
+    assert completed.returncode == 0
+    assert completed.stdout.splitlines() == ["7"]
+
+
+@pytest.mark.parametrize("choice, owner", [(9, "the Exit command"), (12, "the Show Statistics command"),
+                                           (3, "a built-in operation"), (0, "a built-in operation")])
+def test_custom_operations_cannot_take_reserved_menu_numbers(calc, choice, owner):
+    hypot = calc.Operation('Hypot', 'h', 2, math.hypot, keywords=('hypot',))
+    with pytest.raises(ValueError, match=f"Menu number {choice} is reserved for {owner}"):
+        calc.SimpleCalculator.register_operation(hypot, choice)
+    assert calc.OPERATION_REGISTRY.get('Hypot') is None
@@ -0,0 +1,92 @@
+"""Tests for the request handling of 14_Calculator_Server.py."""
+
+import asyncio
+import json
+
+import pytest
+
+from conftest import load_program
+
+
+@pytest.fixture(scope="module")
+def server():
+    return load_program("14_Calculator_Server.py")
+
+
+@pytest.mark.parametrize("request_fields, message", [
+    ({"op": "history", "limit": "x"}, "invalid literal"),
+    ({"op": "expr", "expr": "a + 1", "vars": {"a": "5"}}, "'vars' must map names to numbers"),
+    ({"op": "expr", "expr": "a + 1", "vars": {"a": True}}, "'vars' must map names to numbers"),
+    ({"op": "expr", "expr": "a + 1", "vars": [1]}, "'vars' must map names to numbers"),
+    ({"op": "add", "args": [1, None]}, "'args' must be a list of numbers"),
+    ({"op": "add", "args": [1, False]}, "'args' must be a list of numbers"),
+    ({"op": "add", "args": 3}, "'args' must be a list of numbers"),
+])
+def test_malformed_fields_return_errors(server, calc, request_fields, message):
+    calculator = calc.SimpleCalculator()
+    response = server.handle_request(calculator, request_fields)
+    assert message in response['error']
+    assert calculator.current_result == 0
+
+
+def test_valid_requests(server, calc):
+    calculator = calc.SimpleCalculator()
+    assert server.handle_request(calculator, {"op": "add", "args": [3, 4]})['result'] == 7
+    assert server.handle_request(calculator, {"op": "expr", "expr": "ans * a", "vars": {"a": 2}})['result'] == 14
+    history = server.handle_request(calculator, {"op": "history", "limit": 1})['history']
+    assert len(history) == 1 and history[0]['result'] == 14
+
+
+def test_bad_request_keeps_the_session_open(server):
+    async def session():
+        calculator_server = server.CalculatorServer()
+        listener = await asyncio.start_server(calculator_server.handle_connection, "127.0.0.1", 0)
+        port = listener.sockets[0].getsockname()[1]
+        async with listener:
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            replies = []
+            for request in ({"id": 1, "op": "history", "limit": "x"},
+                            {"id": 2, "op": "expr", "expr": "a", "vars": {"a": "5"}},
+                            {"id": 3, "op": "add", "args": [1, 2]}):
+                writer.write(json.dumps(request).encode() + b"\n")
+                await writer.drain()
+                replies.append(json.loads(await reader.readline()))
+            writer.close()
+            await writer.wait_closed()
+        return replies
+
+    first, second, third = asyncio.run(session())
+    assert 'error' in first and first['id'] == 1
+    assert 'error' in second and second['id'] == 2
+    assert third == {'id': 3, 'result': 3.0, 'display': '3'}
+
+
+def test_request_over_the_line_limit_is_skipped(server):
+    async def session():
+        calculator_server = server.CalculatorServer()
+        listener = await asyncio.start_server(calculator_server.handle_connection, "127.0.0.1", 0)
+        port = listener.sockets[0].getsockname()[1]
+        async with listener:
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            huge = json.dumps({"id": 1, "op": "add", "args": [1, 2], "pad": "x" * 300_000}).encode()
+            # The long line arrives in pieces, followed by a request in the same write
+            for start in range(0, len(huge), 50_000):
+                writer.write(huge[start:start + 50_000])
+                await writer.drain()
+                await asyncio.sleep(0.01)
+            writer.write(b'\n{"id": 2, "op": "add", "args": [3, 4]}\n')
+            await writer.drain()
+            replies = [json.loads(await reader.readline()) for _ in range(2)]
+            writer.write(b"x" * 100_000 + b'\n{"id": 3, "op": "add", "args": [1, 1]}')
+            writer.write_eof()
+            replies += [json.loads(await reader.readline()) for _ in range(2)]
+            writer.close()
+            await writer.wait_closed()
+        return replies
+
+    assert asyncio.run(session()) == [
+        {'error': 'request too long'},
+        {'id': 2, 'result': 7.0, 'display': '7'},
+        {'error': 'request too long'},
+        {'id': 3, 'result': 2.0, 'display': '2'},
+    ]
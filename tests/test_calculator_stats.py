@@ -0,0 +1,31 @@
+"""Tests for the opt-in statistics of 13_Simple_Calculator.py."""
+
+
+def test_expressions_compiled_before_enable_stats_are_counted(calc):
+    calculator = calc.SimpleCalculator()
+    calculator.evaluate_expression("2 ^ 3 + 1")
+    calculator.enable_stats()
+    for _ in range(5):
+        assert calculator.evaluate_expression("2 ^ 3 + 1") == 9
+    methods = calculator.stats()['methods']
+    assert methods['power']['calls'] == 5
+    assert methods['add']['calls'] == 5
+
+
+def test_disable_stats_removes_wrappers_from_compiled_expressions(calc):
+    calculator = calc.SimpleCalculator()
+    calculator.enable_stats()
+    calculator.evaluate_expression("1 + 2")
+    stats = calculator.call_stats
+    calculator.disable_stats()
+    assert calculator.evaluate_expression("1 + 2") == 3
+    assert stats.methods['add'].count == 1
+    assert 'add' not in vars(calculator)
+
+
+def test_errors_are_recorded(calc):
+    calculator = calc.SimpleCalculator()
+    calculator.enable_stats()
+    assert calculator.evaluate_batch_record("div 1 0")[1] is None
+    divide = calculator.stats()['methods']['divide']
+    assert divide['calls'] == 1 and divide['errors'] == {'ZeroDivisionError': 1}
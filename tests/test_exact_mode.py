@@ -0,0 +1,103 @@
+"""Tests for the exact numeric mode of 13_Simple_Calculator.py."""
+
+import io
+import re
+from fractions import Fraction
+
+import pytest
+
+
+@pytest.fixture
+def exact(calc):
+    return calc.SimpleCalculator(numeric_mode='exact')
+
+
+def test_cached_results_keep_their_type(exact):
+    exact.enable_result_cache(16)
+    assert type(exact.power(2.0, 3)) is float
+    result = exact.power(2, 3)
+    assert result == 8 and type(result) is int
+    assert type(exact.square_root(0.25)) is float
+    root = exact.square_root(Fraction(1, 4))
+    assert root == Fraction(1, 2) and type(root) is Fraction
+    assert exact.result_cache_info()['misses'] == 4
+
+
+@pytest.mark.parametrize("result, text", [
+    (2**100, "1267650600228229401496703205376"),
+    (-7, "-7"),
+    (Fraction(5, 2), "2.5"),
+    (Fraction(-1, 8), "-0.125"),
+    (Fraction(1, 3), "1/3"),
+    (Fraction(4), "4"),
+    (2.5, "2.5"),
+    (1 / 3, "0.333333"),
+    (1e20, "100000000000000000000"),
+])
+def test_format_result(exact, result, text):
+    assert exact.format_result(result) == text
+
+
+def test_operand_columns_are_read_exactly(exact):
+    big = 2**53 + 1
+    columns = exact.read_operand_columns(io.StringIO(f"{big} 1\n0.1, 1/3\n\n2e-3 ans\n"), 'add')
+    assert columns == [[big, Fraction(1, 10), Fraction(1, 500)], [1, Fraction(1, 3), 0]]
+    assert type(columns[0][0]) is int and type(columns[1][0]) is int
+
+
+@pytest.mark.parametrize("text, message", [
+    ("1 2\n3 x\n", "Line 2: not a number: 'x'"),
+    ("1 2\n3\n", "Line 2: expected 2 numbers, got 1: '3'"),
+    ("1 1/0\n", "Line 1: not a number: '1/0'"),
+    ("1 1e999999999\n", "Line 1: out of range"),
+    ("1 " + "9" * 5000 + "\n", "Line 1: out of range"),
+    ("x 1\ny 2\n", "(and 1 more)"),
+])
+def test_operand_column_errors(exact, text, message):
+    with pytest.raises(ValueError, match=re.escape(message)):
+        exact.read_operand_columns(io.StringIO(text), 'add')
+
+
+def test_run_array_keeps_large_values_exact(exact):
+    output = io.StringIO()
+    exact.run_array('multiply', io.StringIO(f"{2**60 + 1} 3\n0.1 0.2\n"), output)
+    assert output.getvalue() == f"{(2**60 + 1) * 3}\n0.02\n"
+
+
+@pytest.mark.parametrize("method", ['add', 'subtract', 'multiply'])
+def test_size_cap_falls_back_to_floats(calc, exact, method):
+    kernel = getattr(exact, method)
+    assert type(kernel(2**1000, 3)) is int
+    assert type(kernel(Fraction(1, 3), 2**1000)) is Fraction
+    assert type(kernel(Fraction(1, 2**(calc.EXACT_MAX_BITS + 1)), 2)) is float
+    with pytest.raises(OverflowError):
+        kernel(2**(calc.EXACT_MAX_BITS + 1), 1)
+
+
+def test_multiply_cap_counts_both_operands(calc, exact):
+    half = 2**(calc.EXACT_MAX_BITS // 2 + 1)
+    assert exact.multiply(half, 3) == half * 3
+    with pytest.raises(OverflowError):
+        exact.multiply(half, half)
+
+
+def test_every_input_path_reads_decimals_exactly(exact):
+    expected = Fraction(3, 10)
+    assert exact.parse_number("0.1") == Fraction(1, 10)
+    assert exact.evaluate_expression("0.1 + 0.2") == expected
+    assert exact.evaluate_batch_line("add 0.1 0.2") == ('Addition', [Fraction(1, 10), Fraction(1, 5)], expected)
+    a, b = exact.read_operand_columns(io.StringIO("0.1 0.2\n"), 'add')
+    assert exact.add(a[0], b[0]) == expected
+    assert exact.describe_operation('Addition', [Fraction(1, 10), Fraction(1, 5)]) == "0.1 + 0.2"
+
+
+def test_menu_input_reads_decimals_exactly(run_menu):
+    calculator, output = run_menu(["1", "0.1", "0.2", "9"], numeric_mode='exact', output_mode='minimal')
+    assert "0.1 + 0.2 = 0.3\n" in output
+    assert calculator.current_result == Fraction(3, 10)
+
+
+@pytest.mark.parametrize("text", ["inf", "1/0", "1e99999"])
+def test_parse_number_rejects_inexact_input(exact, text):
+    with pytest.raises(ValueError):
+        exact.parse_number(text)
@@ -0,0 +1,80 @@
+"""Tests for the expression parser and compile cache of 13_Simple_Calculator.py."""
+
+import pytest
+
+
+@pytest.fixture
+def calculator(calc):
+    return calc.SimpleCalculator(expression_cache_size=2)
+
+
+def test_tokenize(calc):
+    assert calc.ExpressionParser.tokenize("2**x_1 + .5e-1*√(1.5E2)") == [
+        ('number', 2.0), ('symbol', '**'), ('name', 'x_1'), ('symbol', '+'),
+        ('number', 0.05), ('symbol', '*'), ('symbol', '√'), ('symbol', '('),
+        ('number', 150.0), ('symbol', ')'),
+    ]
+
+
+def test_tokenize_leaves_a_bare_exponent_marker_as_a_name(calc):
+    assert calc.ExpressionParser.tokenize("2e") == [('number', 2.0), ('name', 'e')]
+
+
+@pytest.mark.parametrize("text, value", [
+    ("1 + 2 * 3", 7),
+    ("(1 + 2) * 3", 9),
+    ("10 - 4 - 3", 3),
+    ("2 ^ 3 ^ 2", 512),
+    ("2 ** 3 ** 2", 512),
+    ("-2 ^ 2", -4),
+    ("2 ^ -1", 0.5),
+    ("--3", 3),
+    ("sqrt(16) + √9", 7),
+    ("SQRT(4)", 2),
+    ("√4 ^ 2", 4),
+])
+def test_precedence_and_associativity(calculator, text, value):
+    assert calculator.evaluate_expression(text) == value
+
+
+def test_variables_and_ans(calculator):
+    calculator.current_result = 5
+    assert calculator.evaluate_expression("(a + b) ^ 2 / ans", {'a': 1, 'b': 4}) == 5
+    assert calculator.evaluate_expression("ans", {'ans': 2}) == 2
+    with pytest.raises(ValueError, match="No value given for variable 'c'"):
+        calculator.evaluate_expression("a + c", {'a': 1})
+
+
+@pytest.mark.parametrize("text, message", [
+    ("", "Empty expression"),
+    ("1 +", "Incomplete expression"),
+    ("(1 + 2", "Expected '\\)'"),
+    ("1 2", "Unexpected '2.0'"),
+    ("* 2", "Unexpected '\\*'"),
+    ("cos(1)", "Unknown function 'cos'"),
+    ("1 $ 2", "Unexpected character '\\$'"),
+    ("sqrt(-1)", "negative number"),
+])
+def test_errors(calculator, text, message):
+    with pytest.raises(ValueError, match=message):
+        calculator.evaluate_expression(text)
+
+
+def test_division_by_zero(calculator):
+    with pytest.raises(ZeroDivisionError):
+        calculator.evaluate_expression("1 / (2 - 2)")
+
+
+def test_compile_cache_is_lru(calculator):
+    first = calculator.compile_expression("1 + 1")
+    calculator.compile_expression("2 + 2")
+    assert calculator.compile_expression("1 + 1") is first
+    calculator.compile_expression("3 + 3")  # Evicts "2 + 2", the least recently used
+    assert list(calculator.expression_cache) == ["1 + 1", "3 + 3"]
+    assert (calculator.expression_cache_hits, calculator.expression_cache_misses) == (1, 3)
+
+
+def test_exact_mode_parses_integers_exactly(calc):
+    exact = calc.SimpleCalculator(numeric_mode='exact')
+    result = exact.evaluate_expression("(2^64 - 1) / 3")
+    assert result == (2**64 - 1) // 3 and type(result) is int
@@ -0,0 +1,160 @@
+"""Tests for the persistent history log of 13_Simple_Calculator.py."""
+
+import importlib.util
+import math
+import os
+import sys
+
+import pytest
+
+from conftest import PROGRAMS
+
+SESSIONS = iter(range(10**6))
+
+
+def new_session():
+    """Import the calculator afresh: a new process with its own operation registry."""
+    name = f"calculator_session_{next(SESSIONS)}"
+    spec = importlib.util.spec_from_file_location(name, os.path.join(PROGRAMS, "13_Simple_Calculator.py"))
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def register(module, name, symbol, function, keyword):
+    module.SimpleCalculator.register_operation(
+        module.Operation(name, symbol, 2, function, keywords=(keyword,)))
+
+
+@pytest.fixture
+def log_path(tmp_path):
+    return str(tmp_path / "history.log")
+
+
+def test_round_trip(calc, log_path):
+    log = calc.HistoryLog(log_path)
+    log.append('Addition', [3.0, 4.0], 7.0, 100)
+    log.append('Square Root', [9.0], 3.0, 101)
+    log.append('Expression', ['(a+1)*2'], 8.0, 102)
+    log.close()
+
+    entries = calc.HistoryLog(log_path).read_tail(10)
+    assert entries[0] == ('Addition', [3.0, 4.0], 7.0, 100)
+    assert entries[1] == ('Square Root', [9.0], 3.0, 101)
+    assert entries[2] == ('Expression', ['(a+1)*2'], 8.0, 102)
+
+
+def test_custom_operations_decode_by_name(log_path):
+    first = new_session()
+    register(first, 'Modulo', '%', math.fmod, 'mod')
+    calculator = first.SimpleCalculator(history_file=log_path)
+    calculator.add_to_history('Modulo', [7.0, 3.0], 1.0)
+    calculator.history_log.close()
+
+    # A later session registers another operation first, so 'Modulo' gets
+    # a different session code
+    second = new_session()
+    register(second, 'Hypot', 'h', math.hypot, 'hypot')
+    register(second, 'Modulo', '%', math.fmod, 'mod')
+    calculator = second.SimpleCalculator(history_file=log_path)
+    (entry,) = [calculator.history.entry(index) for index in range(len(calculator.history))]
+    assert entry['operation'] == 'Modulo'
+    assert calculator.describe_operation(entry['operation'], entry['operands']) == "7.0 % 3.0"
+    calculator.history_log.close()
+
+    # A session without Modulo skips the record instead of misreading it
+    third = new_session()
+    register(third, 'Hypot', 'h', math.hypot, 'hypot')
+    calculator = third.SimpleCalculator(history_file=log_path)
+    assert len(calculator.history) == 0
+    calculator.history_log.close()
+
+
+def test_logs_without_an_operation_table_use_the_builtin_codes(calc, log_path):
+    log = calc.HistoryLog(log_path)
+    log.append('Division', [1.0, 4.0], 0.25, 100)
+    log.close()
+    os.remove(log_path + '.ops')
+
+    entries = calc.HistoryLog(log_path).read_tail(1)
+    assert entries == [('Division', [1.0, 4.0], 0.25, 100)]
+
+
+def test_compact_keeps_the_operation_table(log_path):
+    session = new_session()
+    register(session, 'Modulo', '%', math.fmod, 'mod')
+    log = session.HistoryLog(log_path)
+    for value in range(5):
+        log.append('Modulo', [float(value), 3.0], math.fmod(value, 3.0), 100 + value)
+    assert log.compact(keep_last=2) == 3
+    log.close()
+
+    later = new_session()
+    register(later, 'Hypot', 'h', math.hypot, 'hypot')
+    register(later, 'Modulo', '%', math.fmod, 'mod')
+    entries = later.HistoryLog(log_path).read_tail(10)
+    assert [entry[0] for entry in entries] == ['Modulo', 'Modulo']
+    assert [entry[3] for entry in entries] == [103, 104]
+
+
+def test_torn_record_is_dropped(calc, log_path):
+    log = calc.HistoryLog(log_path)
+    log.append('Addition', [1.0, 2.0], 3.0, 100)
+    log.close()
+    with open(log_path, 'ab') as log_file:
+        log_file.write(b'\x00' * 5)
+    log = calc.HistoryLog(log_path)
+    assert len(log) == 1
+    log.append('Addition', [2.0, 2.0], 4.0, 101)
+    assert [entry[2] for entry in log.read_tail(5)] == [3.0, 4.0]
+    log.close()
+
+
+def test_compact_removes_leftover_temp_files(calc, log_path):
+    for suffix in ('.tmp', '.tmp.expr', '.tmp.ops'):
+        with open(log_path + suffix, 'wb') as leftover:
+            leftover.write(b'stale\n')
+    log = calc.HistoryLog(log_path)
+    log.append('Expression', ['1+2'], 3.0, 100)
+    log.compact(keep_last=1)
+    assert log.read_tail(1) == [('Expression', ['1+2'], 3.0, 100)]
+    log.close()
+    with open(log_path + '.expr', 'rb') as text_file:
+        assert text_file.read() == b'1+2'
+    with open(log_path + '.ops', 'rb') as ops_file:
+        assert b'stale' not in ops_file.read()
+    assert not any(os.path.exists(log_path + suffix) for suffix in ('.tmp', '.tmp.expr', '.tmp.ops'))
+
+
+def test_compact_keeps_records_of_unregistered_operations(log_path):
+    first = new_session()
+    register(first, 'Modulo', '%', math.fmod, 'mod')
+    log = first.HistoryLog(log_path)
+    log.append('Expression', ['2*3'], 6.0, 100)
+    log.append('Modulo', [7.0, 3.0], 1.0, 101)
+    log.append('Addition', [1.0, 2.0], 3.0, 102)
+    log.append('Expression', ['(1+1)^2'], 4.0, 103)
+    log.close()
+
+    # Compacted in a session that does not know Modulo
+    log = new_session().HistoryLog(log_path)
+    assert log.compact(keep_last=10) == 0
+    assert log.compact(keep_last=3) == 1
+    log.close()
+    with open(log_path + '.expr', 'rb') as text_file:
+        assert text_file.read() == b'(1+1)^2'
+
+    later = new_session()
+    register(later, 'Modulo', '%', math.fmod, 'mod')
+    log = later.HistoryLog(log_path)
+    assert log.read_tail(10) == [
+        ('Modulo', [7.0, 3.0], 1.0, 101),
+        ('Addition', [1.0, 2.0], 3.0, 102),
+        ('Expression', ['(1+1)^2'], 4.0, 103),
+    ]
+    assert log.compact(keep_last=0) == 3
+    assert len(log) == 0
+    log.append('Modulo', [5.0, 3.0], 2.0, 104)
+    assert log.read_tail(1) == [('Modulo', [5.0, 3.0], 2.0, 104)]
+    log.close()
@@ -0,0 +1,58 @@
+"""Tests for 18_Largest_Number_Engine.py."""
+
+import io
+import math
+
+import pytest
+
+from conftest import load_program
+
+NAN_INPUT = b"3\nnan\n7\n5\n"
+
+
+@pytest.fixture(scope="module")
+def engine():
+    return load_program("18_Largest_Number_Engine.py")
+
+
+def test_largest_ties_go_to_the_earliest_value(engine):
+    assert engine.largest([2, 9, 4, 9]) == (9, 1)
+    assert engine.largest([]) is None
+
+
+def test_top_k_ranks_ties_by_position(engine):
+    assert engine.top_k([5, 1, 5, 3, 5], 3) == [(5, 0), (5, 2), (5, 4)]
+
+
+def test_nan_is_skipped_but_keeps_its_position(engine):
+    values = list(engine.read_numbers(io.BytesIO(NAN_INPUT)))
+    assert math.isnan(values[1])
+    assert engine.top_k(values, 2) == [(7.0, 2), (5.0, 3)]
+    assert engine.largest(values) == (7.0, 2)
+    assert engine.largest([math.nan, 1.0]) == (1.0, 1)
+    assert engine.largest([math.nan]) is None
+    assert engine.top_k([math.nan, math.nan, 2.0], 2) == [(2.0, 2)]
+
+
+def test_parallel_path_without_numpy_matches_top_k(engine, tmp_path, monkeypatch):
+    path = tmp_path / "readings.txt"
+    path.write_bytes(NAN_INPUT)
+    monkeypatch.setattr(engine, "np", None)
+    assert engine.parallel_top_k(str(path), 2, workers=1, chunk_size=4) == [(7.0, 2), (5.0, 3)]
+
+
+def test_array_top_k_drops_nan(engine):
+    np = pytest.importorskip("numpy")
+    values = np.array([3.0, np.nan, 7.0, 5.0, np.nan, 7.0])
+    assert engine.array_top_k(values, 2) == [(7.0, 2), (7.0, 5)]
+    assert engine.array_top_k(values, 3) == engine.top_k(values.tolist(), 3)
+    assert engine.array_top_k(values, 10) == [(7.0, 2), (7.0, 5), (5.0, 3), (3.0, 0)]
+    assert engine.array_top_k(np.array([np.nan]), 1) == []
+
+
+def test_parallel_path_with_numpy_matches_top_k(engine, tmp_path):
+    pytest.importorskip("numpy")
+    path = tmp_path / "readings.txt"
+    path.write_bytes(NAN_INPUT)
+    assert engine.parallel_top_k(str(path), 2, workers=1, chunk_size=4) == [(7.0, 2), (5.0, 3)]
+    assert engine.parallel_top_k(str(path), 2, workers=1) == [(7.0, 2), (5.0, 3)]
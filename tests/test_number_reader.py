@@ -0,0 +1,75 @@
+"""Tests for 21_Number_Reader.py."""
+
+import io
+
+import pytest
+
+from conftest import load_program
+
+
+@pytest.fixture(scope="module")
+def reader():
+    return load_program("21_Number_Reader.py")
+
+
+def test_chunks_end_at_line_breaks(reader):
+    data = b"1 2.5 3\n123456789012 7\n\n-4,5\n"
+    blocks = [list(block) for block in reader.read_number_blocks(io.BytesIO(data), chunk_size=4)]
+    assert sum(blocks, []) == [1.0, 2.5, 3.0, 123456789012.0, 7.0, -4.0, 5.0]
+    assert len(blocks) > 1
+
+
+def test_line_longer_than_the_chunk(reader):
+    data = b"12345678901234567890\n1 22 333 4444 55555\n"
+    values = reader.read_numbers(io.BytesIO(data), chunk_size=4)
+    assert list(values) == [12345678901234567890.0, 1.0, 22.0, 333.0, 4444.0, 55555.0]
+    rows = reader.read_numbers(io.BytesIO(b"1 22 333\n4444 55555 6\n"), columns=3, chunk_size=4)
+    assert list(rows) == [1.0, 22.0, 333.0, 4444.0, 55555.0, 6.0]
+
+
+def test_line_numbers_across_chunks(reader):
+    with pytest.raises(ValueError, match=r"^Line 3: not a number: 'x'$"):
+        reader.read_numbers(io.BytesIO(b"1\n2\nx\n4\n"), chunk_size=4)
+
+
+def test_column_mismatch_is_collected(reader):
+    bad = []
+    values = reader.read_numbers(io.BytesIO(b"1 2\n3\n4 5\n6 7 8\n"), columns=2, bad=bad, chunk_size=4)
+    assert list(values) == [1.0, 2.0, 4.0, 5.0]
+    assert bad == [(2, '3', 'expected 2 numbers, got 1'), (4, '6 7 8', 'expected 2 numbers, got 3')]
+
+
+def test_column_mismatch_raises_with_the_count(reader):
+    with pytest.raises(ValueError, match=r"^Line 2: expected 2 numbers, got 1: '3' \(and 1 more\)$"):
+        reader.parse_numbers("1 2\n3\n4 5\n6 7 8\n", columns=2)
+
+
+def test_int64_overflow(reader):
+    limits = reader.read_numbers(io.BytesIO(b"9223372036854775807 -9223372036854775808"), 'q')
+    assert list(limits) == [2**63 - 1, -2**63]
+    with pytest.raises(ValueError, match=r"^Line 2: out of range: '9223372036854775808'$"):
+        reader.read_numbers(io.BytesIO(b"1\n9223372036854775808\n"), 'q')
+    bad = []
+    values = reader.parse_numbers("1 2\n99999999999999999999 3\n4 5\n", 'q', columns=2, bad=bad)
+    assert values.typecode == 'q' and list(values) == [1, 2, 4, 5]
+    assert bad == [(2, '99999999999999999999', 'out of range')]
+
+
+def test_ans_substitution(reader):
+    assert list(reader.parse_numbers("ans 2\n3, ans", ans=7.5)) == [7.5, 2.0, 3.0, 7.5]
+    assert list(reader.parse_numbers("ans 2", 'q', ans=3.0)) == [3, 2]
+    with pytest.raises(ValueError, match="'ans' is not an integer: 3.5"):
+        reader.parse_numbers("ans 2", 'q', ans=3.5)
+    with pytest.raises(ValueError, match=r"^Line 1: not a number: 'ans'$"):
+        reader.parse_numbers("ans 2")
+
+
+def test_text_stream(reader):
+    values = reader.read_numbers(io.StringIO("1 2\nans 4\n"), ans=9, columns=2, chunk_size=3)
+    assert list(values) == [1.0, 2.0, 9.0, 4.0]
+
+
+def test_to_numpy(reader):
+    np = pytest.importorskip("numpy")
+    values = reader.to_numpy(reader.parse_numbers("1 2\n3 4\n", columns=2), columns=2)
+    assert values.dtype == np.float64 and values.tolist() == [[1.0, 2.0], [3.0, 4.0]]
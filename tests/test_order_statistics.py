@@ -0,0 +1,45 @@
+"""Tests for 19_Order_Statistics.py."""
+
+import pytest
+
+from conftest import load_program
+
+
+@pytest.fixture(scope="module")
+def stats():
+    return load_program("19_Order_Statistics.py")
+
+
+def test_quickselect_median_and_percentile(stats):
+    values = [9.0, 1.0, 5.0, 3.0, 7.0]
+    assert stats.median(values) == 5.0
+    assert stats.percentile(values, 0) == 1.0
+    assert stats.percentile(values, 100) == 9.0
+
+
+def test_sketch_file_matches_exact_quantiles(stats, tmp_path):
+    path = tmp_path / "values.txt"
+    path.write_text("".join(f"{value}\n" for value in range(1, 1001)))
+    sketch = stats.sketch_file(str(path), 0.01, workers=1, chunk_size=512)
+    assert len(sketch) == 1000
+    assert sketch.percentile(50) == pytest.approx(500, rel=0.02)
+
+
+def test_sketch_errors_report_file_line_numbers(stats, tmp_path):
+    path = tmp_path / "values.txt"
+    path.write_text("".join(f"{value}\n" for value in range(1, 200)) + "oops\n1\nbad\n")
+    with pytest.raises(ValueError, match=r"^Line 200: .*'oops' \(and 1 more\)$"):
+        stats.sketch_file(str(path), workers=1, chunk_size=64)
+
+
+@pytest.mark.parametrize("as_numpy", [False, True])
+def test_quickselect_rejects_nan(stats, as_numpy):
+    values = [3.0, float('nan'), 1.0, 2.0, float('nan')]
+    if as_numpy:
+        np = pytest.importorskip("numpy")
+        values = np.array(values)
+    for k in range(len(values)):
+        with pytest.raises(ValueError, match="NaN"):
+            stats.quickselect(values, k)
+    with pytest.raises(ValueError, match="NaN"):
+        stats.median(values)
@@ -0,0 +1,59 @@
+"""Tests for the shuffle of 20_Swap_Engine.py."""
+
+import collections
+import itertools
+
+import pytest
+
+from conftest import load_program
+
+
+@pytest.fixture(scope="module")
+def engine():
+    return load_program("20_Swap_Engine.py")
+
+
+def test_shuffle_is_a_reproducible_permutation(engine):
+    first, second = list(range(1000)), list(range(1000))
+    engine.shuffle(first, seed=7)
+    engine.shuffle(second, seed=7)
+    assert first == second
+    assert sorted(first) == list(range(1000))
+    assert first != list(range(1000))
+
+
+@pytest.mark.parametrize("use_numpy", [True, False])
+def test_shuffle_reaches_every_permutation_evenly(engine, monkeypatch, use_numpy):
+    if use_numpy:
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(engine, "np", None)
+    counts = collections.Counter()
+    for seed in range(6000):
+        values = [0, 1, 2]
+        engine.shuffle(values, seed=seed)
+        counts[tuple(values)] += 1
+    assert set(counts) == set(itertools.permutations(range(3)))
+    assert all(800 < count < 1200 for count in counts.values())
+
+
+def test_shuffle_draws_integer_indexes(engine, monkeypatch):
+    np = pytest.importorskip("numpy")
+
+    class IntegerOnly:
+        """Wraps a Generator and fails on float draws."""
+
+        def __init__(self, seed=None):
+            self.rng = default_rng(seed)
+
+        def integers(self, *args, **kwargs):
+            return self.rng.integers(*args, **kwargs)
+
+        def random(self, *args, **kwargs):
+            raise AssertionError("shuffle must not scale float draws")
+
+    default_rng = np.random.default_rng
+    monkeypatch.setattr(np.random, "default_rng", IntegerOnly)
+    values = np.arange(100)
+    engine.shuffle(values, seed=1)
+    assert sorted(values.tolist()) == list(range(100))